@@ -1,14 +1,33 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from database import UserDatabase
-from api.utils.auth import get_current_user as auth_get_current_user
+from database import UserDatabase, JobDatabase, AsyncUserDatabase, AsyncJobDatabase
+from api.utils.auth import (
+    get_current_user as auth_get_current_user,
+    get_current_user_verified as auth_get_current_user_verified
+)
 from database.models.user_models import User
+from core.resume_builder import ResumeBuilder
 
 security = HTTPBearer()
 
 def get_database() -> UserDatabase:
+    """UserDatabase bound to the shared pooled Supabase client."""
     return UserDatabase()
 
+def get_job_database() -> JobDatabase:
+    """JobDatabase bound to the shared pooled Supabase client and process-wide job cache."""
+    return JobDatabase()
+
+def get_async_database() -> AsyncUserDatabase:
+    """AsyncUserDatabase on the pooled async Supabase client, for async routes."""
+    return AsyncUserDatabase()
+
+def get_async_job_database() -> AsyncJobDatabase:
+    return AsyncJobDatabase()
+
+def get_resume_builder(db: UserDatabase = Depends(get_database)) -> ResumeBuilder:
+    return ResumeBuilder(user_db=db)
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
     """Get current user from JWT token and return as User model"""
     try:
@@ -26,3 +45,20 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+def get_verified_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+    """Get current user after confirming the session with Supabase (skips the local token cache)"""
+    try:
+        user_data = auth_get_current_user_verified(credentials)
+        return User(
+            id=user_data.get("id"),
+            email=user_data.get("email", ""),
+            password_hash="",
+            created_at=None
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -1,14 +1,19 @@
-import logging
+import json
 import asyncio
+import logging
 
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks, Request
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Request
+from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from api.utils.auth import get_supabase_client, get_current_user, get_supabase_admin_client
+from api.utils.auth import get_async_supabase_auth_client, get_current_user, get_async_supabase_admin_client
+from api.dependencies import get_async_database
 from api.utils.user_helpers import ensure_user_exists
-from api.utils.background_tasks import process_resume_background, delayed_job_matching_background
+from api.utils.background_tasks import enqueue_resume_processing, get_match_refresh_status, set_processing_step
+from services.task_queue import get_task_queue
+from services.processing_events import TASK_FINISHED, get_processing_event_bus
 from database.models.user_models import UserCreate, UserLogin, TokenResponse, ResumeUploadResponse
-from database.user_db import UserDatabase
+from database.async_user_db import AsyncUserDatabase
 from services.job_matching import JobMatchingService
 from datetime import datetime
 
@@ -19,16 +24,15 @@ limiter = Limiter(key_func=get_remote_address)
 router = APIRouter()
 
 
-async def _signup(user: UserCreate):
+async def _signup(user: UserCreate, db: AsyncUserDatabase):
     try:
-        supabase = get_supabase_client()
+        supabase = await get_async_supabase_auth_client()
         
         # Check if user already exists in our database
-        db = UserDatabase()
-        if db.user_exists(user.email):
+        if await db.user_exists(user.email):
             raise HTTPException(status_code=400, detail="User already exists")
         
-        response = supabase.auth.sign_up({
+        response = await supabase.auth.sign_up({
             "email": user.email,
             "password": user.password
         })
@@ -40,12 +44,12 @@ async def _signup(user: UserCreate):
             raise HTTPException(status_code=400, detail="Failed to create user")
 
         try:
-            db.create_user(
+            await db.create_user(
                 email=user.email,
                 password_hash="",
                 user_id=response.user.id
             )
-            db.create_user_profile(response.user.id)
+            await db.create_user_profile(response.user.id)
         except Exception as e:
             logger.warning(f"Error creating user profile: {e}")
 
@@ -70,16 +74,16 @@ async def _signup(user: UserCreate):
 
 @router.post("/signup", response_model=dict)
 @limiter.limit("5/minute")
-async def signup(request: Request, user: UserCreate):
-    return await _signup(user)
+async def signup(request: Request, user: UserCreate, db: AsyncUserDatabase = Depends(get_async_database)):
+    return await _signup(user, db)
 
 
 @router.post("/login", response_model=TokenResponse)
 @limiter.limit("10/minute")
 async def login(request: Request, user: UserLogin):
     try:
-        supabase = get_supabase_client()
-        response = supabase.auth.sign_in_with_password({
+        supabase = await get_async_supabase_auth_client()
+        response = await supabase.auth.sign_in_with_password({
             "email": user.email,
             "password": user.password
         })
@@ -103,15 +107,17 @@ async def login(request: Request, user: UserLogin):
 
 
 @router.get("/profile")
-async def get_current_user_info(current_user: dict = Depends(get_current_user)):
+async def get_current_user_info(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncUserDatabase = Depends(get_async_database)
+):
     try:
-        db = UserDatabase()
-        user = db.get_user_by_id(current_user["id"])
-        profile = db.get_user_profile(current_user["id"])
+        user = await db.get_user_by_id(current_user["id"])
+        profile = await db.get_user_profile(current_user["id"])
 
         # If user doesn't exist in our database but exists in Supabase, create them
         if not user:
-            if not ensure_user_exists(current_user["id"], current_user["email"], db):
+            if not await ensure_user_exists(current_user["id"], current_user["email"], db):
                 return {
                     "id": current_user["id"],
                     "email": current_user["email"],
@@ -126,8 +132,8 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
                     "education_level": None
                 }
             # Fetch the newly created user
-            user = db.get_user_by_id(current_user["id"])
-            profile = db.get_user_profile(current_user["id"])
+            user = await db.get_user_by_id(current_user["id"])
+            profile = await db.get_user_profile(current_user["id"])
 
         user_data = {
             "id": user.id if user else current_user["id"],
@@ -140,7 +146,9 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
             "phone": getattr(profile, 'phone', None) if profile else None,
             "location": getattr(profile, 'location', None) if profile else None,
             "experience_years": getattr(profile, 'experience_years', None) if profile else None,
-            "education_level": getattr(profile, 'education_level', None) if profile else None
+            "education_level": getattr(profile, 'education_level', None) if profile else None,
+            # Debounced match regeneration after skill edits (queued/running/succeeded/...)
+            "match_refresh": await asyncio.to_thread(get_match_refresh_status, current_user["id"])
         }
 
         return user_data
@@ -161,9 +169,9 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
 
 @router.post("/upload-resume", response_model=ResumeUploadResponse)
 async def upload_resume(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user),
+    db: AsyncUserDatabase = Depends(get_async_database),
     mode: str = None  
 ):
     try:
@@ -186,17 +194,16 @@ async def upload_resume(
             raise HTTPException(status_code=400, detail="File too large. Maximum size is 10MB.")
 
         # Ensure user exists in our database
-        db = UserDatabase()
         user_id = current_user["id"]
         
-        if not ensure_user_exists(user_id, current_user["email"], db):
+        if not await ensure_user_exists(user_id, current_user["email"], db):
             raise HTTPException(status_code=500, detail="Failed to prepare user for resume upload")
         
         # Ensure profile exists
         try:
-            profile = db.get_user_profile(user_id)
+            profile = await db.get_user_profile(user_id)
             if not profile:
-                db.create_user_profile(user_id)
+                await db.create_user_profile(user_id)
         except Exception as profile_error:
             logger.warning(f"Profile creation/check error: {str(profile_error)}")
 
@@ -205,13 +212,13 @@ async def upload_resume(
         unique_filename = f"{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
 
         # Upload to Supabase Storage
-        supabase = get_supabase_admin_client()  # Use admin client for storage operations
+        supabase = await get_async_supabase_admin_client()  # Use admin client for storage operations
         bucket_name = "resumes"
 
         # Upload file
         file_path = f"resumes/{unique_filename}"
         try:
-            supabase.storage.from_(bucket_name).upload(
+            await supabase.storage.from_(bucket_name).upload(
                 file_path,
                 content,
                 {"content-type": file.content_type}
@@ -223,26 +230,18 @@ async def upload_resume(
             )
 
         # Update user profile in database
-        success = db.mark_resume_uploaded(user_id, file_path)
+        success = await db.mark_resume_uploaded(user_id, file_path)
 
         if not success:
             try:
-                supabase.storage.from_(bucket_name).remove([file_path])
+                await supabase.storage.from_(bucket_name).remove([file_path])
             except:
                 pass
             raise HTTPException(status_code=500, detail="Failed to update user profile")
         
-        # Process resume in background using AI Extraction
-        background_tasks.add_task(
-            process_resume_background,
-            user_id,
-            content,
-            file.content_type,
-            mode  
-        )
-
-        # Add delayed job matching task to ensure matches are generated after resume processing
-        background_tasks.add_task(delayed_job_matching_background, user_id)
+        # Queue AI extraction; job matching is queued to run once parsing has succeeded.
+        # The queue is SQLite (the resume is stored in it), so keep the write off the event loop.
+        task_ids = await asyncio.to_thread(enqueue_resume_processing, user_id, content, file.content_type, mode)
 
         # Include mode in response message
         message = "Resume uploaded successfully and is being processed"
@@ -254,7 +253,8 @@ async def upload_resume(
         return ResumeUploadResponse(
             message=message,
             file_path=file_path,
-            processing_status="processing"
+            processing_status="processing",
+            **task_ids
         )
 
     except HTTPException:
@@ -262,124 +262,255 @@ async def upload_resume(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
    
-@router.get("/processing-status")
-async def get_processing_status(current_user: dict = Depends(get_current_user)):
-    try:
-        db = UserDatabase()
-        profile = db.get_user_profile(current_user["id"])
+ACTIVE_PROCESSING_STEPS = ["parsing", "matching", "finalizing", "clearing_old_data"]
 
-        if not profile:
-            return {"status": "not_found"}
+# Seconds between keep-alive comments on an idle status stream
+STATUS_STREAM_HEARTBEAT = 15.0
 
-        if not profile.resume_uploaded:
-            return {
-                "status": "not_uploaded",
-                "message": "No resume uploaded yet"
-            }
 
-        # Get current processing step
-        current_step = getattr(profile, 'processing_step', 'processing')
-        
-        # Check if still actively processing (before completion)
-        if current_step in ["parsing", "matching", "finalizing", "clearing_old_data"]:
-            step_messages = {
-                "clearing_old_data": "Clearing previous data...",
-                "parsing": "Analyzing your resume and extracting skills...",
-                "matching": "Finding job matches based on your skills...",
-                "finalizing": "Completing the matching process..."
-            }
-            
-            message = step_messages.get(current_step, "Processing your resume and finding job matches...")
+STEP_MESSAGES = {
+    "clearing_old_data": "Clearing previous data...",
+    "parsing": "Analyzing your resume and extracting skills...",
+    "matching": "Finding job matches based on your skills...",
+    "finalizing": "Completing the matching process..."
+}
 
-            return {
-                "status": "processing",
-                "message": message,
-                "step": current_step
-            }
+# Statuses after which a status stream closes, once no task is left for the user
+FINISHED_STATUSES = ("completed", "error", "not_uploaded", "not_found")
 
-        # Check if processing is complete
-        if profile.resume_processed and current_step == "completed":
-            # Wait briefly for database commits
-            await asyncio.sleep(0.5)
 
-            try:
-                user_db = UserDatabase()
-                matches = user_db.get_user_job_matches(current_user["id"])
-                match_count = len(matches) if matches else 0
-                
-                # If matches_generated flag is True but no matches in DB yet, keep status as finalizing
-                if getattr(profile, 'matches_generated', False) and match_count == 0:
-                    return {
-                        "status": "processing",
-                        "message": "Finalizing your job matches...",
-                        "step": "finalizing"
-                    }
-                
-            except Exception as match_error:
-                logger.warning(f"Error getting matches for user {current_user['id']}: {match_error}")
-                match_count = 0
+async def _get_active_tasks(user_id: str) -> list:
+    return await asyncio.to_thread(get_task_queue().get_user_tasks, user_id, active_only=True)
 
-            return {
-                "status": "completed",
-                "message": f"Resume processed successfully!",
-                "step": "completed",
-                "matches_found": match_count
-            }
 
-        # Fallback for any other state
+async def _step_status(
+    user_id: str,
+    db: AsyncUserDatabase,
+    step: str,
+    active_tasks: list,
+    matches_generated: bool = False,
+    processing_error: str = None
+) -> dict:
+    """Status for a processing step; shared by the profile-based check and the event stream."""
+    # Queued or retrying tasks have not (re)started updating the profile yet
+    if active_tasks and step not in ACTIVE_PROCESSING_STEPS:
         return {
             "status": "processing",
-            "message": "Processing your resume and finding job matches...",
-            "step": current_step if current_step else "processing"
+            "message": "Waiting for processing to start...",
+            "step": "queued",
+            "tasks": [task.to_status() for task in active_tasks]
         }
 
-    except Exception as e:
-        logger.error(f"Error in processing status for user {current_user.get('id', 'unknown')}: {e}")
+    # Check if still actively processing (before completion)
+    if step in ACTIVE_PROCESSING_STEPS:
+        return {
+            "status": "processing",
+            "message": STEP_MESSAGES.get(step, "Processing your resume and finding job matches..."),
+            "step": step
+        }
+
+    if step == "error":
         return {
             "status": "error",
-            "message": "Unable to retrieve processing status. Please try again.",
+            "message": processing_error or "Resume processing failed. Please try again.",
             "step": "error"
         }
 
+    if step == "completed":
+        # Steps are written after their data (the resume RPC and match upserts), so no wait is needed
+        try:
+            match_count = await db.count_user_job_matches(user_id)
+
+            # If matches_generated flag is True but no matches in DB yet, keep status as finalizing
+            if matches_generated and match_count == 0:
+                return {
+                    "status": "processing",
+                    "message": "Finalizing your job matches...",
+                    "step": "finalizing"
+                }
+
+        except Exception as match_error:
+            logger.warning(f"Error counting matches for user {user_id}: {match_error}")
+            match_count = 0
+
+        return {
+            "status": "completed",
+            "message": f"Resume processed successfully!",
+            "step": "completed",
+            "matches_found": match_count
+        }
+
+    # Fallback for any other state
+    return {
+        "status": "processing",
+        "message": "Processing your resume and finding job matches...",
+        "step": step if step else "processing"
+    }
+
+
+async def _build_processing_status(user_id: str, db: AsyncUserDatabase) -> dict:
+    profile = await db.get_user_profile(user_id)
+
+    if not profile:
+        return {"status": "not_found"}
+
+    if not profile.resume_uploaded:
+        return {
+            "status": "not_uploaded",
+            "message": "No resume uploaded yet"
+        }
+
+    # Get current processing step
+    current_step = getattr(profile, 'processing_step', 'processing')
+    if current_step == "completed" and not profile.resume_processed:
+        current_step = "processing"
+
+    return await _step_status(
+        user_id,
+        db,
+        current_step,
+        await _get_active_tasks(user_id),
+        matches_generated=getattr(profile, 'matches_generated', False),
+        processing_error=getattr(profile, 'processing_error', None)
+    )
+
+
+PROCESSING_STATUS_ERROR = {
+    "status": "error",
+    "message": "Unable to retrieve processing status. Please try again.",
+    "step": "error"
+}
+
+
+@router.get("/processing-status")
+async def get_processing_status(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncUserDatabase = Depends(get_async_database)
+):
+    try:
+        return await _build_processing_status(current_user["id"], db)
+    except Exception as e:
+        logger.error(f"Error in processing status for user {current_user.get('id', 'unknown')}: {e}")
+        return PROCESSING_STATUS_ERROR
+
+
+def _format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/processing-status/stream")
+async def stream_processing_status(
+    request: Request,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncUserDatabase = Depends(get_async_database)
+):
+    """
+    Server-Sent Events version of /processing-status.
+
+    Sends the current status, then a new status each time the background
+    pipeline publishes a step (queued, parsing, matching, completed, error) or
+    the worker finishes one of the user's tasks, and closes once processing
+    has finished and no task is left for the user. The profile is read once;
+    later statuses are built from the published events, with a match count on
+    completion and a local task queue lookup where queued work matters.
+    """
+    user_id = current_user["id"]
+
+    async def status_events():
+        # Subscribed inside the body so a client that disconnects before streaming starts
+        # leaves no subscription behind; before reading the status so no step is missed
+        subscription = get_processing_event_bus().subscribe(user_id)
+        try:
+            try:
+                status = await _build_processing_status(user_id, db)
+            except Exception as e:
+                logger.error(f"Error in processing status stream for user {user_id}: {e}")
+                status = PROCESSING_STATUS_ERROR
+            step = status.get("step")
+            step_data = {}
+            yield _format_sse("status", status)
+
+            while True:
+                if status["status"] in FINISHED_STATUSES and not await _get_active_tasks(user_id):
+                    return
+
+                # Wait for the next published event, with keep-alives so proxies keep the stream open
+                event = await subscription.get(timeout=STATUS_STREAM_HEARTBEAT)
+                if await request.is_disconnected():
+                    return
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    # Queued tasks can also end without a worker event (cancelled, failed dependency)
+                    if status.get("step") != "queued":
+                        continue
+                elif event.step != TASK_FINISHED:
+                    step, step_data = event.step, event.data
+
+                try:
+                    # Active steps are shown as they are, so only other steps need the task queue
+                    active_tasks = [] if step in ACTIVE_PROCESSING_STEPS else await _get_active_tasks(user_id)
+                    next_status = await _step_status(
+                        user_id,
+                        db,
+                        step,
+                        active_tasks,
+                        matches_generated=step_data.get("matches_generated", False),
+                        processing_error=step_data.get("processing_error")
+                    )
+                except Exception as e:
+                    logger.error(f"Error in processing status stream for user {user_id}: {e}")
+                    next_status = PROCESSING_STATUS_ERROR
+
+                if next_status != status:
+                    status = next_status
+                    yield _format_sse("status", status)
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        status_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/tasks/{task_id}")
+async def get_task_status(task_id: str, current_user: dict = Depends(get_current_user)):
+    task = await asyncio.to_thread(get_task_queue().get_task, task_id)
+    if not task or task.user_id != current_user["id"]:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task.to_status()
+
 @router.post("/generate-matches")
-async def generate_job_matches(current_user: dict = Depends(get_current_user)):
+async def generate_job_matches(
+    current_user: dict = Depends(get_current_user),
+    db: AsyncUserDatabase = Depends(get_async_database)
+):
     try:
         user_id = current_user["id"]
-        db = UserDatabase()
         job_matching_service = JobMatchingService()
 
         # Check if user has any resume builder data
-        profile = db.get_user_profile(user_id)
-        skills = db.get_user_skills(user_id)
+        profile = await db.get_user_profile(user_id)
+        skills = await db.get_user_skills(user_id)
 
         if not skills:
             return []
 
         # Update profile to indicate matching is in progress
-        db.update_user_profile(user_id, {
-            "processing_step": "matching",
-            "matches_generated": False
-        })
+        await set_processing_step(db, user_id, "matching", matches_generated=False)
 
         # Generate matches using combined resume builder data
         summary = await job_matching_service.update_matches_for_user(user_id)
 
         # Update profile with completion status
-        db.update_user_profile(user_id, {
-            "processing_step": "completed",
-            "matches_generated": True
-        })
+        await set_processing_step(db, user_id, "completed", matches_generated=True)
 
         return summary
 
     except Exception as e:
         # Update error status
         try:
-            db = UserDatabase()
-            db.update_user_profile(current_user["id"], {
-                "processing_step": "error",
-                "processing_error": str(e)
-            })
+            await set_processing_step(db, current_user["id"], "error", processing_error=str(e))
         except:
             pass
 
@@ -1,16 +1,17 @@
+import json
 import logging
 import asyncio
-import json
 
 from pydantic import BaseModel
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
 
-from api.dependencies import get_current_user
+from api.dependencies import get_current_user, get_async_database, get_async_job_database
 from database.models.user_models import User
 from services.job_matching import JobMatchingService
-from database.user_db import UserDatabase
-from database.job_db import JobDatabase
+from database.async_user_db import AsyncUserDatabase
+from database.async_job_db import AsyncJobDatabase
 
 logger = logging.getLogger(__name__)
 
@@ -69,28 +70,66 @@ async def find_and_save_job_matches(
         )
 
 
+@router.post("/find-matches/stream")
+async def stream_job_matches(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Server-Sent Events version of /find-matches.
+
+    Sends a "candidates" event with the retrieval-ranked jobs and their
+    deterministic scores, then one "match" event per job as its AI reasoning
+    arrives (already saved), and a "summary" event shaped like the
+    /find-matches response. Failures end the stream with an "error" event.
+    """
+    user_id = current_user.id
+
+    async def match_events():
+        events = get_matching_service().stream_matches_for_user(user_id)
+        try:
+            async for event, data in events:
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+                if await request.is_disconnected():
+                    return
+        except Exception as e:
+            logger.error(f"Error streaming job matches for user {user_id}: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'message': f'Error finding job matches: {str(e)}'})}\n\n"
+        finally:
+            # Cancels reasoning calls still pending when the client went away
+            await events.aclose()
+
+    return StreamingResponse(
+        match_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/matches", response_model=List[JobMatchResponse])
 async def get_job_matches(
     limit: int = 20,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    user_db: AsyncUserDatabase = Depends(get_async_database),
+    job_db: AsyncJobDatabase = Depends(get_async_job_database)
 ) -> List[JobMatchResponse]:
     logger.info(f"📥 Fetching {limit} cached job matches for user {current_user.id}")
     try:
-        user_db = UserDatabase()
-        job_db = JobDatabase()
-        
+
         # Filter to EXCLUDE recommendations (confidence='recommendation') since those aren't real matches
-        all_matches = user_db.get_user_job_matches(current_user.id, limit=limit * 2) 
+        all_matches = await user_db.get_user_job_matches(current_user.id, limit=limit * 2) 
         
         saved_matches = [m for m in all_matches if m.confidence != 'recommendation'][:limit]
         
         if not saved_matches:
             return []
 
+        jobs_by_id = {job.id: job for job in await job_db.get_jobs_by_ids([m.job_id for m in saved_matches])}
+
         responses = []
         for match in saved_matches:
             try:
-                job = job_db.get_job_by_id(match.job_id)
+                job = jobs_by_id.get(match.job_id)
                 if not job:
                     continue
 
@@ -121,11 +160,11 @@ async def get_job_matches(
     
 @router.get("/stats")
 async def get_matching_stats(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    user_db: AsyncUserDatabase = Depends(get_async_database)
 ) -> Dict[str, Any]:
     try:
-        user_db = UserDatabase()
-        matches = user_db.get_user_job_matches(current_user.id, limit=100)
+        matches = await user_db.get_user_job_matches(current_user.id, limit=100)
 
         if not matches:
             return {
@@ -191,7 +230,7 @@ async def get_job_recommendations(
         matching_service = JobMatchingService()
         
         # Get recent jobs from the database
-        jobs = matching_service.job_db.get_jobs_for_matching(limit=limit)
+        jobs = await matching_service.job_db.get_jobs_for_matching(limit=limit)
         
         if not jobs:
             logger.info(f"No jobs available for recommendations for user {current_user.id}")
@@ -234,7 +273,7 @@ async def clear_job_matches(
     try:
         matching_service = JobMatchingService()
         
-        success = matching_service.user_db.clear_job_matches(current_user.id)
+        success = await matching_service.user_db.clear_job_matches(current_user.id)
         
         if not success:
             raise HTTPException(
@@ -262,7 +301,7 @@ async def save_job(job_id: str, is_recommendation: bool = False, current_user: U
         if not saved:
             raise HTTPException(status_code=500, detail="Failed to save job")
 
-        job = matching_service.job_db.get_job_by_id(job_id)
+        job = await matching_service.job_db.get_job_by_id(job_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
 
@@ -274,33 +313,14 @@ async def save_job(job_id: str, is_recommendation: bool = False, current_user: U
         ai_reasoning = ""
         confidence = "medium"
 
-        try:
-            match = matching_service.user_db.client.table("user_job_matches").select("*").eq("user_id", current_user.id).eq("job_id", job_id).execute()
-            if match.data and len(match.data) > 0:
-                match_data = match.data[0]
-                match_score = match_data.get("match_score")
-                
-                # Parse JSON fields if they're strings
-                matched_skills_raw = match_data.get("matched_skills", [])
-                matched_skills = json.loads(matched_skills_raw) if isinstance(matched_skills_raw, str) else matched_skills_raw
-                
-                missing_skills_raw = match_data.get("missing_critical_skills", [])
-                missing_critical_skills = json.loads(missing_skills_raw) if isinstance(missing_skills_raw, str) else missing_skills_raw
-                
-                skill_coverage = match_data.get("skill_coverage", 0.0)
-                ai_reasoning = match_data.get("ai_reasoning", "")
-
-                # Get confidence from database or calculate if not provided
-                confidence = match_data.get("confidence") or "medium"
-                if not confidence and match_score is not None:
-                    if match_score >= 0.8:
-                        confidence = "high"
-                    elif match_score >= 0.6:
-                        confidence = "medium"
-                    else:
-                        confidence = "low"
-        except Exception as e:
-            logger.warning(f"Could not get match data for job {job_id}: {str(e)}")
+        match = await matching_service.user_db.get_user_job_match(current_user.id, job_id)
+        if match:
+            match_score = match.match_score
+            matched_skills = match.matched_skills
+            missing_critical_skills = match.missing_critical_skills
+            skill_coverage = match.skill_coverage
+            ai_reasoning = match.ai_reasoning
+            confidence = match.confidence or "medium"
 
         return SavedJobResponse(
             job_id=job_id,
@@ -338,20 +358,24 @@ async def remove_saved_job(job_id: str, current_user: User = Depends(get_current
         raise HTTPException(status_code=500, detail="Failed to remove saved job")
 
 @router.get("/saved-jobs", response_model=List[SavedJobResponse])
-async def get_saved_jobs(current_user: User = Depends(get_current_user), limit: int = 50):
+async def get_saved_jobs(
+    current_user: User = Depends(get_current_user),
+    limit: int = 50,
+    user_db: AsyncUserDatabase = Depends(get_async_database),
+    job_db: AsyncJobDatabase = Depends(get_async_job_database)
+):
     try:
-        user_db = UserDatabase()
-        job_db = JobDatabase()
-        
         # Get basic saved jobs first
-        saved_jobs = user_db.get_user_saved_jobs(current_user.id, limit)
+        saved_jobs = await user_db.get_user_saved_jobs(current_user.id, limit)
 
         if not saved_jobs:
             return []
 
+        jobs_by_id = {job.id: job for job in await job_db.get_jobs_by_ids([s.job_id for s in saved_jobs])}
+
         responses = []
         for saved in saved_jobs:
-            job = job_db.get_job_by_id(saved.job_id)
+            job = jobs_by_id.get(saved.job_id)
             if job:
                 match_score = None
                 matched_skills = []
@@ -360,52 +384,14 @@ async def get_saved_jobs(current_user: User = Depends(get_current_user), limit:
                 ai_reasoning = ""
                 confidence = "medium"
 
-                try:
-                    match = user_db.client.table("user_job_matches").select("*").eq("user_id", current_user.id).eq("job_id", saved.job_id).execute()
-                    if match.data and len(match.data) > 0:
-                        match_data = match.data[0]
-                        match_score = match_data.get("match_score")
-                        
-                        # Parse JSON fields if they're strings
-                        matched_skills_raw = match_data.get("matched_skills", [])
-                        matched_skills = json.loads(matched_skills_raw) if isinstance(matched_skills_raw, str) else matched_skills_raw
-                        
-                        missing_skills_raw = match_data.get("missing_critical_skills", [])
-                        missing_critical_skills = json.loads(missing_skills_raw) if isinstance(missing_skills_raw, str) else missing_skills_raw
-                        
-                        skill_coverage = match_data.get("skill_coverage", 0.0)
-                        ai_reasoning = match_data.get("ai_reasoning", "")
-                        confidence = match_data.get("confidence") or "medium"
-                except Exception as e:
-                    logger.warning(f"Could not get match data for job {saved.job_id}: {str(e)}")
-                    match_score = None
-                    matched_skills = []
-                    missing_critical_skills = []
-                    skill_coverage = 0.0
-                    ai_reasoning = ""
-                    confidence = "medium"
-
-                    try:
-                        match = user_db.client.table("user_job_matches").select("*").eq("user_id", current_user.id).eq("job_id", saved.job_id).execute()
-                        if match.data and len(match.data) > 0:
-                            match_data = match.data[0]
-                            match_score = match_data.get("match_score")
-                            matched_skills = match_data.get("matched_skills", [])
-                            missing_critical_skills = match_data.get("missing_critical_skills", [])
-                            skill_coverage = match_data.get("skill_coverage", 0.0)
-                            ai_reasoning = match_data.get("ai_reasoning", "")
-
-                            # Get confidence from database or calculate if not provided
-                            confidence = match_data.get("confidence") or "medium"
-                            if not confidence and match_score is not None:
-                                if match_score >= 0.8:
-                                    confidence = "high"
-                                elif match_score >= 0.6:
-                                    confidence = "medium"
-                                else:
-                                    confidence = "low"
-                    except Exception as e:
-                        logger.warning(f"Could not get match data for job {saved.job_id}: {str(e)}")
+                match = await user_db.get_user_job_match(current_user.id, saved.job_id)
+                if match:
+                    match_score = match.match_score
+                    matched_skills = match.matched_skills
+                    missing_critical_skills = match.missing_critical_skills
+                    skill_coverage = match.skill_coverage
+                    ai_reasoning = match.ai_reasoning
+                    confidence = match.confidence or "medium"
 
                 responses.append(SavedJobResponse(
                     job_id=saved.job_id,
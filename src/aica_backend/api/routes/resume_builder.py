@@ -1,11 +1,11 @@
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from api.dependencies import get_current_user
-from api.utils.background_tasks import regenerate_job_matches_background
+from api.dependencies import get_current_user, get_verified_user, get_resume_builder
+from api.utils.background_tasks import enqueue_match_regeneration, enqueue_profile_refresh
 from core.resume_builder import ResumeBuilder
 from core.resume.pdf_generator import generate_resume_pdf
 from database.models.user_models import (
@@ -19,14 +19,17 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# ResumeBuilder uses the sync database client, so handlers are plain functions:
+# FastAPI runs them in its threadpool instead of blocking the event loop.
+
 
 @router.post("/education", response_model=UserEducation)
-async def add_education(
+def add_education(
     education: UserEducationCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
 ):
     try:
-        builder = ResumeBuilder()
         return builder.add_education(current_user.id, education)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -35,22 +38,24 @@ async def add_education(
 
 
 @router.get("/education", response_model=List[UserEducation])
-async def get_user_education(current_user: User = Depends(get_current_user)):
+def get_user_education(
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
+):
     try:
-        builder = ResumeBuilder()
         return builder.get_user_education(current_user.id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve education")
 
 
 @router.put("/education/{education_id}", response_model=UserEducation)
-async def update_education(
+def update_education(
     education_id: str,
     education: UserEducationCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
 ):
     try:
-        builder = ResumeBuilder()
         result = builder.update_education(education_id, current_user.id, education)
         if not result:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Education entry not found")
@@ -60,12 +65,12 @@ async def update_education(
 
 
 @router.delete("/education/{education_id}")
-async def delete_education(
+def delete_education(
     education_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
 ):
     try:
-        builder = ResumeBuilder()
         success = builder.delete_education(education_id, current_user.id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Education entry not found")
@@ -74,12 +79,12 @@ async def delete_education(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete education")
 
 @router.post("/experience", response_model=UserExperience)
-async def add_experience(
+def add_experience(
     experience: UserExperienceCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
 ):
     try:
-        builder = ResumeBuilder()
         return builder.add_experience(current_user.id, experience)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -88,22 +93,24 @@ async def add_experience(
 
 
 @router.get("/experience", response_model=List[UserExperience])
-async def get_user_experience(current_user: User = Depends(get_current_user)):
+def get_user_experience(
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
+):
     try:
-        builder = ResumeBuilder()
         return builder.get_user_experience(current_user.id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve experience")
 
 
 @router.put("/experience/{experience_id}", response_model=UserExperience)
-async def update_experience(
+def update_experience(
     experience_id: str,
     experience: UserExperienceCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
 ):
     try:
-        builder = ResumeBuilder()
         result = builder.update_experience(experience_id, current_user.id, experience)
         if not result:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Experience entry not found")
@@ -112,12 +119,12 @@ async def update_experience(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update experience")
 
 @router.delete("/experience/{experience_id}")
-async def delete_experience(
+def delete_experience(
     experience_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
 ):
     try:
-        builder = ResumeBuilder()
         success = builder.delete_experience(experience_id, current_user.id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Experience entry not found")
@@ -126,16 +133,16 @@ async def delete_experience(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete experience")
 
 @router.post("/skills", response_model=UserSkill)
-async def add_skill(
+def add_skill(
     skill: UserSkillCreate,
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
 ):
     try:
-        builder = ResumeBuilder()
         result = builder.add_skill(current_user.id, skill)
         
-        background_tasks.add_task(regenerate_job_matches_background, current_user.id)
+        enqueue_profile_refresh(current_user.id)
+        enqueue_match_regeneration(current_user.id, added_skills=[result.skill_name])
         
         return result
     except ValueError as e:
@@ -145,21 +152,23 @@ async def add_skill(
 
 
 @router.get("/skills", response_model=List[UserSkill])
-async def get_user_skills(current_user: User = Depends(get_current_user)):
+def get_user_skills(
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
+):
     try:
-        builder = ResumeBuilder()
         return builder.get_user_skills(current_user.id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve skills")
 
 @router.put("/skills/{skill_id}", response_model=UserSkill)
-async def update_skill(
+def update_skill(
     skill_id: str,
     skill: UserSkillCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
 ):
     try:
-        builder = ResumeBuilder()
         result = builder.update_skill(skill_id, current_user.id, skill)
         if not result:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill entry not found")
@@ -169,22 +178,22 @@ async def update_skill(
 
 
 @router.delete("/skills/{skill_id}")
-async def delete_skill(
+def delete_skill(
     skill_id: str,
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
 ):
     try:
-        builder = ResumeBuilder()
-        success = builder.delete_skill(skill_id, current_user.id)
-        if not success:
+        deleted = builder.remove_skill(skill_id, current_user.id)
+        if not deleted:
             logger.warning(f"Skill {skill_id} not found for user {current_user.id}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Skill entry not found")
         logger.info(f"Successfully deleted skill {skill_id} for user {current_user.id}")
         
         # Trigger job match regeneration in background after deleting skill
         logger.info(f"Scheduling job match regeneration for user {current_user.id} after deleting skill")
-        background_tasks.add_task(regenerate_job_matches_background, current_user.id)
+        enqueue_profile_refresh(current_user.id)
+        enqueue_match_regeneration(current_user.id, removed_skills=[deleted.skill_name])
         
         return {"message": "Skill entry deleted successfully"}
     except HTTPException:
@@ -208,17 +217,20 @@ class ProfileUpdateRequest(BaseModel):
 
 
 @router.put("/profile", response_model=UserProfile)
-async def update_profile(
+def update_profile(
     profile_data: ProfileUpdateRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
 ):
     try:
         logger.info(f"Updating profile for user {current_user.id} with data: {profile_data.model_dump()}")
-        builder = ResumeBuilder()
-        result = builder.update_profile(current_user.id, profile_data.model_dump(exclude_unset=True))
+        update_data = profile_data.model_dump(exclude_unset=True)
+        result = builder.update_profile(current_user.id, update_data)
         if not result:
             logger.error(f"Profile update returned None for user {current_user.id}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+        if "location" in update_data or "experience_years" in update_data:
+            enqueue_profile_refresh(current_user.id)
         logger.info(f"Profile updated successfully for user {current_user.id}")
         return result
     except HTTPException:
@@ -229,9 +241,11 @@ async def update_profile(
 
 
 @router.get("/profile", response_model=UserProfile)
-async def get_profile(current_user: User = Depends(get_current_user)):
+def get_profile(
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
+):
     try:
-        builder = ResumeBuilder()
         profile = builder.get_profile(current_user.id)
         if not profile:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
@@ -240,30 +254,38 @@ async def get_profile(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve profile")
 
 @router.get("/summary")
-async def get_resume_summary(current_user: User = Depends(get_current_user)):
+def get_resume_summary(
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
+):
     try:
-        builder = ResumeBuilder()
         return builder.get_resume_summary(current_user.id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve resume summary")
 
 
 @router.delete("/reset")
-async def reset_resume_data(current_user: User = Depends(get_current_user)):
+def reset_resume_data(
+    current_user: User = Depends(get_verified_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
+):
     try:
-        builder = ResumeBuilder()
         success = builder.clear_user_data(current_user.id)
         if not success:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to reset resume data")
+        # Skills are gone, so the stored profile vector is dropped
+        enqueue_profile_refresh(current_user.id)
         return {"message": "Resume data reset successfully"}
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to reset resume data")
 
 
 @router.get("/export/pdf")
-async def export_resume_pdf(current_user: User = Depends(get_current_user)):
+def export_resume_pdf(
+    current_user: User = Depends(get_current_user),
+    builder: ResumeBuilder = Depends(get_resume_builder)
+):
     try:
-        builder = ResumeBuilder()
         
         # Fetch all user data
         profile = builder.get_profile(current_user.id)
@@ -1,22 +1,39 @@
 import os
+import time
+import hashlib
 import logging
 import httpx
+import jwt
 
-from supabase import create_client, Client
+from supabase import Client, AsyncClient
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from functools import lru_cache
 from typing import Dict, Optional
 
+from database.client_registry import get_shared_client, get_async_shared_client, get_client_registry
+from utils import LRUCache
+
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+# Seconds a validated token is trusted before it is verified again
+TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "60"))
+TOKEN_CACHE_MAX_SIZE = 2000
+JWKS_CACHE_TTL = int(os.getenv("AUTH_JWKS_CACHE_TTL", "600"))
+JWT_LEEWAY_SECONDS = 10
+ASYMMETRIC_JWT_ALGORITHMS = {"RS256", "ES256"}
+# Set to "true" to always verify with the Supabase auth server instead of locally
+REMOTE_TOKEN_VALIDATION = os.getenv("AUTH_REMOTE_VALIDATION", "false").lower() == "true"
+
 class SupabaseConfig:
     def __init__(self):
         self.url = os.getenv("SUPABASE_URL")
         self.key = os.getenv("SUPABASE_KEY")
         self.service_role_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        self.jwt_secret = os.getenv("SUPABASE_JWT_SECRET")
+        self.jwt_audience = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
         
         if not self.url or not self.key:
             raise ValueError("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
@@ -26,49 +43,198 @@ def get_supabase_config() -> SupabaseConfig:
     return SupabaseConfig()
 
 def get_supabase_client() -> Client:
+    """Shared anon client on the pooled HTTP session. Never sign users in with it."""
+    try:
+        get_supabase_config()
+        return get_shared_client("anon")
+    except Exception as e:
+        raise ValueError("Authentication service unavailable")
+
+def get_supabase_auth_client() -> Client:
+    """Fresh anon client (same connection pool) for sign-in/sign-up, which store a session on the client."""
+    try:
+        get_supabase_config()
+        return get_client_registry().create_auth_client()
+    except Exception as e:
+        raise ValueError("Authentication service unavailable")
+
+async def get_async_supabase_auth_client() -> AsyncClient:
+    """Async variant of get_supabase_auth_client for use in async routes."""
     try:
-        config = get_supabase_config()
-        return create_client(config.url, config.key)
+        get_supabase_config()
+        return await get_client_registry().create_async_auth_client()
     except Exception as e:
         raise ValueError("Authentication service unavailable")
 
+async def get_async_supabase_admin_client() -> AsyncClient:
+    try:
+        get_supabase_config()
+        return await get_async_shared_client("service")
+    except Exception as e:
+        raise ValueError("Admin service unavailable")
+
 def get_supabase_admin_client() -> Client:
     try:
-        config = get_supabase_config()
-        if not config.service_role_key:
-            return create_client(config.url, config.key)
-        return create_client(config.url, config.service_role_key)
+        get_supabase_config()
+        return get_shared_client("service")
     except Exception as e:
         raise ValueError("Admin service unavailable")
 
-def validate_token(token: str) -> Optional[Dict]:
+class TokenValidationError(Exception):
+    """Raised when a token is rejected; reason is "invalid", "expired" or "email_unconfirmed"."""
+
+    def __init__(self, reason: str, message: str = ""):
+        super().__init__(message or reason)
+        self.reason = reason
+
+
+# Short-lived cache of validated tokens (keyed by token hash) so repeated polling skips verification
+_token_cache = LRUCache(max_size=TOKEN_CACHE_MAX_SIZE, ttl=TOKEN_CACHE_TTL)
+
+
+@lru_cache()
+def _get_jwks_client() -> jwt.PyJWKClient:
+    config = get_supabase_config()
+    return jwt.PyJWKClient(
+        f"{config.url.rstrip('/')}/auth/v1/.well-known/jwks.json",
+        cache_keys=True,
+        lifespan=JWKS_CACHE_TTL,
+        headers={"apikey": config.key}
+    )
+
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _user_from_claims(claims: Dict) -> Dict:
+    return {
+        "id": claims.get("sub"),
+        "email": claims.get("email"),
+        "user_metadata": claims.get("user_metadata") or {}
+    }
+
+
+def verify_token_locally(token: str) -> Optional[Dict]:
+    """
+    Verify a Supabase access token without calling the auth server.
+
+    HS256 tokens are checked against SUPABASE_JWT_SECRET, asymmetric tokens against
+    the project's cached JWKS. Returns the user dict, or None when the token cannot be
+    verified locally (HS256 token but no secret configured).
+
+    Raises:
+        TokenValidationError: if the signature, expiry, audience or email confirmation fails
+    """
+    config = get_supabase_config()
+
+    try:
+        algorithm = jwt.get_unverified_header(token).get("alg")
+        if algorithm == "HS256":
+            if not config.jwt_secret:
+                return None
+            key = config.jwt_secret
+        elif algorithm in ASYMMETRIC_JWT_ALGORITHMS:
+            key = _get_jwks_client().get_signing_key_from_jwt(token).key
+        else:
+            raise TokenValidationError("invalid", f"Unsupported token algorithm: {algorithm}")
+
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=config.jwt_audience,
+            leeway=JWT_LEEWAY_SECONDS,
+            options={"require": ["exp", "sub"]}
+        )
+    except jwt.ExpiredSignatureError:
+        raise TokenValidationError("expired", "Token has expired")
+    except jwt.PyJWKClientError as e:
+        # JWKS endpoint unreachable or key not found - let the caller fall back to the remote check
+        logger.warning(f"JWKS lookup failed: {str(e)}")
+        return None
+    except jwt.InvalidTokenError as e:
+        raise TokenValidationError("invalid", str(e))
+
+    # Supabase only issues sessions to confirmed users when confirmations are enabled;
+    # reject tokens whose metadata explicitly says the email is unverified.
+    if (claims.get("user_metadata") or {}).get("email_verified") is False and not claims.get("is_anonymous"):
+        raise TokenValidationError("email_unconfirmed", "Email address not confirmed")
+
+    return _user_from_claims(claims)
+
+
+def verify_token_remotely(token: str) -> Dict:
+    """
+    Verify a token with the Supabase auth server (catches revoked sessions and deleted users).
+
+    Raises:
+        TokenValidationError: if the auth server rejects the token
+    """
+    supabase = get_supabase_client()
+    try:
+        user_response = supabase.auth.get_user(token)
+    except (httpx.TimeoutException, httpx.ConnectTimeout, httpx.ReadTimeout) as timeout_error:
+        logger.warning(f"Token validation timeout: {str(timeout_error)}")
+        raise TokenValidationError("invalid", "Token validation timed out")
+    except Exception as e:
+        raise TokenValidationError("invalid", str(e))
+
+    if not user_response or not user_response.user:
+        logger.warning("Token validation failed: No user in response")
+        raise TokenValidationError("invalid", "No user in response")
+
+    if hasattr(user_response.user, 'email_confirmed_at') and not user_response.user.email_confirmed_at:
+        raise TokenValidationError("email_unconfirmed", "Email address not confirmed")
+
+    return {
+        "id": user_response.user.id,
+        "email": user_response.user.email,
+        "user_metadata": user_response.user.user_metadata or {}
+    }
+
+
+def _validate_token(token: str, remote: bool = False) -> Dict:
+    cache_key = _token_cache_key(token)
+
+    if not remote:
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    user = None if remote or REMOTE_TOKEN_VALIDATION else verify_token_locally(token)
+    if user is None:
+        user = verify_token_remotely(token)
+
+    # Never cache a token past its own expiry
+    ttl = TOKEN_CACHE_TTL
+    try:
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        if exp:
+            ttl = min(ttl, int(exp - time.time()))
+    except jwt.InvalidTokenError:
+        pass
+    if ttl > 0:
+        _token_cache.set(cache_key, user, ttl=ttl)
+
+    return user
+
+
+def validate_token(token: str, remote: bool = False) -> Optional[Dict]:
+    """Return the user for a valid token, or None. Pass remote=True to force an auth server check."""
     if not token:
         return None
-        
+
     try:
-        supabase = get_supabase_client()
-        try:
-            user_response = supabase.auth.get_user(token)
-        except (httpx.TimeoutException, httpx.ConnectTimeout, httpx.ReadTimeout) as timeout_error:
-            logger.warning(f"Token validation timeout: {str(timeout_error)}")
-            return None
-        
-        if not user_response.user:
-            logger.warning("Token validation failed: No user in response")
-            return None
-        
-        if hasattr(user_response.user, 'email_confirmed_at') and not user_response.user.email_confirmed_at:
-            return None
-            
-        return {
-            "id": user_response.user.id,
-            "email": user_response.user.email,
-            "user_metadata": user_response.user.user_metadata or {}
-        }
+        return _validate_token(token, remote=remote)
+    except TokenValidationError:
+        return None
     except Exception as e:
+        logger.warning(f"Token validation error: {str(e)}")
         return None
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
+
+def _authenticate(credentials: HTTPAuthorizationCredentials, remote: bool) -> Dict:
     if not credentials or not credentials.credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -76,27 +242,30 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = validate_token(credentials.credentials)
-    if not user:
-        try:
-            supabase = get_supabase_client()
-            user_response = supabase.auth.get_user(credentials.credentials)
-            if user_response.user and hasattr(user_response.user, 'email_confirmed_at') and not user_response.user.email_confirmed_at:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Please confirm your email address before accessing this resource",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-        except:
-            pass
-            
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    try:
+        return _validate_token(credentials.credentials, remote=remote)
+    except TokenValidationError as e:
+        if e.reason == "email_unconfirmed":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Please confirm your email address before accessing this resource",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    except Exception as e:
+        logger.warning(f"Token validation error: {str(e)}")
 
-    return user
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
+    return _authenticate(credentials, remote=False)
+
+def get_current_user_verified(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
+    """Like get_current_user, but always confirms the session with Supabase (for revocation-sensitive routes)."""
+    return _authenticate(credentials, remote=True)
 
 def get_current_user_email(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     user = get_current_user(credentials)
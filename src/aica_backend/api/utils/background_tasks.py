@@ -1,113 +1,272 @@
+"""
+Resume processing and job matching tasks.
+
+The API enqueues these (see the enqueue_* helpers); the embedded worker in main.py
+(or worker.py) executes them through TASK_HANDLERS. Task functions raise on failure so the queue can retry.
+"""
+import os
 import logging
-import asyncio
-from database.user_db import UserDatabase
-from database.job_db import JobDatabase
+from typing import Any, Dict, Iterable, Optional
+
+from database.async_user_db import AsyncUserDatabase
+from database.async_job_db import AsyncJobDatabase
 from services.job_matching import JobMatchingService
+from services.task_queue import Task, get_task_queue
+from services.processing_events import get_processing_event_bus
+from services.user_profiles import UserProfileService
 from core.resume import ResumeParser
 
 logger = logging.getLogger(__name__)
 
+# Task kinds
+PROCESS_RESUME = "process_resume"
+MATCH_JOBS = "match_jobs"
+REGENERATE_MATCHES = "regenerate_matches"
+REFRESH_PROFILE_VECTOR = "refresh_profile_vector"
+
+# Seconds without further skill edits before matches are regenerated
+MATCH_REGENERATION_QUIET_PERIOD = float(os.getenv("MATCH_REGENERATION_QUIET_PERIOD", "10"))
+# Shorter, so the profile vector is current before matches are regenerated
+PROFILE_REFRESH_QUIET_PERIOD = float(os.getenv("PROFILE_REFRESH_QUIET_PERIOD", "2"))
+
+
+async def set_processing_step(db: AsyncUserDatabase, user_id: str, step: str, **fields: Any) -> None:
+    """Store the user's processing step and publish it to status streams."""
+    await db.update_user_profile(user_id, {"processing_step": step, **fields})
+    await get_processing_event_bus().publish_async(user_id, step, **fields)
+
+
+async def refresh_profile_vector_background(user_id: str) -> bool:
+    # Share the sentence transformer already loaded by the matching service
+    matching_service = JobMatchingService()
+    profile_service = UserProfileService(matching_service.embedder, user_db=matching_service.user_db)
+    return await profile_service.refresh_user(user_id)
 
-async def regenerate_job_matches_background(user_id: str):
 
+async def regenerate_job_matches_background(
+    user_id: str,
+    added_skills: Optional[Iterable[str]] = None,
+    removed_skills: Optional[Iterable[str]] = None
+):
+    """Refresh a user's matches after skill edits.
+
+    When the edited skills are known and the user already has matches, only the
+    jobs listing those skills are rescored; otherwise matches are rebuilt.
+    """
     try:
         matching_service = JobMatchingService()
-   
-        matching_service.user_db.clear_job_matches(user_id)
+
+        if added_skills or removed_skills:
+            if await matching_service.user_db.get_user_job_matches(user_id, limit=1):
+                try:
+                    return await matching_service.update_matches_for_skill_change(
+                        user_id, added_skills or [], removed_skills or []
+                    )
+                except Exception as e:
+                    logger.warning(f"Incremental match update failed for user {user_id}, rebuilding: {e}")
+
+        await matching_service.user_db.clear_job_matches(user_id)
 
         result = await matching_service.update_matches_for_user(user_id)
         return result
     except Exception as e:
         logger.error(f"Failed to regenerate matches for user {user_id}: {e}")
+        raise
+
 
+async def job_matching_background(user_id: str):
+    db = AsyncUserDatabase()
 
-async def delayed_job_matching_background(user_id: str):
-    await asyncio.sleep(3)  
-    
-    db = UserDatabase()
-    
     try:
-        db.update_user_profile(user_id, {"processing_step": "matching"})
+        await set_processing_step(db, user_id, "matching")
 
-        user_skills = db.get_user_skills(user_id)
+        user_skills = await db.get_user_skills(user_id)
         if not user_skills:
-            db.update_user_profile(user_id, {
-                "processing_step": "completed",
-                "matches_generated": False
-            })
+            await set_processing_step(db, user_id, "completed", matches_generated=False)
             return
-        
+
         # Get available jobs
-        job_db = JobDatabase()
-        jobs = job_db.get_jobs_for_matching(limit=500)
-        
+        job_db = AsyncJobDatabase()
+        jobs = await job_db.get_jobs_for_matching(limit=500)
+
         if not jobs:
-            db.update_user_profile(user_id, {
-                "processing_step": "completed",
-                "matches_generated": False
-            })
+            await set_processing_step(db, user_id, "completed", matches_generated=False)
             return
-        
+
         matching_service = JobMatchingService()
-        
+
         result = await matching_service.update_matches_for_user(user_id)
-        
+
         matches_saved = result.get('matches_saved', 0)
-        
+
         # Update profile to indicate matches are ready
-        db.update_user_profile(user_id, {
-            "processing_step": "completed",
-            "matches_generated": matches_saved > 0
-        })
-        
+        await set_processing_step(db, user_id, "completed", matches_generated=matches_saved > 0)
+        return result
+
     except Exception as e:
         try:
-            db.update_user_profile(user_id, {
-                "processing_step": "error",
-                "processing_error": f"Job matching failed: {str(e)}"
-            })
+            await set_processing_step(db, user_id, "error", processing_error=f"Job matching failed: {str(e)}")
         except Exception as update_error:
             logger.error(f"Failed to update error status: {update_error}")
+        raise
+
+
+# Backward compatibility alias (matching no longer sleeps; it runs after the parse task)
+delayed_job_matching_background = job_matching_background
 
 
 async def process_resume_background(user_id: str, file_content: bytes, file_type: str, mode: str = None):
-    db = UserDatabase()
-    
+    db = AsyncUserDatabase()
+
     try:
-        user = db.get_user_by_id(user_id)
+        user = await db.get_user_by_id(user_id)
         if not user:
             return
 
-        if mode == "replace" or mode is None:
-            db.update_user_profile(user_id, {"processing_step": "clearing_old_data"})
-            try:
-                db.clear_user_skills(user_id)
-                db.clear_user_education(user_id)
-                db.clear_user_experience(user_id)
-                db.clear_job_matches(user_id)
-                logger.info(f"Successfully cleared all old data for user {user_id}")
-            except Exception as clear_error:
-                logger.error(f"Error clearing old data for user {user_id}: {clear_error}")
-
         # Parse resume
-        db.update_user_profile(user_id, {"processing_step": "parsing"})
-        
+        await set_processing_step(db, user_id, "parsing")
+
+        # Clearing old data, storing skills and the final status are one RPC
         parser = ResumeParser()
-        await parser.process_and_store_resume(user_id, file_content, file_type)
-        
-        db.update_user_profile(user_id, {
-            "resume_processed": True,
-            "profile_completed": True,
-            "processing_step": "completed",
-            "matches_generated": False 
-        })
-    
+        await parser.process_and_store_resume(
+            user_id,
+            file_content,
+            file_type,
+            clear_existing=mode == "replace" or mode is None,
+            profile_updates={
+                "resume_processed": True,
+                "profile_completed": True,
+                "processing_step": "completed",
+                "matches_generated": False
+            }
+        )
+        await get_processing_event_bus().publish_async(user_id, "completed", resume_processed=True)
+
+        # New skills and profile fields: update the stored profile vector before matching runs
+        try:
+            await refresh_profile_vector_background(user_id)
+        except Exception as e:
+            logger.warning(f"Failed to refresh profile vector for user {user_id}: {e}")
+
     except Exception as e:
         try:
-            db.update_user_profile(user_id, {
-                "resume_processed": False,
-                "processing_step": "error",
-                "processing_error": str(e)
-            })
+            await set_processing_step(db, user_id, "error", resume_processed=False, processing_error=str(e))
         except Exception as update_error:
             logger.error(f"Failed to update error status for user {user_id}: {str(update_error)}")
+        raise
+
+
+async def _run_process_resume(task: Task) -> Optional[Dict[str, Any]]:
+    await process_resume_background(
+        task.user_id,
+        task.blob,
+        task.payload.get("file_type"),
+        task.payload.get("mode")
+    )
+    return None
+
+
+async def _run_match_jobs(task: Task) -> Optional[Dict[str, Any]]:
+    return await job_matching_background(task.user_id)
+
+
+async def _run_regenerate_matches(task: Task) -> Optional[Dict[str, Any]]:
+    if task.payload.get("full"):
+        return await regenerate_job_matches_background(task.user_id)
+    return await regenerate_job_matches_background(
+        task.user_id,
+        task.payload.get("added_skills"),
+        task.payload.get("removed_skills")
+    )
+
+
+async def _run_refresh_profile_vector(task: Task) -> Optional[Dict[str, Any]]:
+    return {"indexed": await refresh_profile_vector_background(task.user_id)}
+
+
+TASK_HANDLERS = {
+    PROCESS_RESUME: _run_process_resume,
+    MATCH_JOBS: _run_match_jobs,
+    REGENERATE_MATCHES: _run_regenerate_matches,
+    REFRESH_PROFILE_VECTOR: _run_refresh_profile_vector,
+}
+
+
+def enqueue_resume_processing(user_id: str, file_content: bytes, file_type: str, mode: str = None) -> Dict[str, str]:
+    """Queue resume parsing followed by job matching. Returns both task ids."""
+    queue = get_task_queue()
+    parse_task_id = queue.enqueue(
+        PROCESS_RESUME,
+        user_id,
+        payload={"file_type": file_type, "mode": mode},
+        blob=file_content
+    )
+    match_task_id = queue.enqueue(MATCH_JOBS, user_id, depends_on=parse_task_id)
+    get_processing_event_bus().publish(user_id, "queued")
+    return {"parse_task_id": parse_task_id, "match_task_id": match_task_id}
+
+
+def _merge_skill_changes(older: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine the skill edits of coalesced regeneration requests."""
+    if older.get("full") or newer.get("full"):
+        return {"full": True}
+    return {
+        "added_skills": list(dict.fromkeys(older.get("added_skills", []) + newer.get("added_skills", []))),
+        "removed_skills": list(dict.fromkeys(older.get("removed_skills", []) + newer.get("removed_skills", [])))
+    }
+
+
+def enqueue_match_regeneration(
+    user_id: str,
+    added_skills: Optional[Iterable[str]] = None,
+    removed_skills: Optional[Iterable[str]] = None
+) -> str:
+    """
+    Debounced match regeneration after a skill edit.
+
+    Every call restarts the quiet period of the queued run and cancels a run that
+    is already in progress for the user, so a burst of edits produces one
+    regeneration from the latest skills. The edited skill names are accumulated
+    so the run can rescore only the affected jobs; without them (or once any
+    caller omits them) all matches are rebuilt.
+    """
+    if added_skills is None and removed_skills is None:
+        payload = {"full": True}
+    else:
+        payload = {
+            "added_skills": [skill for skill in added_skills or [] if skill],
+            "removed_skills": [skill for skill in removed_skills or [] if skill]
+        }
+
+    return get_task_queue().enqueue(
+        REGENERATE_MATCHES,
+        user_id,
+        payload=payload,
+        delay=MATCH_REGENERATION_QUIET_PERIOD,
+        supersede_running=True,
+        merge_payload=_merge_skill_changes
+    )
+
+
+def enqueue_profile_refresh(user_id: str) -> str:
+    """Debounced update of the user's stored profile vector after skill or profile edits."""
+    return get_task_queue().enqueue(
+        REFRESH_PROFILE_VECTOR,
+        user_id,
+        delay=PROFILE_REFRESH_QUIET_PERIOD
+    )
+
+
+def get_match_refresh_status(user_id: str) -> Dict[str, Any]:
+    """Summarize the user's most recent match regeneration for the profile response."""
+    tasks = [t for t in get_task_queue().get_user_tasks(user_id, limit=10) if t.kind == REGENERATE_MATCHES]
+    if not tasks:
+        return {"status": "idle"}
+
+    latest = tasks[0]
+    status = {"status": latest.status, "task_id": latest.id}
+    if latest.finished_at:
+        status["finished_at"] = latest.finished_at
+    if latest.status == "failed":
+        status["error"] = latest.last_error
+    return status
@@ -1,8 +1,10 @@
 from .models import MatchResult, JobMatch
 from .matcher import JobMatcher
+from .skill_index import SkillJobIndex
 
 __all__ = [
     "JobMatcher",
+    "SkillJobIndex",
     "MatchResult",
     "JobMatch",
 ]
@@ -29,6 +29,32 @@ class JobMatcher:
         except Exception:
             raise
     
+    @staticmethod
+    def score_compatibility(user_skills: List[str], job_skills: List[str]) -> Dict:
+        """Deterministic part of calculate_compatibility (no LLM call)."""
+        # Find exact and partial matches
+        matched_skills = SkillMatcher.find_exact_matches(user_skills, job_skills)
+        partial_matches = SkillMatcher.find_partial_matches(user_skills, job_skills)
+        missing_skills = SkillMatcher.find_missing_skills(user_skills, job_skills)
+
+        # Calculate scores
+        total_required = len(job_skills) if job_skills else 1
+        skill_coverage = len(matched_skills) / total_required
+        compatibility_score = SkillMatcher.calculate_weighted_match_score(user_skills, job_skills)
+
+        # Determine confidence
+        confidence = MatchScorer.calculate_confidence(compatibility_score, skill_coverage)
+
+        return {
+            "compatibility_score": compatibility_score,
+            "confidence": confidence,
+            "skill_coverage": skill_coverage,
+            "matched_skills": matched_skills,
+            "partial_matches": partial_matches,
+            "missing_skills": missing_skills,
+            "total_required": total_required
+        }
+
     async def calculate_compatibility(
         self,
         user_skills: List[str],
@@ -37,18 +63,14 @@ class JobMatcher:
         company: str
     ) -> Dict:
         try:
-            # Find exact and partial matches
-            matched_skills = SkillMatcher.find_exact_matches(user_skills, job_skills)
-            partial_matches = SkillMatcher.find_partial_matches(user_skills, job_skills)
-            missing_skills = SkillMatcher.find_missing_skills(user_skills, job_skills)
-            
-            # Calculate scores
-            total_required = len(job_skills) if job_skills else 1
-            skill_coverage = len(matched_skills) / total_required
-            compatibility_score = SkillMatcher.calculate_weighted_match_score(user_skills, job_skills)
-            
-            # Determine confidence
-            confidence = MatchScorer.calculate_confidence(compatibility_score, skill_coverage)
+            scores = self.score_compatibility(user_skills, job_skills)
+            matched_skills = scores["matched_skills"]
+            partial_matches = scores["partial_matches"]
+            missing_skills = scores["missing_skills"]
+            total_required = scores["total_required"]
+            skill_coverage = scores["skill_coverage"]
+            compatibility_score = scores["compatibility_score"]
+            confidence = scores["confidence"]
             
             # Generate comprehensive AI reasoning
             ai_reasoning = await self.ai_analyzer.generate_comprehensive_analysis(
@@ -0,0 +1,87 @@
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+from .skill_matcher import SkillMatcher
+
+logger = logging.getLogger(__name__)
+
+
+class SkillJobIndex:
+    """
+    Inverted index from normalized job skill to the ids of jobs that list it.
+
+    Used to find the jobs whose score can change when a user adds or removes a
+    single skill. A user skill affects a job skill under the same rules the
+    scorer uses (exact, substring or relationship/variation match), so lookups
+    scan the skill vocabulary once instead of every job's skill list.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._job_skills: Dict[str, List[str]] = {}
+        self.built_at: float = 0.0
+
+    @staticmethod
+    def _normalize(skill: str) -> str:
+        return skill.lower().strip()
+
+    def add_job(self, job_id: str, job_skills: Iterable[str]) -> None:
+        self.remove_job(job_id)
+        skills = [skill for skill in job_skills if skill and skill.strip()]
+        self._job_skills[job_id] = skills
+        for skill in skills:
+            self._postings.setdefault(self._normalize(skill), set()).add(job_id)
+
+    def remove_job(self, job_id: str) -> None:
+        for skill in self._job_skills.pop(job_id, []):
+            key = self._normalize(skill)
+            postings = self._postings.get(key)
+            if postings is None:
+                continue
+            postings.discard(job_id)
+            if not postings:
+                del self._postings[key]
+
+    def build(self, jobs: Dict[str, List[str]]) -> "SkillJobIndex":
+        """Index a {job_id: required skills} mapping, replacing the current contents."""
+        self._postings.clear()
+        self._job_skills.clear()
+        for job_id, job_skills in jobs.items():
+            self.add_job(job_id, job_skills)
+        self.built_at = time.time()
+        logger.info(f"Built skill index: {len(self._job_skills)} jobs, {len(self._postings)} distinct skills")
+        return self
+
+    def _skill_affects(self, user_skill: str, job_skill: str) -> bool:
+        return (user_skill == job_skill or
+                user_skill in job_skill or
+                job_skill in user_skill or
+                SkillMatcher.check_skill_relationship(user_skill, job_skill))
+
+    def jobs_for_skill(self, skill: str) -> Set[str]:
+        """Ids of jobs whose match with a user can change when this skill is added or removed."""
+        user_skill = self._normalize(skill)
+        if not user_skill:
+            return set()
+
+        job_ids = set(self._postings.get(user_skill, ()))
+        for job_skill, postings in self._postings.items():
+            if job_skill != user_skill and self._skill_affects(user_skill, job_skill):
+                job_ids.update(postings)
+        return job_ids
+
+    def jobs_for_skills(self, skills: Iterable[str]) -> Set[str]:
+        job_ids: Set[str] = set()
+        for skill in skills:
+            job_ids.update(self.jobs_for_skill(skill))
+        return job_ids
+
+    def get_job_skills(self, job_id: str) -> Optional[List[str]]:
+        return self._job_skills.get(job_id)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._job_skills
+
+    def __len__(self) -> int:
+        return len(self._job_skills)
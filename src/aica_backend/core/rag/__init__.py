@@ -16,6 +16,8 @@ The module is organized into the following submodules:
 Public API (maintains backward compatibility):
 - TextEmbedder: HuggingFace-based text embedder
 - VectorJobStore: FAISS-based vector store for job search
+- UserProfileStore: one vector per user, for matching new jobs to users
+- KeywordIndex: BM25 index over job titles, skills and requirements
 
 New functionality:
 - Retrieval: Retriever, QueryBuilder, UserContext, ResultRanker, ResultFilter
@@ -24,7 +26,7 @@ New functionality:
 
 # Import from refactored modules
 from .embeddings import TextEmbedder, HuggingFaceEmbedder
-from .storage import VectorJobStore, FAISSStore
+from .storage import VectorJobStore, FAISSStore, UserProfileStore, VectorSearchFilter, KeywordIndex
 from .chunking import JobChunker
 from .retrieval import (
     Retriever,
@@ -46,6 +48,7 @@ from .config import (
     CHUNK_SIZE,
     CHUNK_OVERLAP,
     DEFAULT_VECTOR_STORE_PATH,
+    DEFAULT_USER_INDEX_PATH,
     DEFAULT_SEARCH_K,
     DEFAULT_SCORE_THRESHOLD
 )
@@ -59,6 +62,9 @@ __all__ = [
     # Core classes
     'HuggingFaceEmbedder',
     'FAISSStore',
+    'UserProfileStore',
+    'VectorSearchFilter',
+    'KeywordIndex',
     'JobChunker',
     
     # Retrieval classes (new)
@@ -81,6 +87,7 @@ __all__ = [
     'CHUNK_SIZE',
     'CHUNK_OVERLAP',
     'DEFAULT_VECTOR_STORE_PATH',
+    'DEFAULT_USER_INDEX_PATH',
     'DEFAULT_SEARCH_K',
     'DEFAULT_SCORE_THRESHOLD',
 ]
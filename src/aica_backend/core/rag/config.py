@@ -25,6 +25,22 @@ DEFAULT_VECTOR_STORE_PATH: Final[str] = "./faiss_job_index"
 # FAISS index file extension
 FAISS_INDEX_EXTENSION: Final[str] = ".faiss"
 
+# Default path for the user profile index (one vector per user, for reverse matching)
+DEFAULT_USER_INDEX_PATH: Final[str] = "./faiss_user_index"
+
+# Keyword (BM25) index file extension, stored next to the FAISS index
+KEYWORD_INDEX_EXTENSION: Final[str] = ".bm25"
+
+# BM25 term frequency saturation and length normalization
+BM25_K1: Final[float] = 1.2
+BM25_B: Final[float] = 0.75
+
+# Term frequency weight per indexed job field
+KEYWORD_FIELD_WEIGHTS: Final[dict] = {"title": 2, "skills": 3, "requirements": 1}
+
+# Compact the keyword index on save once this share of its documents is removed
+KEYWORD_COMPACT_RATIO: Final[float] = 0.2
+
 
 # Default number of results to return
 DEFAULT_SEARCH_K: Final[int] = 10
@@ -35,6 +51,10 @@ DEFAULT_SCORE_THRESHOLD: Final[float] = 0.3
 # Multiplier for initial search to allow for re-ranking
 SEARCH_EXPANSION_FACTOR: Final[int] = 4
 
+# Filtered searches over at most this many vectors pass an explicit id list to
+# FAISS; larger subsets pass a bitmap over all vectors instead
+FILTER_ID_LIST_MAX: Final[int] = 4096
+
 # Weight for top matching chunk
 TOP_CHUNK_WEIGHT: Final[float] = 0.5
 
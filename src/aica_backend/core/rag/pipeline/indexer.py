@@ -1,7 +1,8 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import logging
 
 from ..storage.faiss_store import FAISSStore
+from ..storage.keyword_index import KeywordIndex
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,7 @@ class JobIndexer:
     1. Formats job data into searchable content
     2. Creates embeddings using the chunker
     3. Stores in FAISS vector store for fast similarity search
+    4. Adds title, skills and requirements to the BM25 keyword index
     
     Example:
         >>> from core.rag import VectorJobStore, TextEmbedder
@@ -29,13 +31,15 @@ class JobIndexer:
         >>> print(f"Indexed {stats['indexed_jobs']} jobs")
     """
     
-    def __init__(self, vector_store: FAISSStore):
+    def __init__(self, vector_store: FAISSStore, keyword_index: Optional[KeywordIndex] = None):
         self.vector_store = vector_store
         self.chunker = vector_store.chunker
+        # Persisted next to the FAISS index
+        self.keyword_index = keyword_index or KeywordIndex(vector_store.persist_path)
     
     def index_scraped_jobs(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
         if not jobs:
-            return {"total_jobs": 0, "indexed_jobs": 0, "failed_jobs": 0, "skipped_jobs": 0}
+            return {"total_jobs": 0, "indexed_jobs": 0, "failed_jobs": 0, "skipped_jobs": 0, "indexed_job_ids": []}
         
         logger.info(f"Starting batch indexing of {len(jobs)} jobs")
         
@@ -43,7 +47,9 @@ class JobIndexer:
             "total_jobs": len(jobs),
             "indexed_jobs": 0,
             "failed_jobs": 0,
-            "skipped_jobs": 0
+            "skipped_jobs": 0,
+            # Ids of jobs that were new to the index (used for reverse matching)
+            "indexed_job_ids": []
         }
         
         for job in jobs:
@@ -58,6 +64,9 @@ class JobIndexer:
                 # Check if already indexed (optional optimization)
                 if self._is_already_indexed(job_id):
                     logger.debug(f"Job {job_id} already indexed, skipping")
+                    # Backfill jobs embedded before the keyword index existed
+                    if not self.keyword_index.has_job(job_id):
+                        self._add_to_keyword_index(job_id, job)
                     stats["skipped_jobs"] += 1
                     continue
                 
@@ -69,15 +78,18 @@ class JobIndexer:
                 
                 # Add to vector store (handles chunking internally)
                 self.vector_store.add_job(job_id, content, metadata)
+                self._add_to_keyword_index(job_id, job)
                 
                 stats["indexed_jobs"] += 1
+                stats["indexed_job_ids"].append(job_id)
                 
             except Exception as e:
                 logger.error(f"Failed to index job {job.get('job_id', 'unknown')}: {str(e)}")
                 stats["failed_jobs"] += 1
         
-        # Save the updated vector store
+        # Save the updated vector store and keyword index
         self.vector_store.save()
+        self.keyword_index.save()
         
         logger.info(
             f"Indexing complete: "
@@ -126,9 +138,18 @@ class JobIndexer:
             "source": job.get("source", ""),
             "url": job.get("url", ""),
             "skills": job.get("skills", []),
-            "posted_date": job.get("posted_date", "")
+            "posted_date": job.get("posted_date", ""),
+            "is_active": job.get("is_active", True)
         }
     
+    def _add_to_keyword_index(self, job_id: str, job: Dict[str, Any]) -> None:
+        self.keyword_index.add_job(
+            job_id,
+            title=job.get("title", ""),
+            skills=job.get("skills", []),
+            requirements=job.get("requirements", [])
+        )
+    
     def _is_already_indexed(self, job_id: str) -> bool:
         try:
             # Check metadata manager
@@ -139,8 +160,10 @@ class JobIndexer:
     
     def remove_job(self, job_id: str) -> bool:
         try:
-            # This removes from metadata only
+            # This removes from metadata and the keyword index only
             self.vector_store.metadata_manager.remove_job(job_id)
+            if self.keyword_index.remove_job(job_id):
+                self.keyword_index.save()
             logger.info(f"Removed job {job_id} from metadata")
             return True
         except Exception as e:
@@ -151,5 +174,6 @@ class JobIndexer:
         return {
             "total_jobs": self.vector_store.get_document_count(),
             "metadata_count": self.vector_store.metadata_manager.get_job_count(),
+            "keyword_index": self.keyword_index.get_stats(),
             **self.vector_store.get_stats()
         }
@@ -1,7 +1,8 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import logging
 
 from ..storage.base import BaseVectorStore
+from ..storage.attribute_index import VectorSearchFilter
 from ..retrieval.query_builder import QueryBuilder, UserContext
 
 logger = logging.getLogger(__name__)
@@ -19,7 +20,8 @@ class JobSearcher:
         context: UserContext,
         top_k: int = 10,
         use_multi_query: bool = True,
-        score_threshold: float = 0.3
+        score_threshold: float = 0.3,
+        filters: Optional[VectorSearchFilter] = None
     ) -> List[Dict[str, Any]]:
         try:
 
@@ -37,7 +39,8 @@ class JobSearcher:
                     results = self.vector_store.search_similar_jobs(
                         query_text=query,
                         k=top_k * 2,
-                        score_threshold=score_threshold
+                        score_threshold=score_threshold,
+                        filters=filters
                     )
                     
                     # Deduplicate by job_id
@@ -59,7 +62,8 @@ class JobSearcher:
                 matches = self.vector_store.search_similar_jobs(
                     query_text=query,
                     k=top_k,
-                    score_threshold=score_threshold
+                    score_threshold=score_threshold,
+                    filters=filters
                 )
             
             return matches
@@ -68,6 +72,25 @@ class JobSearcher:
             logger.error(f"Search failed: {str(e)}", exc_info=True)
             return []
     
+    def search_jobs_by_vector(
+        self,
+        query_embedding: List[float],
+        top_k: int = 10,
+        score_threshold: float = 0.3,
+        filters: Optional[VectorSearchFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """Search with a precomputed query vector (a stored user profile vector) instead of query text."""
+        try:
+            return self.vector_store.search_similar_jobs_by_vector(
+                query_embedding,
+                k=top_k,
+                score_threshold=score_threshold,
+                filters=filters
+            )
+        except Exception as e:
+            logger.error(f"Vector search failed: {str(e)}", exc_info=True)
+            return []
+    
     def search_by_skills(
         self,
         skills: List[str],
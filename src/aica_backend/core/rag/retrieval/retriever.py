@@ -1,8 +1,9 @@
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Set
 
 from .query_builder import QueryBuilder, UserContext
 from .ranker import ScoreAggregator, ResultRanker, AggregatedMatch
+from ..storage.attribute_index import VectorSearchFilter
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,8 @@ class Retriever:
         user_context: UserContext,
         k: int = 10,
         score_threshold: float = 0.3,
-        ranking_strategy: str = "weighted"
+        ranking_strategy: str = "weighted",
+        filters: Optional[VectorSearchFilter] = None
     ) -> List[AggregatedMatch]:
         """
         Retrieve and rank relevant jobs for user context.
@@ -30,6 +32,7 @@ class Retriever:
             k: Number of jobs to return
             score_threshold: Minimum similarity threshold
             ranking_strategy: Ranking strategy to use
+            filters: Metadata conditions applied inside the vector search
             
         Returns:
             List of ranked job matches
@@ -43,7 +46,8 @@ class Retriever:
             raw_results = self.vector_store.search_similar_jobs(
                 query_text=query,
                 k=k * 4,  # Get more results for aggregation
-                score_threshold=score_threshold
+                score_threshold=score_threshold,
+                filters=filters
             )
             
             logger.info(f"Retrieved {len(raw_results)} raw results")
@@ -70,7 +74,8 @@ class Retriever:
         self,
         user_context: UserContext,
         k: int = 10,
-        score_threshold: float = 0.3
+        score_threshold: float = 0.3,
+        filters: Optional[VectorSearchFilter] = None
     ) -> List[AggregatedMatch]:
         """
         Retrieve using multiple query variations and merge results.
@@ -79,6 +84,7 @@ class Retriever:
             user_context: User context with skills and preferences
             k: Number of jobs to return
             score_threshold: Minimum similarity threshold
+            filters: Metadata conditions applied inside the vector search
             
         Returns:
             Merged and ranked job matches
@@ -94,7 +100,8 @@ class Retriever:
                 results = self.vector_store.search_similar_jobs(
                     query_text=query,
                     k=k * 2,
-                    score_threshold=score_threshold
+                    score_threshold=score_threshold,
+                    filters=filters
                 )
                 
                 # Merge results, keeping best score for each job
@@ -167,18 +174,74 @@ class Retriever:
         return aggregated
 
 class HybridRetriever(Retriever):
+    """
+    Semantic retrieval fused with a BM25 keyword index.
+    
+    Keyword hits catch exact skill names the embedding blurs, and the keyword
+    path alone still answers when semantic search returns nothing (e.g. the
+    embedder is unavailable).
+    """
     
     def __init__(self, vector_store, keyword_index=None):
         super().__init__(vector_store)
         self.keyword_index = keyword_index
     
+    def retrieve_keywords(
+        self,
+        user_context: UserContext,
+        k: int = 10,
+        filters: Optional[VectorSearchFilter] = None
+    ) -> List[AggregatedMatch]:
+        """
+        Keyword-only retrieval; scores are BM25 normalized to the best hit (0-1).
+        
+        With filters, only jobs a semantic search with the same filters could
+        return are scored (per the vector store's attribute columns), so the
+        keyword path honours locations, sources, dates and the active flag too.
+        """
+        if not self.keyword_index:
+            return []
+        
+        exclude_job_ids = filters.exclude_job_ids if filters else None
+        include_job_ids = None
+        get_filtered_job_ids = getattr(self.vector_store, "get_filtered_job_ids", None)
+        if filters is not None and get_filtered_job_ids is not None:
+            include_job_ids = get_filtered_job_ids(filters)
+        
+        self.keyword_index.reload_if_changed()
+        hits = self.keyword_index.search_skills(user_context.skills, k, exclude_job_ids, include_job_ids)
+        if not hits:
+            return []
+        
+        best = hits[0][1]
+        return [self._keyword_match(job_id, score / best) for job_id, score in hits]
+    
+    def _keyword_match(self, job_id: str, score: float) -> AggregatedMatch:
+        metadata = None
+        metadata_manager = getattr(self.vector_store, "metadata_manager", None)
+        if metadata_manager is not None:
+            metadata = metadata_manager.get_job_metadata(job_id)
+        if metadata is None:
+            metadata = {"job_id": job_id, "title": self.keyword_index.get_title(job_id) or ""}
+        
+        return AggregatedMatch(
+            job_id=job_id,
+            weighted_score=score,
+            best_score=score,
+            num_matches=1,
+            coverage=1,
+            metadata=metadata,
+            matched_chunks=[]
+        )
+    
     def retrieve_hybrid(
         self,
         user_context: UserContext,
         k: int = 10,
         semantic_weight: float = 0.7,
         keyword_weight: float = 0.3,
-        score_threshold: float = 0.3
+        score_threshold: float = 0.3,
+        filters: Optional[VectorSearchFilter] = None
     ) -> List[AggregatedMatch]:
         """
         Retrieve using hybrid semantic + keyword search.
@@ -189,18 +252,51 @@ class HybridRetriever(Retriever):
             semantic_weight: Weight for semantic similarity (0-1)
             keyword_weight: Weight for keyword matching (0-1)
             score_threshold: Minimum similarity threshold
+            filters: Metadata conditions applied inside the vector search
             
         Returns:
             List of ranked job matches
         """
         # Get semantic search results
-        semantic_results = self.retrieve(user_context, k * 2, score_threshold)
+        semantic_results = self.retrieve(user_context, k * 2, score_threshold, filters=filters)
         
         # If no keyword index, return semantic results only
         if not self.keyword_index:
             return semantic_results[:k]
         
-        # TODO: Implement keyword matching and score fusion
-        # For now, return semantic results
-        logger.info("Keyword index not implemented, using semantic search only")
-        return semantic_results[:k]
+        keyword_results = self.retrieve_keywords(user_context, k * 2, filters)
+        
+        if not semantic_results:
+            logger.info("No semantic results, serving keyword matches only")
+            return keyword_results[:k]
+        
+        return self._fuse_scores(semantic_results, keyword_results, k, semantic_weight, keyword_weight)
+    
+    @staticmethod
+    def _fuse_scores(
+        semantic_results: List[AggregatedMatch],
+        keyword_results: List[AggregatedMatch],
+        k: int,
+        semantic_weight: float,
+        keyword_weight: float
+    ) -> List[AggregatedMatch]:
+        """Weighted sum of semantic and normalized keyword scores; a job missing from one side scores 0 there."""
+        keyword_scores = {match.job_id: match.weighted_score for match in keyword_results}
+        fused: Dict[str, AggregatedMatch] = {}
+        
+        for match in semantic_results:
+            match.weighted_score = (semantic_weight * match.weighted_score +
+                                    keyword_weight * keyword_scores.get(match.job_id, 0.0))
+            fused[match.job_id] = match
+        
+        for match in keyword_results:
+            if match.job_id not in fused:
+                match.weighted_score = keyword_weight * match.weighted_score
+                fused[match.job_id] = match
+        
+        ranked = sorted(fused.values(), key=lambda match: match.weighted_score, reverse=True)
+        logger.info(
+            f"Fused {len(semantic_results)} semantic and {len(keyword_results)} keyword results "
+            f"into {len(ranked)} jobs"
+        )
+        return ranked[:k]
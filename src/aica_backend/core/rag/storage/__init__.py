@@ -2,16 +2,24 @@
 Storage module for RAG system.
 
 This module provides vector storage backends for efficient similarity search.
-Currently supports FAISS with support for other backends in the future.
+Currently supports FAISS with support for other backends in the future,
+plus a BM25 keyword index for exact-term lookups.
 """
 
 from .base import BaseVectorStore
 from .metadata_manager import MetadataManager
 from .faiss_store import FAISSStore, VectorJobStore
+from .user_profile_store import UserProfileStore
+from .attribute_index import VectorAttributes, VectorSearchFilter
+from .keyword_index import KeywordIndex
 
 __all__ = [
     'BaseVectorStore',
     'MetadataManager',
     'FAISSStore',
     'VectorJobStore',  # Backward compatibility alias
+    'UserProfileStore',
+    'VectorAttributes',
+    'VectorSearchFilter',
+    'KeywordIndex',
 ]
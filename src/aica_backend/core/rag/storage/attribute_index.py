@@ -0,0 +1,178 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN = -1
+_EPOCH = date(1970, 1, 1)
+_REMOTE_WORDS = ("remote", "anywhere", "worldwide", "work from home", "wfh")
+
+
+def location_bucket(location: Optional[str]) -> str:
+    """Coarse location key: "remote", or the first comma-separated part, lowercased."""
+    if not location or not location.strip():
+        return ""
+    text = location.lower().strip()
+    if any(word in text for word in _REMOTE_WORDS):
+        return "remote"
+    return text.split(",")[0].strip()
+
+
+def posted_day(value) -> int:
+    """Days since 1970-01-01 for a date, datetime or ISO date string, or UNKNOWN."""
+    if not value:
+        return UNKNOWN
+    try:
+        if isinstance(value, datetime):
+            value = value.date()
+        elif not isinstance(value, date):
+            value = date.fromisoformat(str(value)[:10])
+        return (value - _EPOCH).days
+    except (TypeError, ValueError):
+        return UNKNOWN
+
+
+@dataclass
+class VectorSearchFilter:
+    """
+    Conditions applied inside the vector search, before ranking.
+
+    None means "no condition". Vectors without a known posted date pass date
+    conditions, and vectors indexed before the active flag existed count as
+    active. exclude_job_ids removes jobs outright (e.g. jobs the user is
+    already matched with), so they are never scored or returned.
+    """
+    locations: Optional[List[str]] = None
+    sources: Optional[List[str]] = None
+    posted_after: Optional[date] = None
+    posted_before: Optional[date] = None
+    active_only: bool = True
+    include_remote: bool = True
+    exclude_job_ids: Optional[Set[str]] = None
+
+
+@dataclass
+class _Vocabulary:
+    codes: Dict[str, int] = field(default_factory=dict)
+
+    def code(self, value: str) -> int:
+        if not value:
+            return UNKNOWN
+        if value not in self.codes:
+            self.codes[value] = len(self.codes)
+        return self.codes[value]
+
+    def lookup(self, values: Iterable[str]) -> List[int]:
+        return [self.codes[value] for value in values if value in self.codes]
+
+
+class VectorAttributes:
+    """
+    Compact per-vector attribute columns, aligned with FAISS internal ids.
+
+    Each vector (job chunk) has a job code, location bucket, source, posted
+    day and active flag stored in numpy arrays, so a filter becomes a vectorized
+    boolean mask over all vectors that the FAISS search can take as an ID
+    selector instead of filtering results afterwards.
+    """
+
+    def __init__(self):
+        self.job_ids: List[str] = []
+        self._job_codes: Dict[str, int] = {}
+        self._locations = _Vocabulary()
+        self._sources = _Vocabulary()
+        self.job_code = np.empty(0, dtype=np.int32)
+        self.location = np.empty(0, dtype=np.int32)
+        self.source = np.empty(0, dtype=np.int32)
+        self.posted = np.empty(0, dtype=np.int32)
+        self.active = np.empty(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.job_code)
+
+    def _code_for_job(self, job_id: Optional[str]) -> int:
+        if not job_id or job_id == "dummy":
+            return UNKNOWN
+        code = self._job_codes.get(job_id)
+        if code is None:
+            code = len(self.job_ids)
+            self._job_codes[job_id] = code
+            self.job_ids.append(job_id)
+        return code
+
+    def append(self, metadatas: List[Dict]) -> None:
+        """Add attribute rows for newly added vectors, in internal id order."""
+        if not metadatas:
+            return
+
+        job_code, location, source, posted, active = [], [], [], [], []
+        for metadata in metadatas:
+            metadata = metadata or {}
+            is_dummy = metadata.get("is_dummy") or metadata.get("job_id") == "dummy"
+            job_code.append(UNKNOWN if is_dummy else self._code_for_job(metadata.get("job_id")))
+            location.append(self._locations.code(location_bucket(metadata.get("location"))))
+            source.append(self._sources.code((metadata.get("source") or "").lower().strip()))
+            posted.append(posted_day(metadata.get("posted_date")))
+            active.append(not is_dummy and metadata.get("is_active", True) is not False)
+
+        self.job_code = np.concatenate([self.job_code, np.asarray(job_code, dtype=np.int32)])
+        self.location = np.concatenate([self.location, np.asarray(location, dtype=np.int32)])
+        self.source = np.concatenate([self.source, np.asarray(source, dtype=np.int32)])
+        self.posted = np.concatenate([self.posted, np.asarray(posted, dtype=np.int32)])
+        self.active = np.concatenate([self.active, np.asarray(active, dtype=bool)])
+
+    def set_job_active(self, job_id: str, active: bool) -> int:
+        """Flip the active flag of every vector of a job. Returns the number of vectors changed."""
+        return int(self.set_jobs_active([job_id], active).sum())
+
+    def set_jobs_active(self, job_ids: Iterable[str], active: bool) -> np.ndarray:
+        """Set the active flag of every vector of the given jobs in one pass. Returns the rows changed."""
+        rows = self.job_mask(job_ids)
+        self.active[rows] = active
+        return rows
+
+    def matching_job_ids(self, filters: Optional[VectorSearchFilter] = None) -> Set[str]:
+        """Jobs with at least one vector that satisfies the filter."""
+        codes = np.unique(self.job_code[self.mask(filters)])
+        return {self.job_ids[code] for code in codes}
+
+    def job_mask(self, job_ids: Iterable[str]) -> np.ndarray:
+        """Boolean mask of the vectors belonging to any of the given jobs."""
+        codes = [self._job_codes[job_id] for job_id in job_ids if job_id in self._job_codes]
+        if not codes:
+            return np.zeros(len(self), dtype=bool)
+        return np.isin(self.job_code, np.asarray(codes, dtype=np.int32))
+
+    def mask(self, filters: Optional[VectorSearchFilter] = None) -> np.ndarray:
+        """Boolean mask of the vectors that satisfy the filter (dummy vectors never do)."""
+        mask = self.job_code != UNKNOWN
+        if filters is None:
+            return mask
+
+        if filters.active_only:
+            mask &= self.active
+
+        if filters.locations:
+            buckets = {location_bucket(location) for location in filters.locations} - {""}
+            if filters.include_remote:
+                buckets.add("remote")
+            mask &= np.isin(self.location, self._locations.lookup(buckets))
+
+        if filters.sources:
+            sources = {source.lower().strip() for source in filters.sources}
+            mask &= np.isin(self.source, self._sources.lookup(sources))
+
+        unknown_date = self.posted == UNKNOWN
+        if filters.posted_after is not None:
+            mask &= unknown_date | (self.posted >= posted_day(filters.posted_after))
+        if filters.posted_before is not None:
+            mask &= unknown_date | (self.posted <= posted_day(filters.posted_before))
+
+        if filters.exclude_job_ids:
+            mask &= ~self.job_mask(filters.exclude_job_ids)
+
+        return mask
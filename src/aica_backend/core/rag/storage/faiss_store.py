@@ -1,12 +1,16 @@
 import os
 import logging
-from typing import List, Dict, Optional
+import threading
+from typing import Iterable, List, Dict, Optional, Set, Tuple
 
+import faiss
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 
 from .base import BaseVectorStore
 from .metadata_manager import MetadataManager
+from .attribute_index import VectorAttributes, VectorSearchFilter
 from ..chunking import JobChunker
 from ..config import (
     DEFAULT_VECTOR_STORE_PATH,
@@ -14,6 +18,7 @@ from ..config import (
     DUMMY_DOC_CONTENT,
     DUMMY_DOC_METADATA,
     SEARCH_EXPANSION_FACTOR,
+    FILTER_ID_LIST_MAX,
     TOP_CHUNK_WEIGHT,
     SECOND_CHUNK_WEIGHT,
     REMAINING_CHUNKS_WEIGHT,
@@ -34,6 +39,9 @@ class FAISSStore(BaseVectorStore):
         self.metadata_manager = MetadataManager()
         self.chunker = JobChunker(embedder)
         self._job_metadata = self.metadata_manager._metadata
+        self.attributes = VectorAttributes()
+        # Active flags are updated from a worker thread (see JobMatchingService._sync_inactive_jobs)
+        self._attributes_lock = threading.RLock()
         self._load_or_create_store()
     
     def _load_or_create_store(self) -> None:
@@ -46,11 +54,32 @@ class FAISSStore(BaseVectorStore):
                     self.embedder.embeddings,
                     allow_dangerous_deserialization=True
                 )
+                self._rebuild_attributes()
             except Exception:
                 self._create_empty_store()
         else:
             self._create_empty_store()
     
+    def _metadata_for_ids(self, start: int, end: int) -> List[Dict]:
+        metadatas = []
+        for internal_id in range(start, end):
+            doc = self.vector_store.docstore.search(self.vector_store.index_to_docstore_id[internal_id])
+            metadatas.append(doc.metadata if isinstance(doc, Document) else {})
+        return metadatas
+    
+    def _rebuild_attributes(self) -> None:
+        self.attributes = VectorAttributes()
+        self._sync_attributes()
+    
+    def _sync_attributes(self) -> None:
+        """Add attribute rows for vectors added to the FAISS index since the last sync."""
+        if self.vector_store is None:
+            return
+        with self._attributes_lock:
+            total = self.vector_store.index.ntotal
+            if len(self.attributes) < total:
+                self.attributes.append(self._metadata_for_ids(len(self.attributes), total))
+    
     def _create_empty_store(self) -> None:
         dummy_doc = Document(
             page_content=DUMMY_DOC_CONTENT,
@@ -60,6 +89,7 @@ class FAISSStore(BaseVectorStore):
             [dummy_doc],
             self.embedder.embeddings
         )
+        self._rebuild_attributes()
     
     def add_documents(self, documents: List[dict], embeddings: List[List[float]] = None) -> None:
         if not documents:
@@ -83,6 +113,7 @@ class FAISSStore(BaseVectorStore):
         else:
             self.vector_store.add_documents(langchain_docs)
             logger.debug(f"Added {len(documents)} documents to vector store")
+        self._sync_attributes()
     
     def save(self) -> None:
         try:
@@ -148,6 +179,7 @@ class FAISSStore(BaseVectorStore):
                 logger.info(f"Created new vector store with job {job_id}")
             else:
                 self.vector_store.add_documents(documents)
+            self._sync_attributes()
             
             logger.debug(f"Added job {job_id} with {len(documents)} chunks to vector store")
             self.save()
@@ -197,12 +229,17 @@ class FAISSStore(BaseVectorStore):
         self,
         query_text: str,
         k: int = 10,
-        score_threshold: float = 0.3
+        score_threshold: float = 0.3,
+        filters: Optional[VectorSearchFilter] = None
     ) -> List[dict]:
         if self.vector_store is None:
             logger.warning("Vector store not initialized")
             return []
         
+        if filters is not None:
+            query_embedding = self.embedder.embed_single_text(query_text)
+            return self.search_similar_jobs_by_vector(query_embedding, k, score_threshold, filters)
+        
         try:
             # Search for similar job chunks with relevance scores
             results = self.vector_store.similarity_search_with_relevance_scores(
@@ -211,76 +248,187 @@ class FAISSStore(BaseVectorStore):
                 score_threshold=score_threshold
             )
             
-            # Deduplicate by job_id and aggregate scores
-            job_scores: Dict[str, Dict] = {}
+            return self._aggregate_job_matches(results, k, score_threshold)
             
-            for doc, relevance_score in results:
-                job_id = doc.metadata.get("job_id")
-                
-                # Skip dummy documents
-                if job_id == "dummy" or doc.metadata.get("is_dummy"):
-                    continue
-                
-                # Initialize job score tracking
-                if job_id not in job_scores:
-                    job_scores[job_id] = {
-                        "job_id": job_id,
-                        "metadata": doc.metadata,
-                        "scores": [],
-                        "chunks": [],
-                        "best_score": 0
-                    }
-                
-                job_scores[job_id]["scores"].append(relevance_score)
-                job_scores[job_id]["chunks"].append(doc.page_content)
-                
-                # Track best chunk score
-                if relevance_score > job_scores[job_id]["best_score"]:
-                    job_scores[job_id]["best_score"] = relevance_score
+        except Exception:
+            return []
+    
+    def search_similar_jobs_by_vector(
+        self,
+        query_embedding: List[float],
+        k: int = 10,
+        score_threshold: float = 0.3,
+        filters: Optional[VectorSearchFilter] = None
+    ) -> List[dict]:
+        """
+        search_similar_jobs for a precomputed query vector (e.g. a stored user profile vector).
+        
+        With filters, only vectors that satisfy them are searched, so every
+        returned chunk is a valid hit and no result is lost to post-filtering.
+        """
+        if self.vector_store is None:
+            logger.warning("Vector store not initialized")
+            return []
+        
+        try:
+            if filters is not None:
+                results = self._search_with_filters(
+                    query_embedding,
+                    k * SEARCH_EXPANSION_FACTOR,  # Chunks per job, for aggregation
+                    filters
+                )
+            else:
+                results = self.vector_store.similarity_search_with_score_by_vector(
+                    query_embedding,
+                    k=k * SEARCH_EXPANSION_FACTOR
+                )
+            # Same distance -> relevance conversion as similarity_search_with_relevance_scores
+            relevance_fn = self.vector_store._select_relevance_score_fn()
+            results = [(doc, relevance_fn(distance)) for doc, distance in results]
+            results = [(doc, score) for doc, score in results if score >= score_threshold]
             
-            # Calculate intelligent weighted scores
-            job_matches = []
-            for job_data in job_scores.values():
-                scores = job_data["scores"]
-                if not scores:
-                    continue
-                
-                # Sort scores in descending order
-                sorted_scores = sorted(scores, reverse=True)
-                
-                # Weighted scoring which ga emphasize top matches
-                if len(sorted_scores) >= 2:
-                    weighted_score = (
-                        sorted_scores[0] * TOP_CHUNK_WEIGHT +
-                        sorted_scores[1] * SECOND_CHUNK_WEIGHT +
-                        (sum(sorted_scores[2:]) / max(len(sorted_scores[2:]), 1) * REMAINING_CHUNKS_WEIGHT) +
-                        (min(len(scores) / COVERAGE_BONUS_DIVISOR, MAX_COVERAGE_BONUS) * COVERAGE_BONUS_WEIGHT)
-                    )
-                else:
-                    weighted_score = sorted_scores[0]
-                
-                job_matches.append({
-                    "job_id": job_data["job_id"],
-                    "similarity_score": weighted_score,
-                    "metadata": job_data["metadata"],
-                    "num_matches": len(scores),
-                    "best_chunk_score": job_data["best_score"],
-                    "coverage": len(scores)
-                })
+            return self._aggregate_job_matches(results, k, score_threshold)
             
-            # Sort by weighted similarity score (higher is better)
-            job_matches.sort(key=lambda x: x["similarity_score"], reverse=True)
+        except Exception as e:
+            logger.error(f"Vector search failed: {e}")
+            return []
+    
+    def _search_with_filters(self, query_embedding: List[float], k: int, filters: VectorSearchFilter) -> List[Tuple[Document, float]]:
+        """Exact top-k (chunk, distance) among the vectors that satisfy filters."""
+        # Sync first so the mask covers vectors added since the attributes were built
+        self._sync_attributes()
+        mask = self.attributes.mask(filters)
+        selected = int(mask.sum())
+        if selected == 0:
+            return []
+        
+        if selected <= FILTER_ID_LIST_MAX:
+            ids = np.flatnonzero(mask).astype("int64")
+            selector = faiss.IDSelectorBatch(len(ids), faiss.swig_ptr(ids))
+        else:
+            # One bit per vector; the usual case for exclusion sets, which keep most of the index.
+            # IDSelectorBitmap takes the bitmap's length in bytes.
+            bitmap = np.packbits(mask, bitorder="little")
+            selector = faiss.IDSelectorBitmap(len(bitmap), faiss.swig_ptr(bitmap))
+        
+        query = np.asarray([query_embedding], dtype="float32")
+        if self.vector_store._normalize_L2:
+            faiss.normalize_L2(query)
+        distances, ids = self.vector_store.index.search(
+            query, min(k, selected), params=faiss.SearchParameters(sel=selector)
+        )
+        
+        results = []
+        for distance, internal_id in zip(distances[0], ids[0]):
+            if internal_id < 0:
+                continue
+            doc = self.vector_store.docstore.search(self.vector_store.index_to_docstore_id[int(internal_id)])
+            if isinstance(doc, Document):
+                results.append((doc, float(distance)))
+        return results
+    
+    def set_job_active(self, job_id: str, active: bool) -> bool:
+        """Mark a job's vectors active or inactive for filtered searches."""
+        return self.set_jobs_active([job_id], active) > 0
+    
+    def set_jobs_active(self, job_ids: Iterable[str], active: bool) -> int:
+        """Mark the vectors of several jobs active or inactive with one pass over the attributes. Returns vectors changed."""
+        job_ids = list(job_ids)
+        if not job_ids or self.vector_store is None:
+            return 0
+        
+        for job_id in job_ids:
+            metadata = self.metadata_manager.get_job_metadata(job_id)
+            if metadata is not None:
+                metadata["is_active"] = active
+        
+        with self._attributes_lock:
+            self._sync_attributes()
+            rows = self.attributes.set_jobs_active(job_ids, active)
+        
+        # Keep the persisted chunk metadata in step so the flag survives a reload
+        for internal_id in np.flatnonzero(rows):
+            doc = self.vector_store.docstore.search(self.vector_store.index_to_docstore_id[int(internal_id)])
+            if isinstance(doc, Document):
+                doc.metadata["is_active"] = active
+        
+        return int(rows.sum())
+    
+    def get_filtered_job_ids(self, filters: Optional[VectorSearchFilter] = None) -> Set[str]:
+        """Jobs a semantic search with these filters can return."""
+        with self._attributes_lock:
+            self._sync_attributes()
+            return self.attributes.matching_job_ids(filters)
+    
+    def _aggregate_job_matches(self, results: List[tuple], k: int, score_threshold: float) -> List[dict]:
+        """Deduplicate (chunk, relevance) results by job and compute weighted job scores."""
+        # Deduplicate by job_id and aggregate scores
+        job_scores: Dict[str, Dict] = {}
+        
+        for doc, relevance_score in results:
+            job_id = doc.metadata.get("job_id")
             
-            # Filter by threshold and return top k
-            filtered_matches = [
-                m for m in job_matches
-                if m["similarity_score"] >= score_threshold
-            ]
+            # Skip dummy documents
+            if job_id == "dummy" or doc.metadata.get("is_dummy"):
+                continue
             
-            return filtered_matches[:k]
+            # Initialize job score tracking
+            if job_id not in job_scores:
+                job_scores[job_id] = {
+                    "job_id": job_id,
+                    "metadata": doc.metadata,
+                    "scores": [],
+                    "chunks": [],
+                    "best_score": 0
+                }
             
-        except Exception:
-            return []
+            job_scores[job_id]["scores"].append(relevance_score)
+            job_scores[job_id]["chunks"].append(doc.page_content)
+            
+            # Track best chunk score
+            if relevance_score > job_scores[job_id]["best_score"]:
+                job_scores[job_id]["best_score"] = relevance_score
+        
+        # Calculate intelligent weighted scores
+        job_matches = []
+        for job_data in job_scores.values():
+            scores = job_data["scores"]
+            if not scores:
+                continue
+            
+            # Sort scores in descending order
+            sorted_scores = sorted(scores, reverse=True)
+            
+            # Weighted scoring which ga emphasize top matches
+            if len(sorted_scores) >= 2:
+                weighted_score = (
+                    sorted_scores[0] * TOP_CHUNK_WEIGHT +
+                    sorted_scores[1] * SECOND_CHUNK_WEIGHT +
+                    (sum(sorted_scores[2:]) / max(len(sorted_scores[2:]), 1) * REMAINING_CHUNKS_WEIGHT) +
+                    (min(len(scores) / COVERAGE_BONUS_DIVISOR, MAX_COVERAGE_BONUS) * COVERAGE_BONUS_WEIGHT)
+                )
+            else:
+                weighted_score = sorted_scores[0]
+            
+            job_matches.append({
+                "job_id": job_data["job_id"],
+                "similarity_score": weighted_score,
+                "metadata": job_data["metadata"],
+                "num_matches": len(scores),
+                "best_chunk_score": job_data["best_score"],
+                "coverage": len(scores)
+            })
+        
+        # Sort by weighted similarity score (higher is better)
+        job_matches.sort(key=lambda x: x["similarity_score"], reverse=True)
+        
+        # Filter by threshold and return top k
+        filtered_matches = [
+            m for m in job_matches
+            if m["similarity_score"] >= score_threshold
+        ]
+        
+        return filtered_matches[:k]
     
     def get_job_count(self) -> int:
         return self.metadata_manager.get_job_count()
@@ -0,0 +1,301 @@
+import os
+import re
+import math
+import heapq
+import pickle
+import logging
+import threading
+from array import array
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..config import (
+    DEFAULT_VECTOR_STORE_PATH,
+    KEYWORD_INDEX_EXTENSION,
+    BM25_K1,
+    BM25_B,
+    KEYWORD_FIELD_WEIGHTS,
+    KEYWORD_COMPACT_RATIO
+)
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+
+# Keeps tokens like "c++", "c#", "node.js" and "asp.net" whole
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def skill_terms(skill: str) -> List[str]:
+    """Terms of one skill: its tokens, plus the whole phrase for multi-word skills."""
+    tokens = tokenize(skill)
+    if len(tokens) > 1:
+        tokens.append(" ".join(tokens))
+    return tokens
+
+
+class KeywordIndex:
+    """
+    In-process BM25 inverted index over job titles, skills and requirements.
+
+    Jobs get sequential document numbers as they are added, so every posting
+    list only ever grows at its end. Each list is a pair of arrays: document
+    numbers stored as deltas from the previous entry ('I') and the
+    field-weighted term frequencies ('H'). Removed jobs are tombstoned and
+    dropped from the postings when the index is compacted on save.
+
+    The index is persisted next to the FAISS index and lets exact-skill
+    queries ("Kubernetes") hit precisely without embedding anything.
+    """
+
+    def __init__(self, persist_path: str = DEFAULT_VECTOR_STORE_PATH, k1: float = BM25_K1, b: float = BM25_B):
+        self.persist_path = persist_path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._reset()
+        self._loaded_mtime: Optional[float] = None
+        self._load()
+
+    @property
+    def _index_path(self) -> str:
+        return f"{self.persist_path}{KEYWORD_INDEX_EXTENSION}"
+
+    def _reset(self) -> None:
+        self._job_ids: List[Optional[str]] = []  # document number -> job id (None once removed)
+        self._titles: List[str] = []
+        self._docs: Dict[str, int] = {}
+        self._doc_lengths = array("I")
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._last_doc: Dict[str, int] = {}
+        self._removed = 0
+        self._total_length = 0
+
+    def _load(self) -> None:
+        if not os.path.exists(self._index_path):
+            return
+
+        try:
+            with open(self._index_path, "rb") as f:
+                data = pickle.load(f)
+            if data.get("version") != INDEX_FORMAT_VERSION:
+                logger.warning(f"Ignoring keyword index with unknown format {data.get('version')}")
+                return
+
+            self._reset()
+            self._job_ids = data["job_ids"]
+            self._titles = data["titles"]
+            self._doc_lengths = data["doc_lengths"]
+            self._postings = data["postings"]
+            self._last_doc = data["last_doc"]
+            self._docs = {job_id: doc for doc, job_id in enumerate(self._job_ids) if job_id is not None}
+            self._removed = len(self._job_ids) - len(self._docs)
+            self._total_length = sum(self._doc_lengths[doc] for doc in self._docs.values())
+            self._loaded_mtime = os.path.getmtime(self._index_path)
+            logger.info(f"Loaded keyword index with {len(self._docs)} jobs and {len(self._postings)} terms")
+        except Exception as e:
+            logger.error(f"Error loading keyword index, starting empty: {e}")
+            self._reset()
+
+    def _job_terms(self, title: str, skills: Iterable[str], requirements: Iterable[str]) -> Dict[str, int]:
+        frequencies: Dict[str, int] = {}
+        fields = (
+            ("title", tokenize(title)),
+            ("skills", [term for skill in skills or [] for term in skill_terms(skill)]),
+            ("requirements", [term for requirement in requirements or [] for term in tokenize(requirement)]),
+        )
+        for field, terms in fields:
+            weight = KEYWORD_FIELD_WEIGHTS[field]
+            for term in terms:
+                frequencies[term] = frequencies.get(term, 0) + weight
+        return frequencies
+
+    def add_job(
+        self,
+        job_id: str,
+        title: str = "",
+        skills: Optional[Iterable[str]] = None,
+        requirements: Optional[Iterable[str]] = None
+    ) -> bool:
+        """Index a job, replacing any earlier version of it. Returns False if it has no terms."""
+        frequencies = self._job_terms(title, skills, requirements)
+        if not job_id or not frequencies:
+            return False
+
+        with self._lock:
+            self.remove_job(job_id)
+
+            doc = len(self._job_ids)
+            self._job_ids.append(job_id)
+            self._titles.append(title or "")
+            self._docs[job_id] = doc
+
+            length = min(sum(frequencies.values()), 0xFFFFFFFF)
+            self._doc_lengths.append(length)
+            self._total_length += length
+
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("H"))
+                postings[0].append(doc - self._last_doc.get(term, 0))
+                postings[1].append(min(frequency, 0xFFFF))
+                self._last_doc[term] = doc
+        return True
+
+    def remove_job(self, job_id: str) -> bool:
+        with self._lock:
+            doc = self._docs.pop(job_id, None)
+            if doc is None:
+                return False
+            self._job_ids[doc] = None
+            self._total_length -= self._doc_lengths[doc]
+            self._removed += 1
+            return True
+
+    def has_job(self, job_id: str) -> bool:
+        return job_id in self._docs
+
+    def get_job_count(self) -> int:
+        return len(self._docs)
+
+    def get_title(self, job_id: str) -> Optional[str]:
+        doc = self._docs.get(job_id)
+        return self._titles[doc] if doc is not None else None
+
+    def search(
+        self,
+        terms: Iterable[str],
+        k: int = 10,
+        exclude_job_ids: Optional[Set[str]] = None,
+        include_job_ids: Optional[Set[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """Top-k (job_id, BM25 score) for the given query terms, limited to include_job_ids when given."""
+        with self._lock:
+            total_docs = len(self._docs)
+            if total_docs == 0:
+                return []
+            avg_length = self._total_length / total_docs
+
+            scores: Dict[int, float] = {}
+            for term in set(terms):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+
+                deltas, frequencies = postings
+                # Tombstoned postings are skipped here and in the document frequency, like in total_docs,
+                # so scores do not shift when jobs are removed, re-added or compacted away
+                live = [(doc, frequency) for doc, frequency in zip(accumulate(deltas), frequencies)
+                        if self._job_ids[doc] is not None]
+                document_frequency = len(live)
+                idf = math.log(1 + (total_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+
+                for doc, frequency in live:
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc] / avg_length)
+                    scores[doc] = scores.get(doc, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            if exclude_job_ids:
+                scores = {doc: score for doc, score in scores.items() if self._job_ids[doc] not in exclude_job_ids}
+            if include_job_ids is not None:
+                scores = {doc: score for doc, score in scores.items() if self._job_ids[doc] in include_job_ids}
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(self._job_ids[doc], score) for doc, score in top]
+
+    def search_text(self, query: str, k: int = 10, exclude_job_ids: Optional[Set[str]] = None,
+                    include_job_ids: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        return self.search(tokenize(query), k, exclude_job_ids, include_job_ids)
+
+    def search_skills(self, skills: List[str], k: int = 10, exclude_job_ids: Optional[Set[str]] = None,
+                      include_job_ids: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        return self.search([term for skill in skills for term in skill_terms(skill)], k, exclude_job_ids, include_job_ids)
+
+    def compact(self) -> None:
+        """Drop removed jobs from the postings and renumber the remaining documents."""
+        with self._lock:
+            if not self._removed:
+                return
+
+            remap = {}
+            job_ids, titles, doc_lengths = [], [], array("I")
+            for doc, job_id in enumerate(self._job_ids):
+                if job_id is not None:
+                    remap[doc] = len(job_ids)
+                    job_ids.append(job_id)
+                    titles.append(self._titles[doc])
+                    doc_lengths.append(self._doc_lengths[doc])
+
+            postings: Dict[str, Tuple[array, array]] = {}
+            last_doc: Dict[str, int] = {}
+            for term, (deltas, frequencies) in self._postings.items():
+                new_deltas, new_frequencies = array("I"), array("H")
+                previous = 0
+                for doc, frequency in zip(accumulate(deltas), frequencies):
+                    new_doc = remap.get(doc)
+                    if new_doc is None:
+                        continue
+                    new_deltas.append(new_doc - previous)
+                    new_frequencies.append(frequency)
+                    previous = new_doc
+                if new_deltas:
+                    postings[term] = (new_deltas, new_frequencies)
+                    last_doc[term] = previous
+
+            self._job_ids, self._titles, self._doc_lengths = job_ids, titles, doc_lengths
+            self._docs = {job_id: doc for doc, job_id in enumerate(job_ids)}
+            self._postings, self._last_doc = postings, last_doc
+            self._removed = 0
+
+    def save(self) -> None:
+        with self._lock:
+            if self._removed > KEYWORD_COMPACT_RATIO * max(len(self._job_ids), 1):
+                self.compact()
+            try:
+                data = {
+                    "version": INDEX_FORMAT_VERSION,
+                    "job_ids": self._job_ids,
+                    "titles": self._titles,
+                    "doc_lengths": self._doc_lengths,
+                    "postings": self._postings,
+                    "last_doc": self._last_doc
+                }
+                # Write-then-rename so readers in other processes never see a partial file
+                tmp_path = f"{self._index_path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._index_path)
+                self._loaded_mtime = os.path.getmtime(self._index_path)
+                logger.debug(f"Saved keyword index to {self._index_path}")
+            except Exception as e:
+                logger.error(f"Error saving keyword index: {e}")
+
+    def reload_if_changed(self) -> bool:
+        """Pick up a newer index saved by another process (e.g. the scraper)."""
+        try:
+            mtime = os.path.getmtime(self._index_path)
+        except OSError:
+            return False
+        if self._loaded_mtime is not None and mtime <= self._loaded_mtime:
+            return False
+        with self._lock:
+            self._load()
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+            self.save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "total_jobs": len(self._docs),
+            "removed_jobs": self._removed,
+            "terms": len(self._postings),
+            "postings": sum(len(deltas) for deltas, _ in self._postings.values()),
+            "persist_path": self._index_path
+        }
@@ -0,0 +1,267 @@
+import os
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes are only serialized within the process
+    fcntl = None
+
+import faiss
+import numpy as np
+
+from ..config import DEFAULT_USER_INDEX_PATH, FAISS_INDEX_EXTENSION
+
+logger = logging.getLogger(__name__)
+
+USERS_FILE_EXTENSION = ".users.json"
+LOCK_FILE_EXTENSION = ".lock"
+
+
+class UserProfileStore:
+    """
+    Vector index with one profile vector per user.
+
+    The job index answers "which jobs fit this user"; this one answers "which
+    users fit this job", so a newly scraped job is matched by one search
+    instead of a matching pass per user. Vectors are L2-normalized and kept in
+    an exact inner-product index, so scores are cosine similarities. Users are
+    replaced or removed in place (IndexIDMap2), and each entry keeps a small
+    metadata dict (e.g. the skills the vector was built from).
+
+    Several processes write the index (the task worker refreshes single users,
+    the scraper rebuilds it), so changes that are saved go through update(),
+    which reloads the latest saved index under a lock file first.
+    """
+
+    def __init__(self, persist_path: str = DEFAULT_USER_INDEX_PATH):
+        self.persist_path = persist_path
+        self._lock = threading.RLock()
+        self.index: Optional[faiss.Index] = None
+        self._ids: Dict[str, int] = {}
+        self._users: Dict[int, str] = {}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._next_id = 1
+        self._loaded_mtime: Optional[float] = None
+        self._load()
+
+    @property
+    def _index_path(self) -> str:
+        return f"{self.persist_path}{FAISS_INDEX_EXTENSION}"
+
+    @property
+    def _users_path(self) -> str:
+        return f"{self.persist_path}{USERS_FILE_EXTENSION}"
+
+    def _load(self) -> None:
+        if not (os.path.exists(self._index_path) and os.path.exists(self._users_path)):
+            return
+
+        try:
+            index = faiss.read_index(self._index_path)
+            with open(self._users_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            self.index = index
+            self._ids.clear()
+            self._users.clear()
+            self._metadata.clear()
+            self._next_id = data.get("next_id", 1)
+            self._loaded_mtime = os.path.getmtime(self._users_path)
+            for user_id, entry in data.get("users", {}).items():
+                self._ids[user_id] = entry["id"]
+                self._users[entry["id"]] = user_id
+                self._metadata[user_id] = entry.get("metadata", {})
+            logger.info(f"Loaded user profile index with {len(self._ids)} users")
+        except Exception as e:
+            logger.error(f"Error loading user profile index, starting empty: {e}")
+            self.index = None
+            self._ids.clear()
+            self._users.clear()
+            self._metadata.clear()
+            self._next_id = 1
+
+    @staticmethod
+    def _as_matrix(vectors: Iterable[List[float]]) -> np.ndarray:
+        matrix = np.ascontiguousarray(np.asarray(list(vectors), dtype="float32"))
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        faiss.normalize_L2(matrix)
+        return matrix
+
+    def _ensure_index(self, dimension: int) -> None:
+        if self.index is None:
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+        elif self.index.d != dimension:
+            raise ValueError(f"Vector dimension {dimension} does not match index dimension {self.index.d}")
+
+    def upsert_users(self, entries: List[Tuple[str, List[float], Optional[Dict[str, Any]]]]) -> int:
+        """Add or replace (user_id, vector, metadata) entries. Returns the number stored."""
+        entries = [(user_id, vector, metadata) for user_id, vector, metadata in entries if user_id and vector]
+        if not entries:
+            return 0
+
+        matrix = self._as_matrix(vector for _, vector, _ in entries)
+        with self._lock:
+            self._ensure_index(matrix.shape[1])
+
+            replaced = [self._ids[user_id] for user_id, _, _ in entries if user_id in self._ids]
+            if replaced:
+                self.index.remove_ids(np.asarray(replaced, dtype="int64"))
+
+            ids = []
+            for user_id, _, metadata in entries:
+                internal_id = self._ids.get(user_id)
+                if internal_id is None:
+                    internal_id = self._next_id
+                    self._next_id += 1
+                    self._ids[user_id] = internal_id
+                    self._users[internal_id] = user_id
+                self._metadata[user_id] = dict(metadata or {})
+                ids.append(internal_id)
+
+            self.index.add_with_ids(matrix, np.asarray(ids, dtype="int64"))
+        return len(entries)
+
+    def upsert_user(self, user_id: str, vector: List[float], metadata: Optional[Dict[str, Any]] = None) -> bool:
+        return self.upsert_users([(user_id, vector, metadata)]) == 1
+
+    def remove_user(self, user_id: str) -> bool:
+        with self._lock:
+            internal_id = self._ids.pop(user_id, None)
+            if internal_id is None:
+                return False
+            self._users.pop(internal_id, None)
+            self._metadata.pop(user_id, None)
+            self.index.remove_ids(np.asarray([internal_id], dtype="int64"))
+            return True
+
+    def search_users_batch(
+        self,
+        query_vectors: List[List[float]],
+        k: int = 50,
+        score_threshold: float = 0.0
+    ) -> List[List[Dict[str, Any]]]:
+        """Top-k users for each query vector, in one index search."""
+        if not query_vectors:
+            return []
+
+        with self._lock:
+            if self.index is None or self.index.ntotal == 0:
+                return [[] for _ in query_vectors]
+
+            matrix = self._as_matrix(query_vectors)
+            scores, ids = self.index.search(matrix, min(k, self.index.ntotal))
+
+            results = []
+            for row_scores, row_ids in zip(scores, ids):
+                matches = []
+                for score, internal_id in zip(row_scores, row_ids):
+                    user_id = self._users.get(int(internal_id))
+                    if internal_id < 0 or user_id is None or score < score_threshold:
+                        continue
+                    matches.append({
+                        "user_id": user_id,
+                        "similarity_score": float(score),
+                        "metadata": self._metadata.get(user_id, {})
+                    })
+                results.append(matches)
+            return results
+
+    def search_users(self, query_vector: List[float], k: int = 50, score_threshold: float = 0.0) -> List[Dict[str, Any]]:
+        return self.search_users_batch([query_vector], k, score_threshold)[0]
+
+    @contextmanager
+    def update(self):
+        """
+        Read-modify-write the persisted index.
+
+        Holds an exclusive lock file across processes, reloads the index if
+        another process saved a newer one, yields the store for changes and
+        saves it, so concurrent writers do not overwrite each other's users.
+        """
+        with self._lock, open(f"{self.persist_path}{LOCK_FILE_EXTENSION}", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self.reload_if_changed()
+                yield self
+                self.save()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def reload_if_changed(self) -> bool:
+        """Pick up a newer index saved by another process (e.g. the task worker)."""
+        try:
+            mtime = os.path.getmtime(self._users_path)
+        except OSError:
+            return False
+        if self._loaded_mtime is not None and mtime <= self._loaded_mtime:
+            return False
+        with self._lock:
+            self._load()
+        return True
+
+    def get_vector(self, user_id: str) -> Optional[List[float]]:
+        """The stored (normalized) profile vector of a user, or None."""
+        with self._lock:
+            internal_id = self._ids.get(user_id)
+            if internal_id is None or self.index is None:
+                return None
+            try:
+                return self.index.reconstruct(internal_id).tolist()
+            except Exception as e:
+                logger.warning(f"Could not read profile vector of user {user_id}: {e}")
+                return None
+
+    def has_user(self, user_id: str) -> bool:
+        return user_id in self._ids
+
+    def get_user_metadata(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return self._metadata.get(user_id)
+
+    def get_user_count(self) -> int:
+        return len(self._ids)
+
+    def save(self) -> None:
+        with self._lock:
+            if self.index is None:
+                return
+            try:
+                # Write-then-rename so readers in other processes never see a partial file
+                tmp_index_path = f"{self._index_path}.tmp"
+                faiss.write_index(self.index, tmp_index_path)
+                os.replace(tmp_index_path, self._index_path)
+                users = {
+                    user_id: {"id": internal_id, "metadata": self._metadata.get(user_id, {})}
+                    for user_id, internal_id in self._ids.items()
+                }
+                tmp_path = f"{self._users_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"next_id": self._next_id, "users": users}, f)
+                os.replace(tmp_path, self._users_path)
+                self._loaded_mtime = os.path.getmtime(self._users_path)
+                logger.debug(f"Saved user profile index to {self.persist_path}")
+            except Exception as e:
+                logger.error(f"Error saving user profile index: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            if self.index is not None:
+                self.index.reset()
+            self._ids.clear()
+            self._users.clear()
+            self._metadata.clear()
+            self._next_id = 1
+            self.save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "total_users": self.get_user_count(),
+            "dimension": self.index.d if self.index is not None else None,
+            "persist_path": self.persist_path
+        }
@@ -1,9 +1,13 @@
-from .models import ResumeSkills, PersonalInfo, ParsedResume
+from .models import ResumeSkills, PersonalInfo, ParsedResume, CombinedResumeExtraction
 from .parser import ResumeParser
+from .parse_cache import ResumeParseCache, get_resume_parse_cache
 
 __all__ = [
     "ResumeParser",
     "ResumeSkills",
     "PersonalInfo",
     "ParsedResume",
+    "CombinedResumeExtraction",
+    "ResumeParseCache",
+    "get_resume_parse_cache",
 ]
@@ -0,0 +1,81 @@
+import os
+from typing import Dict, List
+
+from .models import PersonalInfo, ResumeSkills
+from utils.config_loader import load_name_extraction_config
+from utils.validation_utils import is_likely_person_name, is_likely_reference_name
+
+# Fields below this confidence are sent to the LLM in tiered mode
+CONFIDENCE_THRESHOLD = float(os.getenv("RESUME_TIERED_CONFIDENCE_THRESHOLD", "0.6"))
+
+# Found-skill counts at which the local skill lists are trusted as complete
+TECHNICAL_SKILLS_TARGET = 5
+SOFT_SKILLS_TARGET = 2
+
+PERSONAL_INFO_FIELDS = ("full_name", "email", "phone", "location", "linkedin")
+SKILL_FIELDS = ("technical_skills", "soft_skills", "experience_years", "education_level", "industries")
+
+# Fields the local extractors find from the header only
+HEADER_FIELDS = ("full_name", "email", "phone", "location", "linkedin")
+
+# Not scored: often legitimately absent (or never found locally), so they are only
+# added to an LLM request that is being made anyway
+OPTIONAL_FIELDS = ("location", "linkedin", "industries")
+
+
+def _name_confidence(text: str, name: str, header_chars: int) -> float:
+    if not name:
+        return 0.0
+
+    header = text[:header_chars]
+    if name.lower() not in header.lower():
+        return 0.2
+
+    config = load_name_extraction_config()
+    if is_likely_reference_name(text, name, config.get('reference_indicators', [])):
+        return 0.2
+
+    confidence = 0.5
+    top_lines = [line for line in header.split('\n') if line.strip()][:3]
+    if any(name.lower() in line.lower() for line in top_lines):
+        confidence += 0.2
+    if is_likely_person_name(name):
+        confidence += 0.2
+    return confidence
+
+
+def score_local_extraction(
+    text: str,
+    personal_info: PersonalInfo,
+    skills: ResumeSkills,
+    header_chars: int = 1000
+) -> Dict[str, float]:
+    """
+    Confidence (0-1) of each field the local extractors produced.
+
+    Contact fields come from strict regexes, so a match is near-certain and a
+    miss may be an unusual format. A name is trusted most when it sits in the
+    first lines of the header and looks like a person's name. Skill lists are
+    scored by how many keywords were found; experience and education by
+    whether a pattern matched at all.
+    """
+    return {
+        "full_name": _name_confidence(text, personal_info.full_name, header_chars),
+        "email": 0.95 if personal_info.email else 0.4,
+        "phone": 0.9 if personal_info.phone else 0.4,
+        "technical_skills": min(1.0, len(skills.technical_skills) / TECHNICAL_SKILLS_TARGET),
+        "soft_skills": min(1.0, len(skills.soft_skills) / SOFT_SKILLS_TARGET),
+        "experience_years": 0.8 if skills.experience_years is not None else 0.3,
+        "education_level": 0.8 if skills.education_level else 0.3
+    }
+
+
+def low_confidence_fields(scores: Dict[str, float], threshold: float = CONFIDENCE_THRESHOLD) -> List[str]:
+    """Fields to ask the LLM for: those below threshold, plus the optional fields if any are."""
+    fields = [field for field, score in scores.items() if score < threshold]
+    if not fields:
+        return []
+
+    only_header = all(field in HEADER_FIELDS for field in fields)
+    fields += [field for field in OPTIONAL_FIELDS if field not in fields and (field in HEADER_FIELDS or not only_header)]
+    return fields
@@ -1,7 +1,10 @@
+from typing import AsyncIterator
+
 from utils.file_utils import (
     SUPPORTED_FILE_TYPES,
     extract_text_from_file
 )
+from utils.extraction_pool import PDF_FILE_TYPE, get_extraction_pool
 
 
 class FileExtractor:
@@ -10,3 +13,17 @@ class FileExtractor:
     @classmethod
     def extract_text_from_file(cls, file_content: bytes, file_type: str) -> str:
         return extract_text_from_file(file_content, file_type)
+    
+    @classmethod
+    async def extract_text_async(cls, file_content: bytes, file_type: str) -> str:
+        """Extract in the bounded worker pool, with the pool's per-file timeout."""
+        return await get_extraction_pool().extract_text(file_content, file_type)
+    
+    @classmethod
+    def supports_page_streaming(cls, file_type: str) -> bool:
+        return file_type == PDF_FILE_TYPE
+    
+    @classmethod
+    def stream_pages(cls, file_content: bytes) -> AsyncIterator[str]:
+        """PDF page texts in order, the first page as soon as it is extracted."""
+        return get_extraction_pool().stream_pdf_pages(file_content)
@@ -49,6 +49,17 @@ class PersonalInfo(BaseModel):
     )
 
 
+class CombinedResumeExtraction(BaseModel):
+    personal_info: PersonalInfo = Field(
+        description="Personal and contact information of the applicant",
+        default_factory=PersonalInfo
+    )
+    skills: ResumeSkills = Field(
+        description="Skills, experience, education and industries of the applicant",
+        default_factory=ResumeSkills
+    )
+
+
 @dataclass
 class ParsedResume:
     raw_text: str
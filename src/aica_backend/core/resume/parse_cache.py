@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Optional
+
+from .models import ParsedResume, PersonalInfo, ResumeSkills
+
+logger = logging.getLogger(__name__)
+
+# The app directory is read-only on App Engine; the temp dir is writable there and locally
+DEFAULT_CACHE_PATH = Path(tempfile.gettempdir()) / "aica_resume_parse_cache.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parse_cache (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_parse_cache_last_used ON parse_cache (last_used_at);
+CREATE INDEX IF NOT EXISTS idx_parse_cache_created ON parse_cache (created_at);
+"""
+
+
+def resume_cache_key(file_content: bytes, file_type: str, parser_version: str) -> str:
+    """SHA-256 of the raw file bytes, qualified by file type and parser/prompt version."""
+    digest = hashlib.sha256(file_content).hexdigest()
+    return f"{digest}:{file_type.lower()}:{parser_version}"
+
+
+def serialize_parsed_resume(parsed: ParsedResume) -> bytes:
+    payload = {
+        "raw_text": parsed.raw_text,
+        "cleaned_text": parsed.cleaned_text,
+        "personal_info": parsed.personal_info.model_dump(),
+        "skills": parsed.skills.model_dump()
+    }
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def deserialize_parsed_resume(data: bytes) -> ParsedResume:
+    payload = json.loads(zlib.decompress(data).decode("utf-8"))
+    return ParsedResume(
+        raw_text=payload["raw_text"],
+        skills=ResumeSkills(**payload["skills"]),
+        personal_info=PersonalInfo(**payload["personal_info"]),
+        cleaned_text=payload["cleaned_text"]
+    )
+
+
+class ResumeParseCache:
+    """
+    Parse results of resume files, stored in a local SQLite database.
+
+    Entries are keyed by resume_cache_key, so re-uploading the same file (or
+    replaying a merge) returns the stored ParsedResume without extracting text
+    or calling the LLM, while a new parser or prompt version never reads an
+    old entry. Values are zlib-compressed JSON. The least recently used
+    entries are dropped beyond max_entries. If the database cannot be opened
+    the cache is disabled and every lookup is a miss.
+
+    Entries hold resume text and personal details unencrypted, so they are
+    kept for at most ttl seconds after they were stored (RESUME_PARSE_CACHE_TTL,
+    7 days by default) however often they are read; expired entries are
+    misses and are deleted on the next write.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self.path = str(path or os.getenv("RESUME_PARSE_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.max_entries = max_entries or int(os.getenv("RESUME_PARSE_CACHE_MAX_ENTRIES", "2000"))
+        self.ttl = ttl or float(os.getenv("RESUME_PARSE_CACHE_TTL", str(7 * 24 * 3600)))
+        self._stats = {"hits": 0, "misses": 0, "stores": 0}
+        self._lock = threading.Lock()
+        self.enabled = True
+        try:
+            with self._connect() as conn:
+                conn.executescript(_SCHEMA)
+        except Exception as e:
+            logger.warning(f"Resume parse cache unavailable at {self.path}, parsing without a cache: {e}")
+            self.enabled = False
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[ParsedResume]:
+        if not self.enabled:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT data FROM parse_cache WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl)
+                ).fetchone()
+                if row is None:
+                    self._count("misses")
+                    return None
+                conn.execute("UPDATE parse_cache SET last_used_at = ? WHERE key = ?", (time.time(), key))
+            self._count("hits")
+            return deserialize_parsed_resume(row[0])
+        except Exception as e:
+            logger.warning(f"Resume parse cache read failed: {e}")
+            return None
+
+    def set(self, key: str, parsed: ParsedResume) -> None:
+        if not self.enabled:
+            return
+        try:
+            now = time.time()
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO parse_cache (key, data, created_at, last_used_at) VALUES (?, ?, ?, ?)",
+                    (key, serialize_parsed_resume(parsed), now, now)
+                )
+                conn.execute("DELETE FROM parse_cache WHERE created_at < ?", (now - self.ttl,))
+                conn.execute(
+                    "DELETE FROM parse_cache WHERE key IN ("
+                    "SELECT key FROM parse_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._count("stores")
+        except Exception as e:
+            logger.warning(f"Resume parse cache write failed: {e}")
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        with self._connect() as conn:
+            conn.execute("DELETE FROM parse_cache")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_stats(self) -> dict:
+        entries = 0
+        if self.enabled:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+        return {**self._stats, "entries": entries, "path": self.path, "enabled": self.enabled}
+
+
+_parse_cache: Optional[ResumeParseCache] = None
+
+
+def get_resume_parse_cache() -> ResumeParseCache:
+    """Return the process-wide resume parse cache (path from RESUME_PARSE_CACHE_PATH)."""
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ResumeParseCache()
+    return _parse_cache
@@ -2,33 +2,91 @@ import os
 import asyncio
 import logging
 import json
-from typing import Optional, Tuple, List, Dict
+import hashlib
+from typing import Awaitable, Optional, Tuple, List, Dict
 
 from langchain_anthropic import ChatAnthropic
 from langchain_core.output_parsers import PydanticOutputParser
 
-from .models import ResumeSkills, PersonalInfo, ParsedResume
+from .models import ResumeSkills, PersonalInfo, ParsedResume, CombinedResumeExtraction
 from .extractor import FileExtractor
 from .skill_extractor import SkillExtractor
 from .info_extractor import InfoExtractor
 from .normalizer import SkillNormalizer
-from prompts.resume_prompts import create_comprehensive_skills_prompt, create_personal_info_prompt
+from .parse_cache import ResumeParseCache, get_resume_parse_cache, resume_cache_key
+from .confidence import (
+    CONFIDENCE_THRESHOLD,
+    PERSONAL_INFO_FIELDS,
+    SKILL_FIELDS,
+    HEADER_FIELDS,
+    score_local_extraction,
+    low_confidence_fields
+)
+from prompts.resume_prompts import (
+    create_comprehensive_skills_prompt,
+    create_personal_info_prompt,
+    create_combined_resume_prompt,
+    create_field_extraction_prompt
+)
 from utils.text_utils import extract_json_from_text, clean_extracted_name
 from utils.text_cleaner import TextCleaner
 from utils.validation_utils import is_likely_reference_name
 from utils.config_loader import load_name_extraction_config
+from utils.file_utils import pdf_backend_order
 
-from database.user_db import UserDatabase
+from database.async_user_db import AsyncUserDatabase
 from database.models.user_models import UserSkillCreate
 
 logger = logging.getLogger(__name__)
 
+# Bump when text extraction, cleaning, validation or normalization changes what a parse returns
+PARSER_VERSION = "2"
+
+# The LLM only sees the top of the resume for personal info, to avoid picking up reference names
+NAME_HEADER_CHARS = 1000
+
+# "dual": separate personal info (header only) and skills requests, run concurrently
+# "combined": one request returning both, so the resume is sent once
+# "tiered": local extractors first, then one small request for only the low-confidence fields
+LLM_MODES = ("dual", "combined", "tiered")
+DEFAULT_LLM_MODE = os.getenv("RESUME_LLM_MODE", "dual").lower()
+
 
 class ResumeParser:
-    def __init__(self):
+    def __init__(self, parse_cache: Optional[ResumeParseCache] = None, llm_mode: Optional[str] = None):
         self.llm = self._create_llm_client()
         self.skills_parser = PydanticOutputParser(pydantic_object=ResumeSkills)
         self.info_parser = PydanticOutputParser(pydantic_object=PersonalInfo)
+        self.combined_parser = PydanticOutputParser(pydantic_object=CombinedResumeExtraction)
+        self.parse_cache = parse_cache or get_resume_parse_cache()
+        self.llm_mode = (llm_mode or DEFAULT_LLM_MODE).lower()
+        if self.llm_mode not in LLM_MODES:
+            logger.warning(f"Unknown RESUME_LLM_MODE '{self.llm_mode}', using 'dual'")
+            self.llm_mode = "dual"
+        self.llm_usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+        self._llm_failures = 0
+        self._version: Optional[str] = None
+    
+    @property
+    def version(self) -> str:
+        """Parser version plus a hash of the PDF backends and everything the LLM sees, so changing either misses the cache."""
+        if self._version is None:
+            engine = os.getenv("ANTHROPIC_MODEL", "claude-3-haiku-20240307") if self.llm else "fallback"
+            if self.llm_mode == "combined":
+                prompts = [create_combined_resume_prompt().pretty_repr(), self.combined_parser.get_format_instructions()]
+            elif self.llm_mode == "tiered":
+                prompts = [create_field_extraction_prompt().pretty_repr(), str(CONFIDENCE_THRESHOLD)]
+            else:
+                prompts = [
+                    create_comprehensive_skills_prompt().pretty_repr(),
+                    create_personal_info_prompt().pretty_repr(),
+                    self.skills_parser.get_format_instructions(),
+                    self.info_parser.get_format_instructions()
+                ]
+            prompt_material = "\n".join([engine, ",".join(pdf_backend_order()), *prompts])
+            prompt_hash = hashlib.sha256(prompt_material.encode("utf-8")).hexdigest()[:16]
+            self._version = f"{PARSER_VERSION}-{prompt_hash}"
+        return self._version
     
     def _create_llm_client(self) -> Optional[ChatAnthropic]:
         try:
@@ -45,10 +103,37 @@ class ResumeParser:
         except Exception as e:
             return None
     
-    async def parse_resume_from_file(self, file_content: bytes, file_type: str) -> ParsedResume:
+    async def _invoke_llm(self, prompt):
+        response = await self.llm.ainvoke(prompt)
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.llm_usage["calls"] += 1
+        self.llm_usage["input_tokens"] += usage.get("input_tokens", 0)
+        self.llm_usage["output_tokens"] += usage.get("output_tokens", 0)
+        return response
+    
+    async def parse_resume_from_file(self, file_content: bytes, file_type: str, use_cache: bool = True) -> ParsedResume:
+        cache_key = resume_cache_key(file_content, file_type, self.version) if use_cache else None
+        if cache_key:
+            cached = await asyncio.to_thread(self.parse_cache.get, cache_key)
+            if cached is not None:
+                logger.info("Resume parse cache hit, skipping extraction and LLM calls")
+                return cached
+        
+        llm_failures_before = self._llm_failures
+        parsed = await self._parse_resume(file_content, file_type)
+        
+        # A parse that fell back after an LLM error is not cached, so the next upload retries the LLM
+        if cache_key and self._llm_failures == llm_failures_before:
+            await asyncio.to_thread(self.parse_cache.set, cache_key, parsed)
+        return parsed
+    
+    async def _parse_resume(self, file_content: bytes, file_type: str) -> ParsedResume:
+        if FileExtractor.supports_page_streaming(file_type):
+            return await self._parse_streamed_resume(file_content)
+        
         try:
-            # Extract and clean text
-            raw_text = FileExtractor.extract_text_from_file(file_content, file_type)
+            # Extract (in the worker pool) and clean text
+            raw_text = await FileExtractor.extract_text_async(file_content, file_type)
             if not raw_text:
                 raise ValueError("No text could be extracted from the file")
             
@@ -68,9 +153,51 @@ class ResumeParser:
         except Exception:
             raise
     
-    async def _extract_info_and_skills(self, text: str) -> Tuple[PersonalInfo, ResumeSkills]:
+    async def _parse_streamed_resume(self, file_content: bytes) -> ParsedResume:
+        # Personal info only needs the header, so its LLM call starts as soon as the
+        # first page with text is extracted, while the remaining pages are still parsed
+        pages: List[str] = []
+        info_request: Optional[asyncio.Task] = None
+        try:
+            async for page_text in FileExtractor.stream_pages(file_content):
+                pages.append(page_text)
+                if info_request is None and self.llm is not None and self.llm_mode == "dual":
+                    header = TextCleaner.clean_text(page_text)[:NAME_HEADER_CHARS]
+                    if header:
+                        info_request = asyncio.create_task(self._request_personal_info(header))
+            
+            raw_text = "\n".join(page for page in pages if page).strip()
+            if not raw_text:
+                raise ValueError("No text could be extracted from the file")
+            
+            cleaned_text = TextCleaner.clean_text(raw_text)
+            if not cleaned_text:
+                raise ValueError("File contains no readable text after cleaning")
+            
+            personal_info, skills = await self._extract_info_and_skills(cleaned_text, info_request)
+            
+            return ParsedResume(
+                raw_text=raw_text,
+                personal_info=personal_info,
+                skills=skills,
+                cleaned_text=cleaned_text
+            )
+        finally:
+            if info_request is not None and not info_request.done():
+                info_request.cancel()
+    
+    async def _extract_info_and_skills(
+        self,
+        text: str,
+        info_request: Optional[Awaitable[PersonalInfo]] = None
+    ) -> Tuple[PersonalInfo, ResumeSkills]:
+        if self.llm is not None and self.llm_mode == "combined":
+            return await self._extract_combined(text)
+        if self.llm is not None and self.llm_mode == "tiered":
+            return await self._extract_tiered(text)
+        
         try:
-            personal_info_task = self._extract_personal_info(text)
+            personal_info_task = self._extract_personal_info(text, info_request)
             skills_task = self._extract_skills(text)
             
             results = await asyncio.gather(
@@ -79,86 +206,219 @@ class ResumeParser:
                 return_exceptions=True
             )
             
+            if any(isinstance(result, Exception) for result in results):
+                self._llm_failures += 1
             personal_info = results[0] if not isinstance(results[0], Exception) else InfoExtractor.extract_with_fallback(text)
             skills = results[1] if not isinstance(results[1], Exception) else SkillExtractor.extract_with_fallback(text)
             
             return personal_info, skills
         except Exception:
+            self._llm_failures += 1
             personal_info = InfoExtractor.extract_with_fallback(text)
             skills = SkillExtractor.extract_with_fallback(text)
             return personal_info, skills
     
-    async def _extract_personal_info(self, text: str) -> PersonalInfo:
-        if self.llm is None:
-            logger.info("LLM not available, using fallback info extraction")
-            return InfoExtractor.extract_with_fallback(text)
-        
+    async def _extract_combined(self, text: str) -> Tuple[PersonalInfo, ResumeSkills]:
+        truncated_for_name = text[:NAME_HEADER_CHARS]
         try:
-            # For name extraction, use ONLY the top portion of the resume to avoid reference confusion
-            # Most resumes have the name in the first 300-1000 characters (first 3-10 lines)
-            max_chars_for_name = 1000  
-            truncated_for_name = text[:max_chars_for_name] if len(text) > max_chars_for_name else text
-            
-            max_chars = 3000
-            truncated_text = text[:max_chars] if len(text) > max_chars else text
-            
-            prompt = create_personal_info_prompt().format_prompt(
-                resume_text=truncated_for_name,  
-                format_instructions=self.info_parser.get_format_instructions()
+            prompt = create_combined_resume_prompt().format_prompt(
+                resume_text=text,
+                format_instructions=self.combined_parser.get_format_instructions()
             )
-            response = await self.llm.ainvoke(prompt)
+            response = await self._invoke_llm(prompt)
             
             clean_json = extract_json_from_text(response.content)
-            
             try:
                 parsed_data = json.loads(clean_json)
-                
-                if isinstance(parsed_data.get('email'), list):
-                    parsed_data['email'] = parsed_data['email'][0] if parsed_data['email'] else None
-                    logger.warning(f"Fixed email format: AI returned list, using first email: {parsed_data['email']}")
-                
+                if isinstance(parsed_data.get('personal_info'), dict):
+                    self._fix_email_format(parsed_data['personal_info'])
                 clean_json = json.dumps(parsed_data)
             except json.JSONDecodeError:
                 pass
             
-            llm_result = self.info_parser.parse(clean_json)
-            
-            if llm_result.full_name:
-                config = load_name_extraction_config()
-                llm_result.full_name = clean_extracted_name(
-                    llm_result.full_name,
-                    config.get('name_prefixes_to_remove', [])
-                )
-                
-                name_lower = llm_result.full_name.lower()
-                top_section = text[:1000].lower()  
-                
-                if name_lower not in top_section:
-                    logger.warning(f"Name '{llm_result.full_name}' not found in resume header, using fallback")
-                    fallback_result = InfoExtractor.extract_with_fallback(truncated_for_name)
-                    llm_result.full_name = fallback_result.full_name
-                elif is_likely_reference_name(
-                    text, 
-                    llm_result.full_name,
-                    config.get('reference_indicators', [])
-                ):
-                    logger.warning(f"Name '{llm_result.full_name}' appears to be a reference, using fallback")
-                    fallback_result = InfoExtractor.extract_with_fallback(truncated_for_name)
-                    llm_result.full_name = fallback_result.full_name
-            
-            if not llm_result.full_name or len(llm_result.full_name.strip()) < 2:
-                fallback_result = InfoExtractor.extract_with_fallback(truncated_for_name)
-                if fallback_result.full_name:
-                    llm_result.full_name = fallback_result.full_name
-            
-            return llm_result
+            result = self.combined_parser.parse(clean_json)
+        except Exception as e:
+            logger.error(f"Error in combined resume extraction: {e}")
+            self._llm_failures += 1
+            return InfoExtractor.extract_with_fallback(truncated_for_name), SkillExtractor.extract_with_fallback(text)
+        
+        try:
+            personal_info = self._validate_personal_info(result.personal_info, text)
+        except Exception as e:
+            logger.error(f"Error validating personal info: {e}")
+            personal_info = InfoExtractor.extract_with_fallback(truncated_for_name)
+        
+        try:
+            skills = SkillNormalizer.normalize_skills(SkillNormalizer.validate_skills(result.skills))
+        except Exception as e:
+            logger.error(f"Error normalizing skills: {e}")
+            skills = SkillExtractor.extract_with_fallback(text)
+        
+        return personal_info, skills
+    
+    async def _extract_tiered(self, text: str) -> Tuple[PersonalInfo, ResumeSkills]:
+        truncated_for_name = text[:NAME_HEADER_CHARS]
+        personal_info = InfoExtractor.extract_with_fallback(truncated_for_name)
+        skills = SkillExtractor.extract_with_fallback(text)
+        
+        scores = score_local_extraction(text, personal_info, skills, NAME_HEADER_CHARS)
+        fields = low_confidence_fields(scores)
+        if not fields:
+            logger.info("Tiered extraction: all fields confident locally, no LLM call")
+            return personal_info, skills
+        
+        logger.info(f"Tiered extraction: asking LLM for {fields} (scores {scores})")
+        # Contact fields only need the header; anything else needs the whole resume
+        request_text = truncated_for_name if all(field in HEADER_FIELDS for field in fields) else text
+        try:
+            prompt = create_field_extraction_prompt().format_prompt(
+                fields=self._describe_fields(fields),
+                resume_text=request_text
+            )
+            response = await self._invoke_llm(prompt)
+            llm_fields = json.loads(extract_json_from_text(response.content))
+            if not isinstance(llm_fields, dict):
+                raise ValueError("LLM did not return a JSON object")
+            llm_fields = {field: value for field, value in llm_fields.items() if field in fields and value}
+        except Exception as e:
+            logger.error(f"Error in tiered field extraction: {e}")
+            self._llm_failures += 1
+            return personal_info, skills
+        
+        try:
+            personal_info = self._merge_personal_info(personal_info, llm_fields, text)
+        except Exception as e:
+            logger.error(f"Error merging LLM personal info: {e}")
+        
+        try:
+            skills = self._merge_skills(skills, llm_fields)
+        except Exception as e:
+            logger.error(f"Error merging LLM skills: {e}")
+        
+        return personal_info, skills
+    
+    @staticmethod
+    def _describe_fields(fields: List[str]) -> str:
+        lines = []
+        for field in fields:
+            model = PersonalInfo if field in PERSONAL_INFO_FIELDS else ResumeSkills
+            kind = "list of strings" if field in ("technical_skills", "soft_skills", "industries") else (
+                "integer or null" if field == "experience_years" else "string or null")
+            lines.append(f"- {field}: {model.model_fields[field].description} ({kind})")
+        return "\n".join(lines)
+    
+    def _merge_personal_info(self, local: PersonalInfo, llm_fields: dict, text: str) -> PersonalInfo:
+        updates = {field: value for field, value in llm_fields.items() if field in PERSONAL_INFO_FIELDS}
+        if not updates:
+            return local
+        self._fix_email_format(updates)
+        merged = PersonalInfo(**{**local.model_dump(), **{k: v for k, v in updates.items() if v}})
+        # An LLM name gets the same header and reference checks as in the other modes
+        if "full_name" in updates:
+            merged = self._validate_personal_info(merged, text)
+        return merged
+    
+    @staticmethod
+    def _merge_skills(local: ResumeSkills, llm_fields: dict) -> ResumeSkills:
+        updates = {field: value for field, value in llm_fields.items() if field in SKILL_FIELDS}
+        if not updates:
+            return local
+        llm_skills = SkillNormalizer.normalize_skills(SkillNormalizer.validate_skills(ResumeSkills(**updates)))
+        
+        merged = local.model_copy()
+        for field in ("technical_skills", "soft_skills", "industries"):
+            if field in updates:
+                seen = {skill.lower() for skill in getattr(local, field)}
+                extra = [skill for skill in getattr(llm_skills, field) if skill.lower() not in seen]
+                setattr(merged, field, getattr(local, field) + extra)
+        if merged.experience_years is None and llm_skills.experience_years is not None:
+            merged.experience_years = llm_skills.experience_years
+        if not merged.education_level and llm_skills.education_level:
+            merged.education_level = llm_skills.education_level
+        return merged
+    
+    @staticmethod
+    def _fix_email_format(parsed_data: dict) -> None:
+        if isinstance(parsed_data.get('email'), list):
+            parsed_data['email'] = parsed_data['email'][0] if parsed_data['email'] else None
+            logger.warning(f"Fixed email format: AI returned list, using first email: {parsed_data['email']}")
+    
+    async def _request_personal_info(self, header_text: str) -> PersonalInfo:
+        prompt = create_personal_info_prompt().format_prompt(
+            resume_text=header_text,
+            format_instructions=self.info_parser.get_format_instructions()
+        )
+        response = await self._invoke_llm(prompt)
+        
+        clean_json = extract_json_from_text(response.content)
+        
+        try:
+            parsed_data = json.loads(clean_json)
+            self._fix_email_format(parsed_data)
+            clean_json = json.dumps(parsed_data)
+        except json.JSONDecodeError:
+            pass
+        
+        return self.info_parser.parse(clean_json)
+    
+    async def _extract_personal_info(
+        self,
+        text: str,
+        info_request: Optional[Awaitable[PersonalInfo]] = None
+    ) -> PersonalInfo:
+        if self.llm is None:
+            logger.info("LLM not available, using fallback info extraction")
+            return InfoExtractor.extract_with_fallback(text)
+        
+        # For name extraction, use ONLY the top portion of the resume to avoid reference confusion
+        # Most resumes have the name in the first 300-1000 characters (first 3-10 lines)
+        truncated_for_name = text[:NAME_HEADER_CHARS]
+        
+        try:
+            # A streamed parse has already sent the header; the result is validated against the full text
+            if info_request is None:
+                info_request = self._request_personal_info(truncated_for_name)
+            return self._validate_personal_info(await info_request, text)
         
         except Exception as e:
             logger.error(f"Error extracting personal info: {e}")
-            max_chars_for_name = 1000  
-            truncated_for_name = text[:max_chars_for_name] if len(text) > max_chars_for_name else text
+            self._llm_failures += 1
             return InfoExtractor.extract_with_fallback(truncated_for_name)
     
+    def _validate_personal_info(self, llm_result: PersonalInfo, text: str) -> PersonalInfo:
+        """Keep the LLM's name only if it is in the resume header and is not a reference."""
+        truncated_for_name = text[:NAME_HEADER_CHARS]
+        
+        if llm_result.full_name:
+            config = load_name_extraction_config()
+            llm_result.full_name = clean_extracted_name(
+                llm_result.full_name,
+                config.get('name_prefixes_to_remove', [])
+            )
+            
+            name_lower = llm_result.full_name.lower()
+            top_section = truncated_for_name.lower()
+            
+            if name_lower not in top_section:
+                logger.warning(f"Name '{llm_result.full_name}' not found in resume header, using fallback")
+                fallback_result = InfoExtractor.extract_with_fallback(truncated_for_name)
+                llm_result.full_name = fallback_result.full_name
+            elif is_likely_reference_name(
+                text, 
+                llm_result.full_name,
+                config.get('reference_indicators', [])
+            ):
+                logger.warning(f"Name '{llm_result.full_name}' appears to be a reference, using fallback")
+                fallback_result = InfoExtractor.extract_with_fallback(truncated_for_name)
+                llm_result.full_name = fallback_result.full_name
+        
+        if not llm_result.full_name or len(llm_result.full_name.strip()) < 2:
+            fallback_result = InfoExtractor.extract_with_fallback(truncated_for_name)
+            if fallback_result.full_name:
+                llm_result.full_name = fallback_result.full_name
+        
+        return llm_result
+    
     async def _extract_skills(self, text: str) -> ResumeSkills:
         if self.llm is None:
             logger.info("LLM not available, using fallback skills extraction")
@@ -169,7 +429,7 @@ class ResumeParser:
                 resume_text=text,
                 format_instructions=self.skills_parser.get_format_instructions()
             )
-            response = await self.llm.ainvoke(prompt)
+            response = await self._invoke_llm(prompt)
             
             clean_json = extract_json_from_text(response.content)
             parsed_skills = self.skills_parser.parse(clean_json)
@@ -181,45 +441,47 @@ class ResumeParser:
             return normalized_skills
         
         except Exception as e:
+            self._llm_failures += 1
             return SkillExtractor.extract_with_fallback(text)
     
     async def process_and_store_resume(
         self,
         user_id: str,
         file_content: bytes,
-        file_type: str
+        file_type: str,
+        clear_existing: bool = False,
+        profile_updates: Optional[Dict[str, any]] = None
     ) -> ParsedResume:
         try:
             # Parse resume
             parsed_resume = await self.parse_resume_from_file(file_content, file_type)
             
             # Store in database
-            await self._store_parsed_resume(user_id, parsed_resume)
+            await self._store_parsed_resume(user_id, parsed_resume, clear_existing, profile_updates)
             
             return parsed_resume
         
         except Exception as e:
             raise Exception(f"Failed to process resume: {str(e)}")
     
-    async def _store_parsed_resume(self, user_id: str, parsed_resume: ParsedResume) -> None:
+    async def _store_parsed_resume(
+        self,
+        user_id: str,
+        parsed_resume: ParsedResume,
+        clear_existing: bool = False,
+        profile_updates: Optional[Dict[str, any]] = None
+    ) -> None:
         try:
-            db = UserDatabase()
+            db = AsyncUserDatabase()
             
-            # Clear existing skills
-            db.clear_user_skills(user_id)
-            
-            # Prepare skills for storage
             skills_to_store = self._prepare_skills_for_storage(parsed_resume.skills)
+            profile_data = {**self._prepare_profile_updates(parsed_resume), **(profile_updates or {})}
             
-            # Store skills in batch
-            if skills_to_store:
-                db.add_user_skills_batch(user_id, skills_to_store)
-            
-            # Update profile
-            profile_updates = self._prepare_profile_updates(parsed_resume)
-            db.update_user_profile(user_id, profile_updates)
+            # Old skills (and, with clear_existing, education, experience and matches) are
+            # replaced together with the profile update in a single transaction
+            skills_saved = await db.replace_user_resume_data(user_id, skills_to_store, profile_data, clear_existing)
             
-            logger.info(f"Successfully stored resume data for user {user_id}")
+            logger.info(f"Successfully stored resume data for user {user_id} ({skills_saved} skills)")
         
         except Exception as e:
             raise Exception(f"Failed to store resume data: {str(e)}")
@@ -12,8 +12,8 @@ from database.models.user_models import (
 logger = logging.getLogger(__name__)
 
 class ResumeBuilder:
-    def __init__(self):
-        self.user_db = UserDatabase()
+    def __init__(self, user_db: Optional[UserDatabase] = None):
+        self.user_db = user_db or UserDatabase()
 
     def add_education(self, user_id: str, education_data: UserEducationCreate) -> UserEducation:
         try:
@@ -231,6 +231,10 @@ class ResumeBuilder:
             return None
 
     def delete_skill(self, skill_id: str, user_id: str) -> bool:
+        return self.remove_skill(skill_id, user_id) is not None
+
+    def remove_skill(self, skill_id: str, user_id: str) -> Optional[UserSkill]:
+        """Delete a skill and return the deleted entry, or None if nothing was deleted."""
         try:
             logger.info(f"Attempting to delete skill {skill_id} for user {user_id}")
             response = (self.user_db.client.table("user_skills")
@@ -239,16 +243,16 @@ class ResumeBuilder:
                        .eq("user_id", user_id)
                        .execute())
 
-            success = len(response.data) > 0
-            if success:
-                logger.info(f"Successfully deleted skill {skill_id}")
-            else:
+            if not response.data:
                 logger.warning(f"No skill found with id {skill_id} for user {user_id}")
-            return success
+                return None
+
+            logger.info(f"Successfully deleted skill {skill_id}")
+            return UserSkill(**response.data[0])
 
         except Exception as e:
             logger.error(f"Error deleting skill {skill_id} for user {user_id}: {str(e)}", exc_info=True)
-            return False
+            return None
     
     def add_skills_batch(self, user_id: str, skills: List[UserSkillCreate]) -> List[UserSkill]:
         try:
@@ -1,4 +1,14 @@
 from .user_db import UserDatabase
 from .job_db import JobDatabase
+from .async_user_db import AsyncUserDatabase
+from .async_job_db import AsyncJobDatabase
+from .client_registry import (
+    get_shared_client, get_async_shared_client,
+    close_shared_clients, aclose_shared_clients
+)
 
-__all__ = ['UserDatabase', 'JobDatabase']
\ No newline at end of file
+__all__ = [
+    'UserDatabase', 'JobDatabase', 'AsyncUserDatabase', 'AsyncJobDatabase',
+    'get_shared_client', 'get_async_shared_client',
+    'close_shared_clients', 'aclose_shared_clients'
+]
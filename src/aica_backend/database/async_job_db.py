@@ -0,0 +1,235 @@
+import logging
+from typing import List, Dict, Any, Optional, Set
+from supabase import AsyncClient
+
+from .client_registry import get_async_shared_client
+from .job_db import JobDatabase, JOB_COLUMNS, JOB_FETCH_CHUNK_SIZE
+from .models.job_models import JobSource, Job, JobListings, JobSearchFilters
+from .job_cache import JobCache, get_job_cache
+from utils import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Statistics are shared by every AsyncJobDatabase instance (routes create one per request)
+_statistics_cache = LRUCache(max_size=50, ttl=300)
+
+
+class AsyncJobDatabase:
+    """
+    Async counterpart of JobDatabase's read path for use from coroutines.
+
+    Method names and return values match JobDatabase. Queries are awaited on the
+    pooled async Supabase client and share the process-wide job cache. Write-side
+    methods used by the scraper and indexer scripts (save_job, mark_job_as_indexed,
+    job source bookkeeping) stay on the sync JobDatabase.
+    """
+
+    def __init__(self, client: AsyncClient = None, job_cache: JobCache = None):
+        # Resolved lazily: the shared async client can only be created inside a running loop
+        self._client = client
+        self.cache = _statistics_cache
+        self.job_cache = job_cache or get_job_cache()
+
+    async def _get_client(self) -> AsyncClient:
+        if self._client is not None:
+            return self._client
+        return await get_async_shared_client("anon")
+
+    # Row decoding is identical to the sync implementation
+    _deserialize_job = JobDatabase._deserialize_job
+
+    async def get_job_sources(self) -> List[JobSource]:
+        try:
+            client = await self._get_client()
+            response = await client.table("job_sources").select("*").execute()
+            return [JobSource(**source) for source in response.data]
+        except Exception as e:
+            return []
+
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        try:
+            client = await self._get_client()
+            response = await client.table("jobs").select("*").eq("id", job_id).execute()
+
+            if not response.data:
+                return None
+
+            return self._deserialize_job(response.data[0])
+        except Exception as e:
+            return None
+
+    async def get_jobs_for_indexing(self, limit: int = 100) -> List[Job]:
+        try:
+            client = await self._get_client()
+            response = await client.table("jobs").select("*").eq("is_indexed", False).limit(limit).execute()
+            return [self._deserialize_job(job_data) for job_data in response.data]
+        except Exception as e:
+            return []
+
+    async def search_jobs(self, filters: JobSearchFilters, page: int = 1, page_size: int = 20) -> JobListings:
+        try:
+            client = await self._get_client()
+            query = client.table("jobs").select("*", count="exact")
+
+            if filters.keywords:
+                for keyword in filters.keywords:
+                    query = query.ilike("title", f"%{keyword}%")
+
+            if filters.location:
+                query = query.ilike("location", f"%{filters.location}%")
+
+            if filters.company:
+                query = query.ilike("company", f"%{filters.company}%")
+
+            # The exact count comes back with the page, so one request is enough
+            offset = (page - 1) * page_size
+            response = await query.range(offset, offset + page_size - 1).execute()
+            jobs = [self._deserialize_job(job_data) for job_data in response.data] if response.data else []
+
+            return JobListings(
+                jobs=jobs,
+                total_count=response.count or 0,
+                page=page,
+                page_size=page_size
+            )
+        except Exception as e:
+            return JobListings(jobs=[], total_count=0, page=page, page_size=page_size)
+
+    async def get_job_statistics(self) -> Dict[str, Any]:
+        try:
+            # Concurrent misses share one set of count queries
+            return await self.cache.get_or_load("job_statistics", self._load_job_statistics)
+        except Exception as e:
+            return {
+                "total_jobs": 0,
+                "indexed_jobs": 0,
+                "unindexed_jobs": 0,
+                "active_sources": 0,
+                "total_sources": 0
+            }
+
+    async def _load_job_statistics(self) -> Dict[str, Any]:
+        client = await self._get_client()
+        jobs_response = await client.table("jobs").select("id", count="exact").limit(1).execute()
+        total_jobs = jobs_response.count or 0
+
+        indexed_response = await (client.table("jobs")
+                                  .select("id", count="exact")
+                                  .eq("is_indexed", True)
+                                  .limit(1)
+                                  .execute())
+        indexed_jobs = indexed_response.count or 0
+
+        sources_response = await client.table("job_sources").select("*").execute()
+        sources_data = sources_response.data or []
+
+        return {
+            "total_jobs": total_jobs,
+            "indexed_jobs": indexed_jobs,
+            "unindexed_jobs": total_jobs - indexed_jobs,
+            "active_sources": len([s for s in sources_data if s.get("is_active", True)]),
+            "total_sources": len(sources_data)
+        }
+
+    async def get_jobs_for_matching(self, limit: int = 1000, min_skills: int = 1) -> List[Job]:
+        try:
+            client = await self._get_client()
+            response = await (client.table("jobs")
+                              .select(JOB_COLUMNS)  # No embedding vectors
+                              .eq("is_active", True)
+                              .not_.is_("skills", "null")
+                              .order("created_at", desc=True)
+                              .limit(limit)
+                              .execute())
+
+            if not response.data:
+                logger.info("No jobs found for matching")
+                return []
+
+            jobs = []
+            for job_data in response.data:
+                try:
+                    job = self._deserialize_job(job_data)
+                    if job.skills and len(job.skills) >= min_skills:
+                        jobs.append(job)
+                except Exception as e:
+                    logger.warning(f"Failed to deserialize job: {e}")
+                    continue
+
+            logger.info(f"✅ Retrieved {len(jobs)} jobs for matching (from {len(response.data)} total)")
+            return jobs
+
+        except Exception as e:
+            logger.error(f"❌ Error fetching jobs for matching: {e}")
+            return []
+
+    async def get_inactive_job_ids(self, page_size: int = 1000) -> Set[str]:
+        """Ids of jobs marked inactive (paged, id column only); matching skips them."""
+        job_ids: Set[str] = set()
+        offset = 0
+        try:
+            client = await self._get_client()
+            while True:
+                response = await (client.table("jobs")
+                                  .select("id")
+                                  .eq("is_active", False)
+                                  .order("id")
+                                  .range(offset, offset + page_size - 1)
+                                  .execute())
+                rows = response.data or []
+                job_ids.update(row["id"] for row in rows)
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            # Raised rather than returning a partial set, which callers would read as jobs reactivated
+            logger.error(f"Error fetching inactive job ids: {e}")
+            raise
+        return job_ids
+
+    async def get_job_by_id(self, job_id: str) -> Optional[Job]:
+        jobs = await self.get_jobs_by_ids([job_id])
+        return jobs[0] if jobs else None
+
+    async def get_jobs_by_ids(self, job_ids: List[str], columns: str = JOB_COLUMNS) -> List[Job]:
+        """Fetch jobs in one request per chunk, returned in the order of job_ids (see JobDatabase.get_jobs_by_ids)."""
+        ordered_ids = list(dict.fromkeys(job_id for job_id in job_ids if job_id))
+        if not ordered_ids:
+            return []
+
+        use_cache = columns == JOB_COLUMNS
+        found: Dict[str, Job] = {}
+        versions: Dict[str, int] = {}
+
+        if use_cache:
+            found, versions = self.job_cache.get_many(ordered_ids)
+
+        missing_ids = [job_id for job_id in ordered_ids if job_id not in found]
+        if missing_ids and use_cache:
+            # Ids another request is already fetching are awaited rather than queried again
+            found.update(await self.job_cache.load_many(
+                missing_ids, versions, lambda ids: self._fetch_jobs(ids, columns)
+            ))
+        elif missing_ids:
+            found.update({job.id: job for job in await self._fetch_jobs(missing_ids, columns)})
+
+        return [found[job_id] for job_id in ordered_ids if job_id in found]
+
+    async def _fetch_jobs(self, job_ids: List[str], columns: str) -> List[Job]:
+        client = await self._get_client()
+        fetched: List[Job] = []
+
+        for start in range(0, len(job_ids), JOB_FETCH_CHUNK_SIZE):
+            chunk = job_ids[start:start + JOB_FETCH_CHUNK_SIZE]
+            try:
+                response = await client.table("jobs").select(columns).in_("id", chunk).execute()
+            except Exception as e:
+                logger.error(f"Error fetching {len(chunk)} jobs by id: {e}")
+                continue
+
+            fetched.extend(self._deserialize_job(job_data) for job_data in response.data or [])
+
+        return fetched
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return self.job_cache.get_stats()
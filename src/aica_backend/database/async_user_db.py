@@ -0,0 +1,589 @@
+import json
+import logging
+
+from typing import Optional, List, Dict, Any, Set
+from supabase import AsyncClient
+from datetime import datetime
+
+from .client_registry import get_async_shared_client
+from .user_db import UserDatabase, MATCH_UPSERT_CHUNK_SIZE
+from .models.user_models import (
+    User, UserProfile, UserSkill, UserSkillCreate,
+    UserJobMatch, SkillsResponse, UserSavedJob
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUserDatabase:
+    """
+    Async counterpart of UserDatabase for use from coroutines.
+
+    Same method names, arguments and return values as UserDatabase, but every
+    query is awaited on the pooled async Supabase client so a slow request does
+    not block the event loop.
+    """
+
+    def __init__(self, client: AsyncClient = None):
+        # Resolved lazily: the shared async client can only be created inside a running loop
+        self._client = client
+
+    async def _get_client(self) -> AsyncClient:
+        if self._client is not None:
+            return self._client
+        return await get_async_shared_client("service")
+
+    # Response/row helpers are identical to the sync implementation
+    _handle_db_response = UserDatabase._handle_db_response
+    _parse_job_match = UserDatabase._parse_job_match
+    _resume_data_params = staticmethod(UserDatabase._resume_data_params)
+
+    async def create_user(self, email: str, password_hash: str, user_id: str = None) -> User:
+        try:
+            data = {
+                "email": email.lower().strip(),
+                "password_hash": password_hash
+            }
+            if user_id:
+                data["id"] = user_id
+
+            client = await self._get_client()
+            response = await client.table("users").insert(data).execute()
+            self._handle_db_response(response, "user creation")
+
+            if not response.data:
+                raise ValueError("No user data returned after creation")
+
+            return User(**response.data[0])
+        except Exception as e:
+            raise ValueError(f"Failed to create user: {str(e)}")
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        try:
+            client = await self._get_client()
+            response = await client.table("users").select("*").eq("email", email.lower().strip()).execute()
+            self._handle_db_response(response, "get user by email")
+
+            if response.data:
+                return User(**response.data[0])
+            return None
+        except Exception as e:
+            return None
+
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+        try:
+            client = await self._get_client()
+            response = await client.table("users").select("*").eq("id", user_id).execute()
+            self._handle_db_response(response, "get user by id")
+
+            if response.data:
+                return User(**response.data[0])
+            return None
+        except Exception as e:
+            return None
+
+    async def user_exists(self, email: str) -> bool:
+        """Check if user exists"""
+        try:
+            client = await self._get_client()
+            response = await client.table("users").select("id").eq("email", email.lower().strip()).execute()
+            self._handle_db_response(response, "check user exists")
+            return len(response.data) > 0
+        except Exception:
+            return False
+
+    async def create_user_profile(self, user_id: str) -> UserProfile:
+        try:
+            data = {
+                "user_id": user_id,
+                "resume_uploaded": False,
+                "resume_processed": False,
+                "profile_completed": False,
+                "processing_step": None,
+                "processing_error": None,
+                "matches_generated": False,
+            }
+
+            client = await self._get_client()
+            response = await client.table("user_profiles").insert(data).execute()
+            self._handle_db_response(response, "create user profile")
+
+            if not response.data:
+                raise ValueError("No profile data returned after creation")
+
+            return UserProfile(**response.data[0])
+        except Exception as e:
+            raise ValueError(f"Failed to create user profile: {str(e)}")
+
+    async def get_user_profile(self, user_id: str) -> Optional[UserProfile]:
+        try:
+            client = await self._get_client()
+            response = await client.table("user_profiles").select("*").eq("user_id", user_id).execute()
+            self._handle_db_response(response, "get user profile")
+
+            if response.data:
+                return UserProfile(**response.data[0])
+            return None
+        except Exception as e:
+            return None
+
+    async def update_user_profile(self, user_id: str, update_data: dict) -> Optional[UserProfile]:
+        try:
+            client = await self._get_client()
+            # Update first; only a user without a profile row needs the insert
+            update_data["updated_at"] = datetime.now().isoformat()
+            response = await client.table("user_profiles").update(update_data).eq("user_id", user_id).execute()
+            self._handle_db_response(response, "update user profile")
+
+            if not response.data:
+                create_data = {
+                    "user_id": user_id,
+                    "resume_uploaded": False,
+                    "resume_processed": False,
+                    "profile_completed": False,
+                    "processing_step": None,
+                    "processing_error": None,
+                    "matches_generated": False,
+                }
+                create_data.update(update_data)
+                create_data["created_at"] = datetime.now().isoformat()
+
+                response = await client.table("user_profiles").insert(create_data).execute()
+                self._handle_db_response(response, "create user profile")
+
+            if response.data:
+                return UserProfile(**response.data[0])
+            return None
+        except Exception as e:
+            raise ValueError(f"Failed to update user profile: {str(e)}")
+
+    async def mark_resume_uploaded(self, user_id: str, file_path: str) -> bool:
+        try:
+            update_data = {
+                "resume_uploaded": True,
+                "resume_file_path": file_path,
+                "updated_at": datetime.now().isoformat()
+            }
+            client = await self._get_client()
+            response = await client.table("user_profiles").update(update_data).eq("user_id", user_id).execute()
+            self._handle_db_response(response, "mark resume uploaded")
+
+            return len(response.data) > 0
+        except Exception as e:
+            return False
+
+    async def add_user_skill(self, user_id: str, skill: UserSkillCreate) -> UserSkill:
+        try:
+            data = {
+                "user_id": user_id,
+                "skill_name": skill.skill_name,
+                "skill_category": skill.skill_category,
+                "confidence_score": skill.confidence_score,
+                "source": skill.source
+            }
+            client = await self._get_client()
+            response = await client.table("user_skills").insert(data).execute()
+            self._handle_db_response(response, "add user skill")
+
+            if not response.data:
+                raise ValueError("No skill data returned after creation")
+
+            return UserSkill(**response.data[0])
+        except Exception as e:
+            raise ValueError(f"Failed to add user skill: {str(e)}")
+
+    async def add_user_skills_batch(self, user_id: str, skills: List[UserSkillCreate]) -> List[UserSkill]:
+        if not skills:
+            return []
+
+        try:
+            data = [{
+                "user_id": user_id,
+                "skill_name": skill.skill_name,
+                "skill_category": skill.skill_category,
+                "confidence_score": skill.confidence_score,
+                "source": skill.source
+            } for skill in skills]
+
+            client = await self._get_client()
+            response = await client.table("user_skills").insert(data).execute()
+            self._handle_db_response(response, "add user skills batch")
+
+            return [UserSkill(**item) for item in response.data] if response.data else []
+        except Exception as e:
+            raise ValueError(f"Failed to add user skills batch: {str(e)}")
+
+    async def get_user_skills(self, user_id: str) -> List[UserSkill]:
+        try:
+            client = await self._get_client()
+            response = await client.table("user_skills").select("*").eq("user_id", user_id).execute()
+            self._handle_db_response(response, "get user skills")
+
+            return [UserSkill(**item) for item in response.data] if response.data else []
+        except Exception as e:
+            return []
+
+    async def get_all_user_skill_names(self, page_size: int = 1000) -> Dict[str, List[str]]:
+        """Skill names of every user, keyed by user id (paged, for batch jobs)."""
+        skills_by_user: Dict[str, List[str]] = {}
+        offset = 0
+        try:
+            client = await self._get_client()
+            while True:
+                response = await (client.table("user_skills")
+                                  .select("user_id, skill_name")
+                                  .order("id")
+                                  .range(offset, offset + page_size - 1)
+                                  .execute())
+                rows = response.data or []
+                for row in rows:
+                    skills_by_user.setdefault(row["user_id"], []).append(row["skill_name"])
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            logger.error(f"Error fetching skills of all users: {str(e)}")
+        return skills_by_user
+
+    async def get_all_user_profiles(self, columns: str = "user_id, experience_years, location",
+                                    page_size: int = 1000) -> Dict[str, Dict[str, Any]]:
+        """Selected profile columns of every user, keyed by user id (paged, for batch jobs)."""
+        profiles: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        try:
+            client = await self._get_client()
+            while True:
+                response = await (client.table("user_profiles")
+                                  .select(columns)
+                                  .order("user_id")
+                                  .range(offset, offset + page_size - 1)
+                                  .execute())
+                rows = response.data or []
+                for row in rows:
+                    profiles[row["user_id"]] = row
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            logger.error(f"Error fetching profiles of all users: {str(e)}")
+        return profiles
+
+    async def get_user_skills_by_category(self, user_id: str, category: str) -> List[UserSkill]:
+        try:
+            client = await self._get_client()
+            response = await (client.table("user_skills")
+                              .select("*")
+                              .eq("user_id", user_id)
+                              .eq("skill_category", category)
+                              .execute())
+            self._handle_db_response(response, "get user skills by category")
+
+            return [UserSkill(**skill_data) for skill_data in response.data] if response.data else []
+        except Exception as e:
+            return []
+
+    async def _clear_user_rows(self, table: str, user_id: str, label: str) -> bool:
+        try:
+            client = await self._get_client()
+            await client.table(table).delete().eq("user_id", user_id).execute()
+            logger.info(f"Cleared all {label} for user {user_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to clear {label} for user {user_id}: {e}")
+            return False
+
+    async def clear_user_skills(self, user_id: str) -> bool:
+        """Delete all skills for a user (used during resume re-upload with replace mode)"""
+        return await self._clear_user_rows("user_skills", user_id, "skills")
+
+    async def clear_user_education(self, user_id: str) -> bool:
+        """Delete all education entries for a user (used during resume re-upload with replace mode)"""
+        return await self._clear_user_rows("user_education", user_id, "education")
+
+    async def clear_user_experience(self, user_id: str) -> bool:
+        """Delete all experience entries for a user (used during resume re-upload with replace mode)"""
+        return await self._clear_user_rows("user_experience", user_id, "experience")
+
+    async def replace_user_resume_data(self, user_id: str, skills: List[UserSkillCreate],
+                                       profile_updates: Dict[str, Any], clear_existing: bool = True) -> int:
+        """Replace a user's resume skills and profile fields in one request (see UserDatabase)."""
+        try:
+            client = await self._get_client()
+            response = await client.rpc("replace_user_resume_data", self._resume_data_params(
+                user_id, skills, profile_updates, clear_existing
+            )).execute()
+            self._handle_db_response(response, "replace user resume data")
+            return (response.data or {}).get("skills_saved", 0)
+        except Exception as e:
+            raise ValueError(f"Failed to replace user resume data: {str(e)}")
+
+    async def save_job_match(self, user_id: str, job_id: str, match_score: float, matched_skills: List[str],
+                             missing_critical_skills: List[str] = None, skill_coverage: float = 0.0,
+                             confidence: str = "medium", ai_reasoning: str = "") -> UserJobMatch:
+        saved = await self.save_job_matches_bulk(user_id, [{
+            "job_id": job_id,
+            "match_score": match_score,
+            "matched_skills": matched_skills,
+            "missing_critical_skills": missing_critical_skills,
+            "skill_coverage": skill_coverage,
+            "confidence": confidence,
+            "ai_reasoning": ai_reasoning
+        }])
+        if not saved:
+            raise ValueError("Failed to save job match: No job match data returned after creation")
+        return saved[0]
+
+    async def save_job_matches_bulk(self, user_id: str, matches: List[Dict[str, Any]],
+                                    chunk_size: int = MATCH_UPSERT_CHUNK_SIZE) -> List[UserJobMatch]:
+        """Upsert many job matches for a user, one request per chunk (see UserDatabase.save_job_matches_bulk)."""
+        if not matches:
+            return []
+
+        try:
+            rows_by_job: Dict[str, Dict[str, Any]] = {}
+            for match in matches:
+                rows_by_job[match["job_id"]] = {
+                    "user_id": user_id,
+                    "job_id": match["job_id"],
+                    "match_score": match.get("match_score", 0.0),
+                    "matched_skills": json.dumps(match.get("matched_skills") or []),
+                    "missing_critical_skills": json.dumps(match.get("missing_critical_skills") or []),
+                    "skill_coverage": match.get("skill_coverage", 0.0),
+                    "confidence": match.get("confidence", "medium"),
+                    "ai_reasoning": match.get("ai_reasoning", "")
+                }
+            rows = list(rows_by_job.values())
+
+            client = await self._get_client()
+            saved = []
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                response = await (client.table("user_job_matches")
+                                  .upsert(chunk, on_conflict="user_id,job_id")
+                                  .execute())
+                self._handle_db_response(response, "bulk save job matches")
+
+                for match_data in response.data or []:
+                    saved.append(self._parse_job_match(match_data))
+
+            logger.info(f"Upserted {len(saved)} job matches for user {user_id} in "
+                        f"{(len(rows) + chunk_size - 1) // chunk_size} request(s)")
+            return saved
+        except Exception as e:
+            raise ValueError(f"Failed to bulk save job matches: {str(e)}")
+
+    async def get_user_job_matches(self, user_id: str, limit: int = 50) -> List[UserJobMatch]:
+        try:
+            client = await self._get_client()
+            response = await (client.table("user_job_matches")
+                              .select("*")
+                              .eq("user_id", user_id)
+                              .order("match_score", desc=True)
+                              .limit(limit)
+                              .execute())
+            self._handle_db_response(response, "get user job matches")
+
+            matches = [self._parse_job_match(match_data) for match_data in response.data or []]
+
+            logger.info(f"Successfully fetched {len(matches)} job matches for user {user_id}")
+            return matches
+        except Exception as e:
+            logger.error(f"Error fetching job matches for user {user_id}: {str(e)}")
+            return []
+
+    async def count_user_job_matches(self, user_id: str) -> int:
+        """Number of stored matches of a user (a count query, no rows transferred)."""
+        try:
+            client = await self._get_client()
+            response = await (client.table("user_job_matches")
+                              .select("id", count="exact")
+                              .eq("user_id", user_id)
+                              .limit(1)
+                              .execute())
+            self._handle_db_response(response, "count user job matches")
+            return response.count or 0
+        except Exception as e:
+            logger.error(f"Error counting job matches for user {user_id}: {str(e)}")
+            return 0
+
+    async def get_matched_job_ids(self, user_id: str, page_size: int = 1000) -> Set[str]:
+        """Ids of every job the user already has a match for (paged, id column only)."""
+        job_ids: Set[str] = set()
+        offset = 0
+        try:
+            client = await self._get_client()
+            while True:
+                response = await (client.table("user_job_matches")
+                                  .select("job_id")
+                                  .eq("user_id", user_id)
+                                  .order("job_id")
+                                  .range(offset, offset + page_size - 1)
+                                  .execute())
+                rows = response.data or []
+                job_ids.update(row["job_id"] for row in rows)
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            logger.error(f"Error fetching matched job ids for user {user_id}: {str(e)}")
+        return job_ids
+
+    async def get_user_job_match(self, user_id: str, job_id: str) -> Optional[UserJobMatch]:
+        """Return the stored match for one job, or None."""
+        try:
+            client = await self._get_client()
+            response = await (client.table("user_job_matches")
+                              .select("*")
+                              .eq("user_id", user_id)
+                              .eq("job_id", job_id)
+                              .limit(1)
+                              .execute())
+            self._handle_db_response(response, "get user job match")
+            return self._parse_job_match(response.data[0]) if response.data else None
+        except Exception as e:
+            logger.error(f"Error fetching job match for user {user_id}, job {job_id}: {str(e)}")
+            return None
+
+    async def clear_job_matches(self, user_id: str) -> bool:
+        try:
+            client = await self._get_client()
+            await client.table("user_job_matches").delete().eq("user_id", user_id).execute()
+            return True
+        except Exception as e:
+            return False
+
+    async def delete_job_matches(self, user_id: str, job_ids: List[str]) -> bool:
+        """Delete the user's matches for the given jobs, one request per chunk."""
+        job_ids = list(dict.fromkeys(job_ids))
+        try:
+            client = await self._get_client()
+            for start in range(0, len(job_ids), MATCH_UPSERT_CHUNK_SIZE):
+                chunk = job_ids[start:start + MATCH_UPSERT_CHUNK_SIZE]
+                await client.table("user_job_matches").delete().eq("user_id", user_id).in_("job_id", chunk).execute()
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting {len(job_ids)} job matches for user {user_id}: {str(e)}")
+            return False
+
+    async def get_user_stats(self, user_id: str) -> Dict[str, Any]:
+        try:
+            profile = await self.get_user_profile(user_id)
+            skills = await self.get_user_skills(user_id)
+            matches = await self.get_user_job_matches(user_id, limit=1)
+
+            technical_skills = len([s for s in skills if s.skill_category == "technical"])
+            soft_skills = len([s for s in skills if s.skill_category == "soft"])
+
+            return {
+                "profile_completed": profile.profile_completed if profile else False,
+                "resume_uploaded": profile.resume_uploaded if profile else False,
+                "resume_processed": profile.resume_processed if profile else False,
+                "total_skills": len(skills),
+                "technical_skills_count": technical_skills,
+                "soft_skills_count": soft_skills,
+                "has_job_matches": len(matches) > 0,
+                "best_match_score": matches[0].match_score if matches else 0.0
+            }
+        except Exception as e:
+            return {
+                "profile_completed": False,
+                "resume_uploaded": False,
+                "resume_processed": False,
+                "total_skills": 0,
+                "technical_skills_count": 0,
+                "soft_skills_count": 0,
+                "has_job_matches": False,
+                "best_match_score": 0.0
+            }
+
+    async def get_skills_summary(self, user_id: str) -> SkillsResponse:
+        try:
+            skills = await self.get_user_skills(user_id)
+
+            return SkillsResponse(
+                technical_skills=[s.skill_name for s in skills if s.skill_category == "technical"],
+                soft_skills=[s.skill_name for s in skills if s.skill_category == "soft"],
+                industries=[s.skill_name for s in skills if s.skill_category == "industry"]
+            )
+        except Exception as e:
+            return SkillsResponse(technical_skills=[], soft_skills=[], industries=[])
+
+    async def save_user_job(self, user_id: str, job_id: str, is_recommendation: bool = False) -> UserSavedJob:
+        try:
+            client = await self._get_client()
+            existing = await (client.table("user_saved_jobs")
+                              .select("*")
+                              .eq("user_id", user_id)
+                              .eq("job_id", job_id)
+                              .execute())
+
+            if existing.data:
+                saved_job = UserSavedJob(**existing.data[0])
+            else:
+                response = await client.table("user_saved_jobs").insert({
+                    "user_id": user_id,
+                    "job_id": job_id
+                }).execute()
+                self._handle_db_response(response, "save user job")
+                if not response.data:
+                    raise ValueError("No saved job data returned after creation")
+                saved_job = UserSavedJob(**response.data[0])
+
+            # Ensure match data exists for this job
+            await self.ensure_job_match_exists(user_id, job_id, is_recommendation=is_recommendation)
+            return saved_job
+        except Exception as e:
+            raise ValueError(f"Failed to save user job: {str(e)}")
+
+    async def ensure_job_match_exists(self, user_id: str, job_id: str, is_recommendation: bool = False) -> bool:
+        try:
+            client = await self._get_client()
+            response = await (client.table("user_job_matches")
+                              .select("id")
+                              .eq("user_id", user_id)
+                              .eq("job_id", job_id)
+                              .execute())
+
+            if response.data:
+                return True
+
+            match_data = {
+                "user_id": user_id,
+                "job_id": job_id,
+                "match_score": 0.0 if is_recommendation else 0.5,
+                "matched_skills": [],
+                "missing_critical_skills": [],
+                "skill_coverage": 0.0,
+                "confidence": "recommendation" if is_recommendation else "medium",
+                "ai_reasoning": "This is a recommended job saved before skills matching. Update your skills for personalized matches!" if is_recommendation else "Job saved before detailed matching was performed"
+            }
+
+            response = await client.table("user_job_matches").insert(match_data).execute()
+            self._handle_db_response(response, "create basic job match")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not ensure job match exists for user {user_id}, job {job_id}: {str(e)}")
+            return False
+
+    async def remove_user_saved_job(self, user_id: str, job_id: str) -> bool:
+        try:
+            client = await self._get_client()
+            response = await client.table("user_saved_jobs").delete().eq("user_id", user_id).eq("job_id", job_id).execute()
+            self._handle_db_response(response, "remove user saved job")
+            return True
+        except Exception as e:
+            return False
+
+    async def get_user_saved_jobs(self, user_id: str, limit: int = 50) -> List[UserSavedJob]:
+        try:
+            client = await self._get_client()
+            response = await (client.table("user_saved_jobs")
+                              .select("*")
+                              .eq("user_id", user_id)
+                              .order("saved_at", desc=True)
+                              .limit(limit)
+                              .execute())
+            self._handle_db_response(response, "get user saved jobs")
+            return [UserSavedJob(**item) for item in response.data] if response.data else []
+        except Exception as e:
+            return []
@@ -0,0 +1,199 @@
+import os
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+
+import httpx
+from supabase import (
+    create_client, Client, ClientOptions,
+    acreate_client, AsyncClient, AsyncClientOptions
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SupabaseClientRegistry:
+    """
+    Process-wide registry of Supabase clients sharing one pooled HTTP session.
+
+    Creating a client per request builds a new httpx session each time, so every
+    request pays for DNS, TCP and TLS setup again. The registry keeps one
+    keep-alive connection pool (sized from the environment) and one client per
+    key role:
+
+    - "service": service role key (falls back to SUPABASE_KEY), used by UserDatabase
+    - "anon": SUPABASE_KEY, used by JobDatabase and token validation
+
+    Shared clients never hold a user session. Flows that sign a user in or up
+    must use create_auth_client(), which returns a fresh client on the same pool.
+
+    Async clients (get_async_client) sit on their own httpx.AsyncClient pool with
+    the same limits. That pool belongs to the event loop that created it, so it is
+    rebuilt if the registry is used from a different loop (e.g. successive
+    asyncio.run() calls in scripts).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._clients: Dict[str, Client] = {}
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        self._async_clients: Dict[str, AsyncClient] = {}
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def _get_url() -> str:
+        url = os.getenv("SUPABASE_URL")
+        if not url:
+            raise ValueError("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
+        return url
+
+    @staticmethod
+    def _get_key(role: str) -> str:
+        if role == "service":
+            key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
+        elif role == "anon":
+            key = os.getenv("SUPABASE_KEY")
+        else:
+            raise ValueError(f"Unknown Supabase client role: {role}")
+
+        if not key:
+            raise ValueError("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
+        return key
+
+    @staticmethod
+    def _pool_settings() -> Dict:
+        return {
+            "limits": httpx.Limits(
+                max_connections=int(os.getenv("SUPABASE_MAX_CONNECTIONS", "50")),
+                max_keepalive_connections=int(os.getenv("SUPABASE_MAX_KEEPALIVE_CONNECTIONS", "20")),
+                keepalive_expiry=float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "30"))
+            ),
+            "timeout": httpx.Timeout(
+                float(os.getenv("SUPABASE_HTTP_TIMEOUT", "30")),
+                connect=float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "10"))
+            ),
+            "http2": True,
+            "follow_redirects": True
+        }
+
+    def _get_http_client(self) -> httpx.Client:
+        if self._http_client is None or self._http_client.is_closed:
+            settings = self._pool_settings()
+            limits = settings["limits"]
+            self._http_client = httpx.Client(**settings)
+            logger.info(
+                f"Created pooled Supabase HTTP client "
+                f"(max_connections={limits.max_connections}, "
+                f"max_keepalive={limits.max_keepalive_connections})"
+            )
+        return self._http_client
+
+    def _build_client(self, role: str) -> Client:
+        options = ClientOptions(
+            httpx_client=self._get_http_client(),
+            auto_refresh_token=False,
+            persist_session=False
+        )
+        return create_client(self._get_url(), self._get_key(role), options=options)
+
+    def get_client(self, role: str = "service") -> Client:
+        """Return the shared client for a key role, creating it on first use."""
+        client = self._clients.get(role)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(role)
+            if client is None:
+                client = self._build_client(role)
+                self._clients[role] = client
+            return client
+
+    def create_auth_client(self) -> Client:
+        """Return a new anon client for sign-in/sign-up flows that store a session on the client."""
+        with self._lock:
+            return self._build_client("anon")
+
+    def _get_async_http_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            # Connections from another (possibly closed) loop cannot be reused here
+            self._async_clients = {}
+            self._async_http_client = None
+            self._async_loop = loop
+
+        if self._async_http_client is None or self._async_http_client.is_closed:
+            self._async_http_client = httpx.AsyncClient(**self._pool_settings())
+            logger.info("Created pooled async Supabase HTTP client")
+        return self._async_http_client
+
+    async def _build_async_client(self, role: str) -> AsyncClient:
+        options = AsyncClientOptions(
+            httpx_client=self._get_async_http_client(),
+            auto_refresh_token=False,
+            persist_session=False
+        )
+        return await acreate_client(self._get_url(), self._get_key(role), options=options)
+
+    async def get_async_client(self, role: str = "service") -> AsyncClient:
+        """Return the shared async client for a key role on the current event loop."""
+        self._get_async_http_client()
+        client = self._async_clients.get(role)
+        if client is not None:
+            return client
+
+        client = await self._build_async_client(role)
+        # Another coroutine may have created the client while we awaited
+        return self._async_clients.setdefault(role, client)
+
+    async def create_async_auth_client(self) -> AsyncClient:
+        """Async variant of create_auth_client (fresh anon client on the async pool)."""
+        return await self._build_async_client("anon")
+
+    def close(self) -> None:
+        """Close pooled connections and forget all clients."""
+        with self._lock:
+            self._clients.clear()
+            if self._http_client is not None and not self._http_client.is_closed:
+                self._http_client.close()
+                logger.info("Closed pooled Supabase HTTP client")
+            self._http_client = None
+
+    async def aclose(self) -> None:
+        """Close the async pool (on its own loop) and the sync pool."""
+        async_http_client = self._async_http_client
+        same_loop = self._async_loop is asyncio.get_running_loop()
+        self._async_clients = {}
+        self._async_http_client = None
+        self._async_loop = None
+
+        if async_http_client is not None and not async_http_client.is_closed and same_loop:
+            await async_http_client.aclose()
+            logger.info("Closed pooled async Supabase HTTP client")
+
+        self.close()
+
+
+_registry = SupabaseClientRegistry()
+
+
+def get_client_registry() -> SupabaseClientRegistry:
+    return _registry
+
+
+def get_shared_client(role: str = "service") -> Client:
+    return _registry.get_client(role)
+
+
+async def get_async_shared_client(role: str = "service") -> AsyncClient:
+    return await _registry.get_async_client(role)
+
+
+def close_shared_clients() -> None:
+    _registry.close()
+
+
+async def aclose_shared_clients() -> None:
+    await _registry.aclose()
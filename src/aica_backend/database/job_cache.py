@@ -0,0 +1,343 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .models.job_models import Job
+from utils import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Job fields never stored in the cache (large vectors nobody reads back)
+EXCLUDED_JOB_FIELDS = {"content_embedding", "skills_embedding"}
+
+
+class InMemoryCacheBackend:
+    """
+    Process-local stand-in for a Redis server.
+
+    Implements the subset of the redis-py client API used by JobCache
+    (get, mget, set with ex, delete, incr) so development and tests can run
+    the shared-cache code path without a Redis instance.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _read(self, key: str) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and time.time() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            return self._read(key)
+
+    def mget(self, keys: List[str]) -> List[Any]:
+        with self._lock:
+            return [self._read(key) for key in keys]
+
+    def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            expires_at = time.time() + ex if ex else None
+            self._data[key] = (value, expires_at)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._read(key) or 0) + 1
+            self._data[key] = (value, None)
+            return value
+
+
+class JobCache:
+    """
+    Two-tier read-through cache for job rows keyed by job id.
+
+    The local tier is a bounded LRU/TTL cache in this process. The optional shared
+    tier (a Redis client or InMemoryCacheBackend) lets several workers reuse each
+    other's fetches. Every job id has a version that writers bump on
+    invalidation; entries tagged with an older version are ignored, so a reader
+    that fetched a row before a concurrent write can never cache stale data.
+    """
+
+    # Invalidated ids whose version is tracked without a shared backend, per cache entry
+    VERSIONS_PER_ENTRY = 4
+
+    def __init__(
+        self,
+        max_size: int = 2000,
+        ttl: int = 600,
+        backend: Any = None,
+        namespace: str = "aica:job"
+    ):
+        self.ttl = ttl
+        self.backend = backend
+        self.namespace = namespace
+        self._local = LRUCache(max_size=max_size, ttl=ttl)
+        # Versions of invalidated jobs when there is no shared backend, bounded to
+        # VERSIONS_PER_ENTRY * max_size ids (see _bump_local_version)
+        self._local_versions: "OrderedDict[str, int]" = OrderedDict()
+        self._max_local_versions = max_size * self.VERSIONS_PER_ENTRY
+        self._version_clock = 0
+        self._version_floor = 0
+        self._inflight: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._stats = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "invalidations": 0,
+            "loads": 0,
+            "coalesced": 0
+        }
+
+    def _value_key(self, job_id: str) -> str:
+        return f"{self.namespace}:{job_id}"
+
+    def _version_key(self, job_id: str) -> str:
+        return f"{self.namespace}:ver:{job_id}"
+
+    def _current_versions(self, job_ids: List[str]) -> Dict[str, int]:
+        if self.backend is None:
+            return {job_id: self._local_versions.get(job_id, self._version_floor) for job_id in job_ids}
+
+        try:
+            raw_versions = self.backend.mget([self._version_key(job_id) for job_id in job_ids])
+            return {job_id: int(raw or 0) for job_id, raw in zip(job_ids, raw_versions)}
+        except Exception as e:
+            # Treat an unreachable backend as "nothing cached" rather than failing the read
+            logger.warning(f"Job cache backend unavailable, bypassing cache: {e}")
+            return {job_id: -1 for job_id in job_ids}
+
+    def get_many(self, job_ids: List[str]) -> Tuple[Dict[str, Job], Dict[str, int]]:
+        """
+        Look up jobs in the cache.
+
+        Returns:
+            (found jobs by id, current version of every requested id). Pass the
+            versions of the misses back to set_many after fetching them.
+        """
+        if not job_ids:
+            return {}, {}
+
+        versions = self._current_versions(job_ids)
+        found: Dict[str, Job] = {}
+        shared_lookup: List[str] = []
+
+        for job_id in job_ids:
+            if versions[job_id] < 0:
+                continue
+            entry = self._local.get(job_id)
+            if entry is not None and entry[0] == versions[job_id]:
+                found[job_id] = entry[1]
+                self._stats["local_hits"] += 1
+            else:
+                if entry is not None:
+                    self._stats["stale"] += 1
+                shared_lookup.append(job_id)
+
+        if shared_lookup and self.backend is not None:
+            try:
+                raw_values = self.backend.mget([self._value_key(job_id) for job_id in shared_lookup])
+            except Exception as e:
+                logger.warning(f"Job cache backend read failed: {e}")
+                raw_values = [None] * len(shared_lookup)
+
+            for job_id, raw in zip(shared_lookup, raw_values):
+                if raw is None:
+                    continue
+                try:
+                    version_str, payload = (raw.decode() if isinstance(raw, bytes) else raw).split(":", 1)
+                    if int(version_str) != versions[job_id]:
+                        self._stats["stale"] += 1
+                        continue
+                    job = Job.model_validate_json(payload)
+                except Exception:
+                    continue
+                found[job_id] = job
+                self._local.set(job_id, (versions[job_id], job))
+                self._stats["shared_hits"] += 1
+
+        self._stats["misses"] += len(job_ids) - len(found)
+        return found, versions
+
+    def set_many(self, jobs: List[Job], versions: Dict[str, int]) -> None:
+        """Store freshly fetched jobs tagged with the versions seen before the fetch."""
+        for job in jobs:
+            version = versions.get(job.id, -1)
+            if version < 0:
+                continue
+            self._local.set(job.id, (version, job))
+
+            if self.backend is not None:
+                try:
+                    payload = job.model_dump_json(exclude=EXCLUDED_JOB_FIELDS)
+                    self.backend.set(self._value_key(job.id), f"{version}:{payload}", ex=self.ttl)
+                except Exception as e:
+                    logger.warning(f"Job cache backend write failed for job {job.id}: {e}")
+
+    async def load_many(
+        self,
+        job_ids: List[str],
+        versions: Dict[str, int],
+        loader: Callable[[List[str]], Awaitable[List[Job]]]
+    ) -> Dict[str, Job]:
+        """
+        Fetch cache misses with loader and store them (see set_many).
+
+        Per-id counterpart of LRUCache.get_or_load: ids that another caller on
+        the same event loop is already fetching are awaited instead of being
+        passed to loader again. If that caller is cancelled, its ids are loaded
+        here instead.
+        """
+        loop = asyncio.get_running_loop()
+        waiting: Dict[str, asyncio.Future] = {}
+        futures: Dict[str, asyncio.Future] = {}
+        for job_id in job_ids:
+            inflight = self._inflight.get(job_id)
+            if inflight is not None and inflight[0] is loop:
+                waiting[job_id] = inflight[1]
+            else:
+                futures[job_id] = loop.create_future()
+                self._inflight[job_id] = (loop, futures[job_id])
+
+        found: Dict[str, Job] = {}
+        try:
+            if futures:
+                self._stats["loads"] += 1
+                fetched = await loader(list(futures))
+                self.set_many(fetched, versions)
+                found.update((job.id, job) for job in fetched if job.id in futures)
+            for job_id, future in futures.items():
+                future.set_result(found.get(job_id))
+        except Exception as e:
+            for future in futures.values():
+                future.set_exception(e)
+                future.exception()
+            raise
+        except BaseException:
+            for future in futures.values():
+                future.cancel()
+            raise
+        finally:
+            for job_id, future in futures.items():
+                if self._inflight.get(job_id, (None, None))[1] is future:
+                    del self._inflight[job_id]
+
+        retry: List[str] = []
+        for job_id, future in waiting.items():
+            self._stats["coalesced"] += 1
+            try:
+                job = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                retry.append(job_id)
+                continue
+            except Exception:
+                continue  # Logged by the caller whose fetch failed
+            if job is not None:
+                found[job_id] = job
+
+        if retry:
+            found.update(await self.load_many(retry, versions, loader))
+        return found
+
+    def _bump_local_version(self, job_id: str) -> None:
+        """
+        Give job_id a version newer than any handed out before.
+
+        Versions come from one increasing clock. When the oldest tracked id is
+        dropped to bound the dict, the floor (the version of every untracked id)
+        rises to its version, so a row fetched before that invalidation still
+        compares as stale. Raising the floor also expires entries of untracked
+        ids, which only costs a refetch.
+        """
+        self._version_clock += 1
+        self._local_versions[job_id] = self._version_clock
+        self._local_versions.move_to_end(job_id)
+        while len(self._local_versions) > self._max_local_versions:
+            _, version = self._local_versions.popitem(last=False)
+            self._version_floor = max(self._version_floor, version)
+
+    def invalidate(self, job_ids: List[str]) -> None:
+        """Drop cached rows for the given jobs in this worker and, via the version bump, in all others."""
+        for job_id in job_ids:
+            if not job_id:
+                continue
+            self._local.delete(job_id)
+            self._stats["invalidations"] += 1
+
+            if self.backend is None:
+                self._bump_local_version(job_id)
+                continue
+
+            try:
+                self.backend.incr(self._version_key(job_id))
+                self.backend.delete(self._value_key(job_id))
+            except Exception as e:
+                logger.warning(f"Job cache backend invalidation failed for job {job_id}: {e}")
+
+    def clear(self) -> None:
+        """Clear the local tier (shared entries expire through their TTL)."""
+        self._local.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self._stats["local_hits"] + self._stats["shared_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "hits": hits,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "local_size": len(self._local),
+            "local_evictions": self._local.get_stats()["evictions"],
+            "shared_backend": type(self.backend).__name__ if self.backend is not None else None
+        }
+
+
+def _create_shared_backend() -> Any:
+    backend_name = os.getenv("JOB_CACHE_BACKEND", "").lower()
+
+    if backend_name == "memory":
+        return InMemoryCacheBackend()
+
+    redis_url = os.getenv("JOB_CACHE_REDIS_URL")
+    if backend_name == "redis" or redis_url:
+        try:
+            import redis
+            return redis.Redis.from_url(redis_url or "redis://localhost:6379/0")
+        except Exception as e:
+            logger.warning(f"Redis job cache backend not available: {e} - using local cache only")
+
+    return None
+
+
+_job_cache: Optional[JobCache] = None
+
+
+def get_job_cache() -> JobCache:
+    """Return the process-wide job cache, configured from the environment on first use."""
+    global _job_cache
+    if _job_cache is None:
+        _job_cache = JobCache(
+            max_size=int(os.getenv("JOB_CACHE_MAX_SIZE", "2000")),
+            ttl=int(os.getenv("JOB_CACHE_TTL", "600")),
+            backend=_create_shared_backend()
+        )
+        logger.info(f"Job cache initialized (shared backend: {_job_cache.get_stats()['shared_backend']})")
+    return _job_cache
@@ -1,33 +1,34 @@
-import os
 import json
 import uuid
 import logging
-from typing import List, Dict, Any, Optional
-from supabase import create_client, Client
+from typing import List, Dict, Any, Optional, Set
+from supabase import Client
 from datetime import datetime
 
+from .client_registry import get_shared_client
 from .models.job_models import JobSource, Job, JobListings, JobSearchFilters
-from utils import SimpleCache
+from .job_cache import JobCache, get_job_cache
+from utils import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Columns needed to build a Job for matching and display (embeddings are never read back)
+JOB_COLUMNS = "id,title,url,company,description,location,source,created_at,requirements,skills,is_indexed"
 
-class JobDatabase:
+# Maximum ids per in_() filter to keep the request URL short
+JOB_FETCH_CHUNK_SIZE = 100
 
-    def __init__(self, client: Client = None):
-        if client is None:
-            url = os.getenv("SUPABASE_URL")
-            key = os.getenv("SUPABASE_KEY")
 
-            if not url or not key:
-                raise ValueError("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
+class JobDatabase:
 
-            self.client = create_client(url, key)
-        else:
-            self.client = client
+    def __init__(self, client: Client = None, job_cache: JobCache = None):
+        # Default to the process-wide pooled client instead of a new connection per instance
+        self.client = client if client is not None else get_shared_client("anon")
 
         # Initialize cache
-        self.cache = SimpleCache(max_size=50, ttl=300)  # 5 minutes TTL
+        self.cache = LRUCache(max_size=50, ttl=300)  # 5 minutes TTL
+        # Job rows are shared by every JobDatabase instance (routes create one per request)
+        self.job_cache = job_cache or get_job_cache()
 
     def save_job_source(self, url: str) -> None:
         try:
@@ -102,15 +103,16 @@ class JobDatabase:
             if existing_response.data:
                 # Update existing job
                 response = self.client.table("jobs").update(job_data).eq("url", job_data['url']).execute()
-                # Clear statistics cache since job count might change
-                self.cache.clear()
+                # Only the updated row and the statistics are affected
+                self.cache.delete("job_statistics")
+                self.job_cache.invalidate([existing_response.data[0]['id']])
                 return existing_response.data[0]['id']
             else:
                 # Insert new job
                 response = self.client.table("jobs").insert(job_data).execute()
                 if response.data:
-                    # Clear statistics cache since job count changed
-                    self.cache.clear()
+                    # Statistics changed; no cached row can exist for a new job yet
+                    self.cache.delete("job_statistics")
                     return response.data[0]['id']
                 else:
                     raise Exception("No data returned from insert operation")
@@ -147,6 +149,8 @@ class JobDatabase:
                 update_data["skills_embedding"] = skills_embedding
                 
             self.client.table("jobs").update(update_data).eq("id", job_id).execute()
+            self.job_cache.invalidate([job_id])
+            self.cache.delete("job_statistics")
         except Exception as e:
             print(f"Error marking job as indexed: {e}")
      
@@ -276,7 +280,7 @@ class JobDatabase:
             # Query jobs that have skills and are suitable for matching
             # Only fetch active jobs with high priority
             response = (self.client.table("jobs")
-                       .select("*")
+                       .select(JOB_COLUMNS)  # No embedding vectors
                        .eq("is_active", True)  # Only active jobs
                        .not_.is_("skills", "null")
                        .order("created_at", desc=True)
@@ -305,15 +309,71 @@ class JobDatabase:
             logger.error(f"❌ Error fetching jobs for matching: {e}")
             return []
 
-    def get_job_by_id(self, job_id: str) -> Optional[Job]:
+    def get_inactive_job_ids(self, page_size: int = 1000) -> Set[str]:
+        """Ids of jobs marked inactive (paged, id column only); matching skips them."""
+        job_ids: Set[str] = set()
+        offset = 0
         try:
-            response = self.client.table("jobs").select("*").eq("id", job_id).execute()
-            
-            if not response.data:
-                return None
-            
-            return self._deserialize_job(response.data[0])
-            
+            while True:
+                response = (self.client.table("jobs")
+                            .select("id")
+                            .eq("is_active", False)
+                            .order("id")
+                            .range(offset, offset + page_size - 1)
+                            .execute())
+                rows = response.data or []
+                job_ids.update(row["id"] for row in rows)
+                if len(rows) < page_size:
+                    break
+                offset += page_size
         except Exception as e:
-            return None
-        
\ No newline at end of file
+            # Raised rather than returning a partial set, which callers would read as jobs reactivated
+            logger.error(f"Error fetching inactive job ids: {e}")
+            raise
+        return job_ids
+
+    def get_job_by_id(self, job_id: str) -> Optional[Job]:
+        jobs = self.get_jobs_by_ids([job_id])
+        return jobs[0] if jobs else None
+
+    def get_jobs_by_ids(self, job_ids: List[str], columns: str = JOB_COLUMNS) -> List[Job]:
+        """Fetch jobs in one request, returned in the order of job_ids.
+
+        Rows selected with the default columns go through the read-through job
+        cache (see database/job_cache.py); unknown ids are skipped.
+        """
+        # Deduplicate while keeping the caller's order
+        ordered_ids = list(dict.fromkeys(job_id for job_id in job_ids if job_id))
+        if not ordered_ids:
+            return []
+
+        use_cache = columns == JOB_COLUMNS
+        found: Dict[str, Job] = {}
+        versions: Dict[str, int] = {}
+
+        if use_cache:
+            found, versions = self.job_cache.get_many(ordered_ids)
+
+        missing_ids = [job_id for job_id in ordered_ids if job_id not in found]
+        fetched: List[Job] = []
+
+        for start in range(0, len(missing_ids), JOB_FETCH_CHUNK_SIZE):
+            chunk = missing_ids[start:start + JOB_FETCH_CHUNK_SIZE]
+            try:
+                response = self.client.table("jobs").select(columns).in_("id", chunk).execute()
+            except Exception as e:
+                logger.error(f"Error fetching {len(chunk)} jobs by id: {e}")
+                continue
+
+            for job_data in response.data or []:
+                job = self._deserialize_job(job_data)
+                found[job.id] = job
+                fetched.append(job)
+
+        if use_cache and fetched:
+            self.job_cache.set_many(fetched, versions)
+
+        return [found[job_id] for job_id in ordered_ids if job_id in found]
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return self.job_cache.get_stats()
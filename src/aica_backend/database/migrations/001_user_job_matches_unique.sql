@@ -0,0 +1,24 @@
+-- Enforce one match row per (user_id, job_id) so job matches can be saved with
+-- a single upsert (UserDatabase.save_job_matches_bulk) instead of a
+-- select-then-insert/update per match.
+--
+-- Run in the Supabase SQL editor. Existing duplicates are removed first,
+-- keeping the most recent row for each pair (same rule as
+-- scripts/cleanup_duplicate_matches.py). Rows without created_at count as oldest.
+
+DELETE FROM user_job_matches
+WHERE id IN (
+    SELECT id
+    FROM (
+        SELECT id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY user_id, job_id
+                   ORDER BY COALESCE(created_at, '-infinity') DESC, id::text DESC
+               ) AS row_number
+        FROM user_job_matches
+    ) ranked
+    WHERE ranked.row_number > 1
+);
+
+ALTER TABLE user_job_matches
+    ADD CONSTRAINT user_job_matches_user_id_job_id_key UNIQUE (user_id, job_id);
@@ -0,0 +1,65 @@
+-- Store a parsed resume in one round trip (UserDatabase.replace_user_resume_data)
+-- instead of clearing skills, education, experience and matches, inserting
+-- skills and reading-then-updating the profile in separate requests.
+--
+-- The function body runs in a single transaction, so a failed upload never
+-- leaves a user with cleared skills and no new ones.
+--
+-- Run in the Supabase SQL editor.
+--
+--   p_skills:  [{"skill_name", "skill_category", "confidence_score", "source"}, ...]
+--   p_profile: user_profiles columns to set (full_name, phone, ..., processing_step)
+--   p_clear_existing: also delete education, experience and job matches (replace mode)
+
+CREATE OR REPLACE FUNCTION replace_user_resume_data(
+    p_user_id uuid,
+    p_skills jsonb DEFAULT '[]'::jsonb,
+    p_profile jsonb DEFAULT '{}'::jsonb,
+    p_clear_existing boolean DEFAULT true
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_skill_count integer;
+BEGIN
+    IF p_clear_existing THEN
+        DELETE FROM user_education WHERE user_id = p_user_id;
+        DELETE FROM user_experience WHERE user_id = p_user_id;
+        DELETE FROM user_job_matches WHERE user_id = p_user_id;
+    END IF;
+
+    -- Resume skills always replace the previous ones
+    DELETE FROM user_skills WHERE user_id = p_user_id;
+
+    INSERT INTO user_skills (user_id, skill_name, skill_category, confidence_score, source)
+    SELECT p_user_id, s.skill_name, s.skill_category, s.confidence_score, COALESCE(s.source, 'resume')
+    FROM jsonb_to_recordset(COALESCE(p_skills, '[]'::jsonb))
+        AS s(skill_name text, skill_category text, confidence_score double precision, source text)
+    WHERE COALESCE(trim(s.skill_name), '') <> '';
+    GET DIAGNOSTICS v_skill_count = ROW_COUNT;
+
+    IF NOT EXISTS (SELECT 1 FROM user_profiles WHERE user_id = p_user_id) THEN
+        INSERT INTO user_profiles (user_id, resume_uploaded, resume_processed, profile_completed,
+                                   matches_generated, created_at, updated_at)
+        VALUES (p_user_id, false, false, false, false, now(), now());
+    END IF;
+
+    -- Keys missing from p_profile keep their current values
+    UPDATE user_profiles AS p
+    SET (full_name, phone, location, linkedin_url, experience_years, education_level,
+         resume_processed, profile_completed, processing_step, processing_error,
+         matches_generated, updated_at)
+      = (SELECT r.full_name, r.phone, r.location, r.linkedin_url, r.experience_years, r.education_level,
+                r.resume_processed, r.profile_completed, r.processing_step, r.processing_error,
+                r.matches_generated, now()
+         FROM jsonb_populate_record(p, COALESCE(p_profile, '{}'::jsonb)) AS r)
+    WHERE p.user_id = p_user_id;
+
+    RETURN jsonb_build_object('skills_saved', v_skill_count);
+END;
+$$;
+
+-- The function takes an arbitrary p_user_id, so only the backend's service role may call it
+REVOKE EXECUTE ON FUNCTION replace_user_resume_data(uuid, jsonb, jsonb, boolean) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION replace_user_resume_data(uuid, jsonb, jsonb, boolean) TO service_role;
@@ -141,6 +141,8 @@ class ResumeUploadResponse(BaseModel):
     message: str
     file_path: str
     processing_status: str
+    parse_task_id: Optional[str] = None
+    match_task_id: Optional[str] = None
 
 class SkillsResponse(BaseModel):
     technical_skills: List[str] = Field(default_factory=list)
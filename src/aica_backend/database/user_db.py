@@ -1,11 +1,12 @@
-import os
 import json
 import logging
 
-from typing import Optional, List, Dict, Any
-from supabase import create_client, Client
+from typing import Optional, List, Dict, Any, Set
+from supabase import Client
 from datetime import datetime
 
+from .client_registry import get_shared_client
+from utils.db_helpers import deserialize_json_field
 from .models.user_models import (
     User, UserProfile, UserSkill, UserSkillCreate,
     UserJobMatch, SkillsResponse, UserSavedJob
@@ -13,19 +14,14 @@ from .models.user_models import (
 
 logger = logging.getLogger(__name__)
 
+# Maximum rows sent in a single upsert request to PostgREST
+MATCH_UPSERT_CHUNK_SIZE = 200
+
 class UserDatabase:
 
     def __init__(self, client: Client = None):
-        if client is None:
-            url = os.getenv("SUPABASE_URL")
-            key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
-            
-            if not url or not key:
-                raise ValueError("Missing SUPABASE_URL or SUPABASE_KEY environment variables")
-                
-            self.client = create_client(url, key)
-        else:
-            self.client = client
+        # Default to the process-wide pooled client instead of a new connection per instance
+        self.client = client if client is not None else get_shared_client("service")
 
     def _handle_db_response(self, response, operation: str):
         if hasattr(response, 'error') and response.error:
@@ -118,10 +114,12 @@ class UserDatabase:
 
     def update_user_profile(self, user_id: str, update_data: dict) -> Optional[UserProfile]:
         try:
-            # Check if profile exists
-            existing_profile = self.get_user_profile(user_id)
+            # Update first; only a user without a profile row needs the insert
+            update_data["updated_at"] = datetime.now().isoformat()
+            response = self.client.table("user_profiles").update(update_data).eq("user_id", user_id).execute()
+            self._handle_db_response(response, "update user profile")
 
-            if not existing_profile:
+            if not response.data:
                 # Create profile if it doesn't exist
                 create_data = {
                     "user_id": user_id,
@@ -135,23 +133,13 @@ class UserDatabase:
                 # Merge with update data
                 create_data.update(update_data)
                 create_data["created_at"] = datetime.now().isoformat()
-                create_data["updated_at"] = datetime.now().isoformat()
 
                 response = self.client.table("user_profiles").insert(create_data).execute()
                 self._handle_db_response(response, "create user profile")
 
-                if response.data:
-                    return UserProfile(**response.data[0])
-                return None
-            else:
-                # Update existing profile
-                update_data["updated_at"] = datetime.now().isoformat()
-                response = self.client.table("user_profiles").update(update_data).eq("user_id", user_id).execute()
-                self._handle_db_response(response, "update user profile")
-
-                if response.data:
-                    return UserProfile(**response.data[0])
-                return None
+            if response.data:
+                return UserProfile(**response.data[0])
+            return None
         except Exception as e:
             raise ValueError(f"Failed to update user profile: {str(e)}")
 
@@ -219,6 +207,49 @@ class UserDatabase:
         except Exception as e:
             return []
 
+    def get_all_user_skill_names(self, page_size: int = 1000) -> Dict[str, List[str]]:
+        """Skill names of every user, keyed by user id (paged, for batch jobs)."""
+        skills_by_user: Dict[str, List[str]] = {}
+        offset = 0
+        try:
+            while True:
+                response = (self.client.table("user_skills")
+                            .select("user_id, skill_name")
+                            .order("id")
+                            .range(offset, offset + page_size - 1)
+                            .execute())
+                rows = response.data or []
+                for row in rows:
+                    skills_by_user.setdefault(row["user_id"], []).append(row["skill_name"])
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            logger.error(f"Error fetching skills of all users: {str(e)}")
+        return skills_by_user
+
+    def get_all_user_profiles(self, columns: str = "user_id, experience_years, location",
+                              page_size: int = 1000) -> Dict[str, Dict[str, Any]]:
+        """Selected profile columns of every user, keyed by user id (paged, for batch jobs)."""
+        profiles: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        try:
+            while True:
+                response = (self.client.table("user_profiles")
+                            .select(columns)
+                            .order("user_id")
+                            .range(offset, offset + page_size - 1)
+                            .execute())
+                rows = response.data or []
+                for row in rows:
+                    profiles[row["user_id"]] = row
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            logger.error(f"Error fetching profiles of all users: {str(e)}")
+        return profiles
+
     def get_user_skills_by_category(self, user_id: str, category: str) -> List[UserSkill]:
         try:
             response = (self.client.table("user_skills")
@@ -262,6 +293,40 @@ class UserDatabase:
             logger.error(f"Failed to clear experience for user {user_id}: {e}")
             return False
     
+    def replace_user_resume_data(self, user_id: str, skills: List[UserSkillCreate],
+                                 profile_updates: Dict[str, Any], clear_existing: bool = True) -> int:
+        """Replace a user's resume skills and profile fields in one request; returns skills saved.
+
+        Runs the replace_user_resume_data function from
+        database/migrations/002_replace_user_resume_data.sql, which deletes the
+        old skills (and, with clear_existing, education, experience and job
+        matches), inserts the new skills and updates the profile in one
+        transaction.
+        """
+        try:
+            response = self.client.rpc("replace_user_resume_data", self._resume_data_params(
+                user_id, skills, profile_updates, clear_existing
+            )).execute()
+            self._handle_db_response(response, "replace user resume data")
+            return (response.data or {}).get("skills_saved", 0)
+        except Exception as e:
+            raise ValueError(f"Failed to replace user resume data: {str(e)}")
+
+    @staticmethod
+    def _resume_data_params(user_id: str, skills: List[UserSkillCreate],
+                            profile_updates: Dict[str, Any], clear_existing: bool) -> Dict[str, Any]:
+        return {
+            "p_user_id": user_id,
+            "p_skills": [{
+                "skill_name": skill.skill_name,
+                "skill_category": skill.skill_category,
+                "confidence_score": skill.confidence_score,
+                "source": skill.source
+            } for skill in skills],
+            "p_profile": profile_updates,
+            "p_clear_existing": clear_existing
+        }
+    
     def save_job_match(self, user_id: str, job_id: str, match_score: float, matched_skills: List[str],
                        missing_critical_skills: List[str] = None, skill_coverage: float = 0.0,
                        confidence: str = "medium", ai_reasoning: str = "") -> UserJobMatch:
@@ -302,6 +367,55 @@ class UserDatabase:
         except Exception as e:
             raise ValueError(f"Failed to save job match: {str(e)}")
 
+    def save_job_matches_bulk(self, user_id: str, matches: List[Dict[str, Any]],
+                              chunk_size: int = MATCH_UPSERT_CHUNK_SIZE) -> List[UserJobMatch]:
+        """Upsert many job matches for a user, one request per chunk.
+
+        Relies on the unique (user_id, job_id) constraint from
+        database/migrations/001_user_job_matches_unique.sql.
+        """
+        if not matches:
+            return []
+
+        try:
+            # Collapse duplicate job_ids so one upsert statement never touches the same row twice
+            rows_by_job: Dict[str, Dict[str, Any]] = {}
+            for match in matches:
+                rows_by_job[match["job_id"]] = {
+                    "user_id": user_id,
+                    "job_id": match["job_id"],
+                    "match_score": match.get("match_score", 0.0),
+                    "matched_skills": json.dumps(match.get("matched_skills") or []),
+                    "missing_critical_skills": json.dumps(match.get("missing_critical_skills") or []),
+                    "skill_coverage": match.get("skill_coverage", 0.0),
+                    "confidence": match.get("confidence", "medium"),
+                    "ai_reasoning": match.get("ai_reasoning", "")
+                }
+            rows = list(rows_by_job.values())
+
+            saved = []
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                response = (self.client.table("user_job_matches")
+                            .upsert(chunk, on_conflict="user_id,job_id")
+                            .execute())
+                self._handle_db_response(response, "bulk save job matches")
+
+                for match_data in response.data or []:
+                    saved.append(self._parse_job_match(match_data))
+
+            logger.info(f"Upserted {len(saved)} job matches for user {user_id} in "
+                        f"{(len(rows) + chunk_size - 1) // chunk_size} request(s)")
+            return saved
+        except Exception as e:
+            raise ValueError(f"Failed to bulk save job matches: {str(e)}")
+
+    def _parse_job_match(self, match_data: Dict[str, Any]) -> UserJobMatch:
+        # Parse JSON fields (falls back to empty lists for malformed JSON)
+        match_data["matched_skills"] = deserialize_json_field(match_data, "matched_skills", [])
+        match_data["missing_critical_skills"] = deserialize_json_field(match_data, "missing_critical_skills", [])
+        return UserJobMatch(**match_data)
+
     def get_user_job_matches(self, user_id: str, limit: int = 50) -> List[UserJobMatch]:
         try:
             response = (self.client.table("user_job_matches")
@@ -331,6 +445,42 @@ class UserDatabase:
             logger.error(f"Error fetching job matches for user {user_id}: {str(e)}")
             return []
     
+    def get_matched_job_ids(self, user_id: str, page_size: int = 1000) -> Set[str]:
+        """Ids of every job the user already has a match for (paged, id column only)."""
+        job_ids: Set[str] = set()
+        offset = 0
+        try:
+            while True:
+                response = (self.client.table("user_job_matches")
+                            .select("job_id")
+                            .eq("user_id", user_id)
+                            .order("job_id")
+                            .range(offset, offset + page_size - 1)
+                            .execute())
+                rows = response.data or []
+                job_ids.update(row["job_id"] for row in rows)
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            logger.error(f"Error fetching matched job ids for user {user_id}: {str(e)}")
+        return job_ids
+
+    def get_user_job_match(self, user_id: str, job_id: str) -> Optional[UserJobMatch]:
+        """Return the stored match for one job, or None."""
+        try:
+            response = (self.client.table("user_job_matches")
+                        .select("*")
+                        .eq("user_id", user_id)
+                        .eq("job_id", job_id)
+                        .limit(1)
+                        .execute())
+            self._handle_db_response(response, "get user job match")
+            return self._parse_job_match(response.data[0]) if response.data else None
+        except Exception as e:
+            logger.error(f"Error fetching job match for user {user_id}, job {job_id}: {str(e)}")
+            return None
+
     def clear_job_matches(self, user_id: str) -> bool:
         try:
             response = self.client.table("user_job_matches").delete().eq("user_id", user_id).execute()
@@ -338,6 +488,18 @@ class UserDatabase:
         except Exception as e:
             return False
 
+    def delete_job_matches(self, user_id: str, job_ids: List[str]) -> bool:
+        """Delete the user's matches for the given jobs, one request per chunk."""
+        job_ids = list(dict.fromkeys(job_ids))
+        try:
+            for start in range(0, len(job_ids), MATCH_UPSERT_CHUNK_SIZE):
+                chunk = job_ids[start:start + MATCH_UPSERT_CHUNK_SIZE]
+                self.client.table("user_job_matches").delete().eq("user_id", user_id).in_("job_id", chunk).execute()
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting {len(job_ids)} job matches for user {user_id}: {str(e)}")
+            return False
+
     def get_user_stats(self, user_id: str) -> Dict[str, Any]:
         try:
             profile = self.get_user_profile(user_id)
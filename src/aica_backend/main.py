@@ -1,4 +1,5 @@
 import sys
+import asyncio
 import uvicorn
 import logging
 import os
@@ -33,12 +34,21 @@ from starlette.responses import JSONResponse
 from api.routes.auth import router as auth_router
 from api.routes.jobs import router as jobs_router
 from api.routes.resume_builder import router as resume_builder_router
+from database.client_registry import aclose_shared_clients
+from services.task_worker import TaskWorker
+from utils.pattern_registry import validate_patterns
+from utils.extraction_pool import get_extraction_pool
 
 # Rate limiting
 limiter = Limiter(key_func=get_remote_address)
 
 app = FastAPI(title="AICA Backend", version="1.0.0")
 
+# Background tasks run in this process unless TASK_WORKER_EMBEDDED=false, in which case
+# worker.py must be started on the same host (the task queue is a local SQLite file)
+EMBEDDED_WORKER = os.getenv("TASK_WORKER_EMBEDDED", "true").lower() == "true"
+_embedded_worker = None
+
 # Startup event for logging
 @app.on_event("startup")
 async def startup_event():
@@ -50,6 +60,9 @@ async def startup_event():
     logger.info("  - ANTHROPIC_API_KEY: %s", "SET" if os.getenv("ANTHROPIC_API_KEY") else "NOT SET")
     logger.info("  - SUPABASE_URL: %s", "SET" if os.getenv("SUPABASE_URL") else "NOT SET")
     
+    # Compile the resume fallback patterns now so a bad pattern shows at startup, not mid-upload
+    validate_patterns()
+    
     # Check FAISS index existence (but don't load it yet - lazy loading)
     faiss_path = Path(__file__).parent / "faiss_job_index" / "index.faiss"
     
@@ -60,9 +73,30 @@ async def startup_event():
         logger.info(f"FAISS index found ({faiss_path.stat().st_size / 1024 / 1024:.2f} MB)")
         logger.info("Will load FAISS on first job matching request (lazy loading)")
     
+    if EMBEDDED_WORKER:
+        from api.utils.background_tasks import TASK_HANDLERS
+        global _embedded_worker
+        _embedded_worker = TaskWorker(TASK_HANDLERS)
+        app.state.embedded_worker_task = asyncio.create_task(_embedded_worker.run())
+        logger.info("Embedded task worker started")
+    else:
+        logger.info("Background tasks are executed by worker.py")
+
     logger.info("Startup complete - Ready to serve requests")
     logger.info("="*60)
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _embedded_worker is not None:
+        _embedded_worker.stop()
+        await app.state.embedded_worker_task
+
+    # Release pooled Supabase connections held by the shared sync and async clients
+    await aclose_shared_clients()
+    # Stop the resume text extraction worker processes
+    get_extraction_pool().shutdown()
+    logger.info("AICA backend shut down")
+
 # Rate limiting setup
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
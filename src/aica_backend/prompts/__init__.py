@@ -1,6 +1,8 @@
 from .resume_prompts import (
     create_comprehensive_skills_prompt,
-    create_personal_info_prompt
+    create_personal_info_prompt,
+    create_combined_resume_prompt,
+    create_field_extraction_prompt
 )
 
 from .job_scraper_prompts import create_job_extraction_prompt
@@ -10,6 +12,8 @@ from .matching_prompts import create_ai_analysis_prompt
 __all__ = [
     'create_comprehensive_skills_prompt',
     'create_personal_info_prompt',
+    'create_combined_resume_prompt',
+    'create_field_extraction_prompt',
     'create_job_extraction_prompt',
     'create_ai_analysis_prompt',
 ]
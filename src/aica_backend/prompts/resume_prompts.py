@@ -1,11 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate
 
 
-def create_comprehensive_skills_prompt() -> ChatPromptTemplate:
-    return ChatPromptTemplate.from_messages([
-        (
-            "system",
-            """You are an expert resume parser focused on extracting ONLY the skills that the candidate has explicitly demonstrated or claimed to possess in their actual work experience, education, or skills sections.
+SKILLS_SYSTEM_PROMPT = """You are an expert resume parser focused on extracting ONLY the skills that the candidate has explicitly demonstrated or claimed to possess in their actual work experience, education, or skills sections.
             ⚠️ CRITICAL EXTRACTION RULES - READ CAREFULLY:
             
             ✅ EXTRACT SKILLS FROM THESE SECTIONS ONLY:
@@ -100,6 +96,46 @@ def create_comprehensive_skills_prompt() -> ChatPromptTemplate:
             - NO comments or descriptions
             - NO people's names in the skills list
             - Just the raw JSON object matching the schema"""
+
+PERSONAL_INFO_SYSTEM_PROMPT = """You are an expert at extracting personal and contact information from resumes of all styles and formats.
+
+            EXTRACTION PRIORITIES:
+            1. Full name (from the resume body, NOT from references section)
+            2. Contact information (phone, email, location)
+            3. Professional profiles (LinkedIn, GitHub)
+            
+            🚨 CRITICAL NAME EXTRACTION RULES:
+            - The applicant's name is usually on line 2-5 (after any reference headers)
+            - IGNORE any names in the first line if they have credentials (MBA, LPT, PhD, MD)
+            - First line with credentials like "Mary Jade Jakosalem, MBA, LPT" is likely a REFERENCE PERSON - SKIP IT
+            - Look for the FIRST proper name WITHOUT credentials attached
+            - Names may have unusual spacing (e.g., "BILLY M AGALO NA" = "Billy Magalona")
+            - The actual applicant's name is typically followed by a job title or contact info
+            
+            ⚠️ REFERENCE DETECTION:
+            Lines to SKIP when extracting names:
+            - Lines ending with ", MBA", ", LPT", ", PhD", ", MD" (these are references)
+            - Lines that appear BEFORE the actual resume content starts
+            - Names that appear after "Reference:", "Character Reference:", etc.
+            
+            ✅ CORRECT NAME EXTRACTION PATTERN:
+            1. Skip first line if it contains credentials (MBA, LPT, PhD, MD, etc.)
+            2. Look at lines 2-8 for the applicant's name
+            3. First proper name (2-4 capitalized words) WITHOUT credentials = applicant
+            4. Ignore all other names appearing later in the document
+            
+            CONTACT INFORMATION:
+            - Phone numbers in any format (+1, (555), 555-1234, etc.)
+            - Email addresses (any valid format)  
+            - Location/City (current residence or general area)
+            - LinkedIn URL (if present)"""
+
+
+def create_comprehensive_skills_prompt() -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages([
+        (
+            "system",
+            SKILLS_SYSTEM_PROMPT
         ),
         (
             "human",
@@ -146,38 +182,7 @@ def create_personal_info_prompt() -> ChatPromptTemplate:
     return ChatPromptTemplate.from_messages([
         (
             "system",
-            """You are an expert at extracting personal and contact information from resumes of all styles and formats.
-
-            EXTRACTION PRIORITIES:
-            1. Full name (from the resume body, NOT from references section)
-            2. Contact information (phone, email, location)
-            3. Professional profiles (LinkedIn, GitHub)
-            
-            🚨 CRITICAL NAME EXTRACTION RULES:
-            - The applicant's name is usually on line 2-5 (after any reference headers)
-            - IGNORE any names in the first line if they have credentials (MBA, LPT, PhD, MD)
-            - First line with credentials like "Mary Jade Jakosalem, MBA, LPT" is likely a REFERENCE PERSON - SKIP IT
-            - Look for the FIRST proper name WITHOUT credentials attached
-            - Names may have unusual spacing (e.g., "BILLY M AGALO NA" = "Billy Magalona")
-            - The actual applicant's name is typically followed by a job title or contact info
-            
-            ⚠️ REFERENCE DETECTION:
-            Lines to SKIP when extracting names:
-            - Lines ending with ", MBA", ", LPT", ", PhD", ", MD" (these are references)
-            - Lines that appear BEFORE the actual resume content starts
-            - Names that appear after "Reference:", "Character Reference:", etc.
-            
-            ✅ CORRECT NAME EXTRACTION PATTERN:
-            1. Skip first line if it contains credentials (MBA, LPT, PhD, MD, etc.)
-            2. Look at lines 2-8 for the applicant's name
-            3. First proper name (2-4 capitalized words) WITHOUT credentials = applicant
-            4. Ignore all other names appearing later in the document
-            
-            CONTACT INFORMATION:
-            - Phone numbers in any format (+1, (555), 555-1234, etc.)
-            - Email addresses (any valid format)  
-            - Location/City (current residence or general area)
-            - LinkedIn URL (if present)"""
+            PERSONAL_INFO_SYSTEM_PROMPT
         ),
         (
             "human",
@@ -198,3 +203,60 @@ def create_personal_info_prompt() -> ChatPromptTemplate:
             {format_instructions}"""
         ),
     ])
+
+
+def create_combined_resume_prompt() -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages([
+        (
+            "system",
+            "You have two jobs on the same resume: extract the applicant's personal information "
+            "and extract their skills. Follow both sets of rules below.\n\n"
+            "PART 1 - PERSONAL INFORMATION\n" + PERSONAL_INFO_SYSTEM_PROMPT +
+            "\n\nPART 2 - SKILLS\n" + SKILLS_SYSTEM_PROMPT
+        ),
+        (
+            "human",
+            """Extract the personal information AND the skills from this resume in ONE JSON object.
+
+            ⚠️ CRITICAL:
+            1. Take the applicant's name and contact details ONLY from the top of the resume (the first 10 lines), never from references
+            2. Skip a first line with credentials like "MBA, LPT, PhD, MD"
+            3. Email must be a SINGLE STRING, never an array
+            4. Skills follow the MANDATORY RULES: no certification/course/degree-only skills, no people's names
+            
+            {resume_text}
+            
+            OUTPUT FORMAT:
+            - ONLY valid JSON with "personal_info" and "skills" objects
+            - No markdown, no comments
+            
+            {format_instructions}"""
+        ),
+    ])
+
+
+def create_field_extraction_prompt() -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages([
+        (
+            "system",
+            """You fill in specific missing fields of a parsed resume. Extract ONLY the fields you are asked for.
+
+            RULES:
+            - full_name: the applicant's name from the top of the resume, never a reference person or a name followed by credentials (MBA, LPT, PhD, MD)
+            - email: a SINGLE STRING, never an array
+            - Skills: only skills listed in a skills section or actually used in experience or projects; never from certification, course, seminar or degree names; never people's names
+            - experience_years: total years of professional experience as an integer
+            - Use null (or [] for lists) when the resume does not contain the field; do not guess"""
+        ),
+        (
+            "human",
+            """Extract ONLY these fields:
+            {fields}
+            
+            {resume_text}
+            
+            OUTPUT FORMAT:
+            - ONLY a valid JSON object with exactly the keys listed above
+            - No markdown, no comments"""
+        ),
+    ])
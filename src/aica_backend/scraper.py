@@ -9,6 +9,7 @@ sys.path.insert(0, str(project_root))
 from core.job_scraper import JobScraper
 from database.job_db import JobDatabase
 from core.rag import TextEmbedder, VectorJobStore, JobIndexer
+from services.reverse_matching import ReverseMatchingService
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,6 +24,7 @@ async def main():
         vector_store = VectorJobStore(embedder)
         indexer = JobIndexer(vector_store)
     except Exception as e:
+        embedder = None
         vector_store = None
         indexer = None
 
@@ -62,7 +64,8 @@ async def main():
                     "skills": job.skills or [],
                     "requirements": job.requirements or [],
                     "source": job.source,
-                    "url": job.url
+                    "url": job.url,
+                    "posted_date": job.created_at.isoformat() if job.created_at else ""
                 }
                 saved_jobs_for_indexing.append(job_dict)
                 
@@ -86,6 +89,16 @@ async def main():
                         logger.error(f"Failed to mark job {job_dict['job_id']} as indexed: {e}")
                 
                 logger.info(f"Marked {indexed_count} jobs as indexed in database")
+
+            # Let existing users know about the new jobs without a matching pass per user
+            new_job_ids = set(stats.get('indexed_job_ids', []))
+            new_jobs = [job_dict for job_dict in saved_jobs_for_indexing if job_dict['job_id'] in new_job_ids]
+            if new_jobs:
+                try:
+                    reverse_matcher = ReverseMatchingService(embedder=embedder)
+                    await reverse_matcher.match_new_jobs(new_jobs)
+                except Exception as e:
+                    logger.error(f"Reverse matching failed: {e}")
                 
         except Exception as e:
             logger.error(f"Indexing failed: {e}")
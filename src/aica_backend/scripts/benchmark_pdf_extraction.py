@@ -0,0 +1,106 @@
+"""
+PDF Extraction Benchmark
+
+Extracts every PDF in a resume folder (the same resumes folder
+test_resume_extraction.py reads) with each installed PDF backend and reports
+pages per second and text fidelity against a reference backend: word-level
+similarity of the extracted text, and whether the email and phone number the
+fallback extractors find are the same.
+"""
+import sys
+import time
+import statistics
+from pathlib import Path
+from difflib import SequenceMatcher
+from typing import Dict, List
+
+# Add parent directory to path to import from core
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.file_utils import extract_pdf_pages, pdf_backend_order
+from utils.pattern_utils import extract_email, extract_phone
+
+
+def extract_timed(file_content: bytes, backend: str, runs: int) -> Dict:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        # Only the chosen backend; a failure here is reported instead of falling back
+        pages = extract_pdf_pages(file_content, backend=backend, fallback=False)
+        timings.append(time.perf_counter() - start)
+    return {"pages": pages, "seconds": statistics.median(timings)}
+
+
+def word_similarity(reference: str, candidate: str) -> float:
+    return SequenceMatcher(None, reference.split(), candidate.split(), autojunk=False).ratio()
+
+
+def benchmark(files: List[Path], reference: str, runs: int) -> None:
+    backends = pdf_backend_order(reference)
+    totals = {backend: {"pages": 0, "seconds": 0.0, "similarity": [], "contact_mismatches": 0, "failures": 0}
+              for backend in backends}
+
+    print(f"\n{'='*80}")
+    print(f"PDF EXTRACTION BENCHMARK ({len(files)} files, backends: {', '.join(backends)}, reference: {backends[0]})")
+    print(f"{'='*80}\n")
+
+    for file_path in files:
+        file_content = file_path.read_bytes()
+        results = {}
+        for backend in backends:
+            try:
+                results[backend] = extract_timed(file_content, backend, runs)
+            except Exception as e:
+                totals[backend]["failures"] += 1
+                print(f"  {file_path.name}: {backend} failed: {e}")
+
+        if backends[0] not in results:
+            continue
+        reference_text = "\n".join(results[backends[0]]["pages"])
+        reference_contact = (extract_email(reference_text), extract_phone(reference_text))
+
+        print(f"  {file_path.name}")
+        for backend, result in results.items():
+            text = "\n".join(result["pages"])
+            page_count = len(result["pages"])
+            similarity = word_similarity(reference_text, text)
+            contact_matches = (extract_email(text), extract_phone(text)) == reference_contact
+
+            totals[backend]["pages"] += page_count
+            totals[backend]["seconds"] += result["seconds"]
+            totals[backend]["similarity"].append(similarity)
+            totals[backend]["contact_mismatches"] += 0 if contact_matches else 1
+
+            print(f"    {backend:<10} {page_count:3d} pages  {result['seconds'] * 1000:8.1f} ms  "
+                  f"similarity {similarity:.3f}  contact {'same' if contact_matches else 'DIFFERENT'}")
+        print()
+
+    print(f"{'='*80}")
+    print("SUMMARY")
+    print(f"{'='*80}")
+    for backend, total in totals.items():
+        pages_per_second = total["pages"] / total["seconds"] if total["seconds"] else 0.0
+        similarity = statistics.mean(total["similarity"]) if total["similarity"] else 0.0
+        print(f"  {backend:<10} {pages_per_second:8.1f} pages/sec  mean similarity {similarity:.3f}  "
+              f"contact mismatches {total['contact_mismatches']}  failures {total['failures']}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    default_dir = Path(__file__).parent.parent.parent.parent / "resumes"
+
+    parser = argparse.ArgumentParser(description='Benchmark PDF text extraction backends on resume files')
+    parser.add_argument('paths', nargs='*', help=f'PDF files or folders (defaults to {default_dir})')
+    parser.add_argument('--reference', default='pypdf2', help='Backend the others are compared against')
+    parser.add_argument('--runs', type=int, default=3, help='Timed runs per file (median is reported)')
+    args = parser.parse_args()
+
+    files = []
+    for path in map(Path, args.paths or [default_dir]):
+        files.extend(sorted(path.glob("*.pdf")) if path.is_dir() else [path])
+    if not files:
+        print("No PDF files found")
+        sys.exit(1)
+
+    benchmark(files, args.reference, args.runs)
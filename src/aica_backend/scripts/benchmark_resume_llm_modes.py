@@ -0,0 +1,120 @@
+"""
+Resume LLM Mode Benchmark
+
+Runs the resume LLM step in "dual" mode (separate personal info and skills
+requests) and "combined" mode (one request for both) on the same resume
+texts, and reports latency, LLM calls and tokens per resume, plus how far the
+two modes agree on the name, email and skills. Requires ANTHROPIC_API_KEY.
+"""
+import sys
+import time
+import asyncio
+import statistics
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory to path to import from core
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.resume.parser import ResumeParser, LLM_MODES
+from utils.file_utils import extract_text_from_file
+from utils.text_cleaner import TextCleaner
+
+MIME_TYPES = {
+    '.pdf': 'application/pdf',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.doc': 'application/msword'
+}
+
+
+def load_resume_texts(files: List[Path]) -> Dict[str, str]:
+    texts = {}
+    for file_path in files:
+        mime_type = MIME_TYPES.get(file_path.suffix.lower())
+        if mime_type:
+            texts[file_path.name] = TextCleaner.clean_text(extract_text_from_file(file_path.read_bytes(), mime_type))
+        else:
+            texts[file_path.name] = TextCleaner.clean_text(file_path.read_text(encoding='utf-8', errors='ignore'))
+    return texts
+
+
+def skill_overlap(first: List[str], second: List[str]) -> float:
+    first_set, second_set = {skill.lower() for skill in first}, {skill.lower() for skill in second}
+    if not first_set and not second_set:
+        return 1.0
+    return len(first_set & second_set) / len(first_set | second_set)
+
+
+async def run_mode(mode: str, texts: Dict[str, str]) -> Dict[str, Dict]:
+    parser = ResumeParser(llm_mode=mode)
+    results = {}
+    for name, text in texts.items():
+        usage_before = dict(parser.llm_usage)
+        failures_before = parser._llm_failures
+        start = time.perf_counter()
+        personal_info, skills = await parser._extract_info_and_skills(text)
+        results[name] = {
+            "seconds": time.perf_counter() - start,
+            "calls": parser.llm_usage["calls"] - usage_before["calls"],
+            "input_tokens": parser.llm_usage["input_tokens"] - usage_before["input_tokens"],
+            "output_tokens": parser.llm_usage["output_tokens"] - usage_before["output_tokens"],
+            "failed": parser._llm_failures > failures_before,
+            "personal_info": personal_info,
+            "skills": skills
+        }
+    return results
+
+
+async def benchmark(files: List[Path]) -> None:
+    if ResumeParser().llm is None:
+        print("ANTHROPIC_API_KEY is not set; both modes would use the local fallback")
+        sys.exit(1)
+
+    texts = load_resume_texts(files)
+    results = {mode: await run_mode(mode, texts) for mode in LLM_MODES}
+
+    print(f"\n{'='*80}")
+    print(f"RESUME LLM MODE BENCHMARK ({len(texts)} resumes)")
+    print(f"{'='*80}\n")
+
+    for name in texts:
+        print(f"  {name}")
+        for mode in LLM_MODES:
+            result = results[mode][name]
+            print(f"    {mode:<9} {result['seconds']:6.2f} s  {result['calls']} calls  "
+                  f"{result['input_tokens']:6d} in / {result['output_tokens']:5d} out tokens"
+                  f"{'  (LLM error, fell back)' if result['failed'] else ''}")
+        dual, combined = results["dual"][name], results["combined"][name]
+        print(f"    agreement: name {'same' if dual['personal_info'].full_name == combined['personal_info'].full_name else 'DIFFERENT'}, "
+              f"email {'same' if dual['personal_info'].email == combined['personal_info'].email else 'DIFFERENT'}, "
+              f"technical skills {skill_overlap(dual['skills'].technical_skills, combined['skills'].technical_skills):.2f}, "
+              f"soft skills {skill_overlap(dual['skills'].soft_skills, combined['skills'].soft_skills):.2f}\n")
+
+    print(f"{'='*80}")
+    print("SUMMARY (median per resume)")
+    print(f"{'='*80}")
+    for mode in LLM_MODES:
+        mode_results = list(results[mode].values())
+        print(f"  {mode:<9} {statistics.median(r['seconds'] for r in mode_results):6.2f} s  "
+              f"{statistics.median(r['calls'] for r in mode_results):.0f} calls  "
+              f"{statistics.median(r['input_tokens'] for r in mode_results):.0f} in / "
+              f"{statistics.median(r['output_tokens'] for r in mode_results):.0f} out tokens")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    default_dir = Path(__file__).parent.parent.parent.parent / "resumes"
+
+    parser = argparse.ArgumentParser(description='Compare dual and combined LLM resume extraction')
+    parser.add_argument('paths', nargs='*', help=f'Resume files (PDF, DOCX or text) or folders (defaults to {default_dir})')
+    args = parser.parse_args()
+
+    files = []
+    for path in map(Path, args.paths or [default_dir]):
+        files.extend(sorted(p for p in path.iterdir() if p.is_file()) if path.is_dir() else [path])
+    if not files:
+        print("No resume files found")
+        sys.exit(1)
+
+    asyncio.run(benchmark(files))
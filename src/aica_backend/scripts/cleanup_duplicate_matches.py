@@ -20,7 +20,11 @@ logger = logging.getLogger(__name__)
 
 
 def cleanup_duplicate_matches():
-    """Remove duplicate job matches, keeping only the most recent one for each user+job combination"""
+    """Remove duplicate job matches, keeping only the most recent one for each user+job combination.
+
+    Only needed for databases that predate database/migrations/001_user_job_matches_unique.sql;
+    once the unique (user_id, job_id) constraint is in place duplicates can no longer be created.
+    """
     try:
         db = UserDatabase()
         
@@ -90,6 +94,7 @@ def cleanup_duplicate_matches():
         
         logger.info(f"\n✅ Cleanup complete! Deleted {deleted_count} duplicate records.")
         logger.info(f"📊 Database now has {len(all_matches) - deleted_count} unique job matches")
+        logger.info("💡 Apply database/migrations/001_user_job_matches_unique.sql to prevent new duplicates")
         
     except Exception as e:
         logger.error(f"❌ Error during cleanup: {e}")
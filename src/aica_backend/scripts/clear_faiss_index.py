@@ -31,6 +31,7 @@ def clear_faiss_index():
         persist_path = "./faiss_job_index"
         faiss_file = f"{persist_path}.faiss"
         pkl_file = f"{persist_path}.pkl"
+        keyword_file = f"{persist_path}.bm25"
         
         if os.path.exists(faiss_file):
             os.remove(faiss_file)
@@ -40,6 +41,10 @@ def clear_faiss_index():
             os.remove(pkl_file)
             logger.info(f"🗑️  Deleted {pkl_file}")
         
+        if os.path.exists(keyword_file):
+            os.remove(keyword_file)
+            logger.info(f"🗑️  Deleted {keyword_file}")
+        
         # Check if persist_path is a directory and remove it
         if os.path.isdir(persist_path):
             shutil.rmtree(persist_path)
@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 logger.info(f"Loading .env from: {env_path}")
 logger.info(f".env exists: {env_path.exists()}")
 
-from core.rag import TextEmbedder, VectorJobStore 
+from core.rag import TextEmbedder, VectorJobStore, KeywordIndex
 from database.job_db import JobDatabase
 
 
@@ -27,6 +27,7 @@ async def index_all_jobs():
         logger.info("Initializing embedder and vector store...")
         embedder = TextEmbedder()
         vector_store = VectorJobStore(embedder)
+        keyword_index = KeywordIndex(vector_store.persist_path)
         db = JobDatabase()
         
         # Get all jobs for indexing (in batches)
@@ -71,10 +72,13 @@ async def index_all_jobs():
                     "title": job.title,
                     "company": job.company,
                     "location": job.location,
+                    "source": job.source,
+                    "posted_date": job.created_at.isoformat() if job.created_at else "",
                 }
                 
                 # Add to vector store
                 vector_store.add_job(job.id, job_content, metadata)
+                keyword_index.add_job(job.id, job.title, job.skills, job.requirements)
                 indexed_count += 1
                 
                 if i % 50 == 0:
@@ -87,6 +91,7 @@ async def index_all_jobs():
         # Save the vector store
         logger.info("Saving vector store to disk...")
         vector_store.save()
+        keyword_index.save()
         
         return indexed_count, failed_count
         
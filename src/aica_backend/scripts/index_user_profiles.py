@@ -0,0 +1,40 @@
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+env_path = Path(__file__).resolve().parent.parent.parent.parent / '.env'
+load_dotenv(env_path)
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+from services.reverse_matching import ReverseMatchingService
+from database.client_registry import aclose_shared_clients
+
+
+async def index_all_user_profiles():
+    """Rebuild the user profile index used to match newly scraped jobs to users."""
+    try:
+        logger.info("Initializing embedder and user profile store...")
+        service = ReverseMatchingService()
+
+        indexed_count = await service.rebuild_user_index()
+        logger.info(f"Indexed {indexed_count} user profiles ({service.user_store.get_stats()})")
+        return indexed_count
+
+    except Exception as e:
+        logger.error(f"User profile indexing failed: {e}")
+        raise
+    finally:
+        await aclose_shared_clients()
+
+
+if __name__ == "__main__":
+    asyncio.run(index_all_user_profiles())
@@ -84,10 +84,11 @@ class ResumeExtractionTester:
             }
             file_type = mime_type_map.get(extension, 'application/pdf')
             
-            # Parse resume
+            # Parse resume (bypassing the parse cache so extraction changes are always exercised)
             parsed_resume: ParsedResume = await self.parser.parse_resume_from_file(
                 file_content, 
-                file_type
+                file_type,
+                use_cache=False
             )
             
             result = {
@@ -1,14 +1,17 @@
+import os
+import time
 import logging
 import asyncio
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Iterable, List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
 
-from database.user_db import UserDatabase
-from database.job_db import JobDatabase
+from database.async_user_db import AsyncUserDatabase
+from database.async_job_db import AsyncJobDatabase
 from database.models.user_models import UserSkill, UserJobMatch
 from database.models.job_models import Job
-from core.rag import TextEmbedder, JobSearcher, UserContext
-from core.matching import JobMatcher
+from core.rag import TextEmbedder, JobSearcher, UserContext, VectorSearchFilter
+from core.matching import JobMatcher, SkillJobIndex
+from services.user_profiles import UserProfileService
 
 logger = logging.getLogger(__name__)
 
@@ -35,27 +38,22 @@ class JobMatchingService:
             job_id: The job's ID
             is_recommendation: Whether this is a recommended job (fallback) vs a real match
         """
-        return self.user_db.save_user_job(user_id, job_id, is_recommendation=is_recommendation)
+        return await self.user_db.save_user_job(user_id, job_id, is_recommendation=is_recommendation)
 
     async def remove_user_saved_job(self, user_id: str, job_id: str):
-        return self.user_db.remove_user_saved_job(user_id, job_id)
+        return await self.user_db.remove_user_saved_job(user_id, job_id)
 
     async def get_user_saved_jobs(self, user_id: str, limit: int = 50):
-        saved_jobs = self.user_db.get_user_saved_jobs(user_id, limit)
-        jobs = []
-        for saved in saved_jobs:
-            job = self.job_db.get_job_by_id(saved.job_id)
-            if job:
-                jobs.append(job)
-        return jobs
+        saved_jobs = await self.user_db.get_user_saved_jobs(user_id, limit)
+        return await self.job_db.get_jobs_by_ids([saved.job_id for saved in saved_jobs])
     
-    def __new__(cls, user_db: UserDatabase = None, job_db: JobDatabase = None):
+    def __new__(cls, user_db: AsyncUserDatabase = None, job_db: AsyncJobDatabase = None):
         """Singleton pattern - return existing instance if available."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
     
-    def __init__(self, user_db: UserDatabase = None, job_db: JobDatabase = None):
+    def __init__(self, user_db: AsyncUserDatabase = None, job_db: AsyncJobDatabase = None):
         """Initialize heavy components only once."""
         # Skip if already initialized
         if self._initialized:
@@ -63,8 +61,9 @@ class JobMatchingService:
             
         logger.info("🔧 Initializing JobMatchingService (singleton)")
         
-        self.user_db = user_db or UserDatabase()
-        self.job_db = job_db or JobDatabase()
+        # Async data layer so database round trips never block the event loop
+        self.user_db = user_db or AsyncUserDatabase()
+        self.job_db = job_db or AsyncJobDatabase()
         
         # Initialize embedder once
         logger.info("📦 Loading sentence transformer model...")
@@ -75,6 +74,7 @@ class JobMatchingService:
             from core.rag import VectorJobStore
             vector_store = VectorJobStore(self.embedder)
             self.rag_searcher = JobSearcher(vector_store)
+            self.profile_service = UserProfileService(self.embedder, user_db=self.user_db)
             self.use_rag = True
             logger.info("✅ RAG searcher initialized - will use semantic search")
         except Exception as e:
@@ -93,14 +93,30 @@ class JobMatchingService:
         self.INITIAL_RANKING_THRESHOLD = 0.01  # Very low threshold for initial ranking - let AI decide
         self.HIGH_CONFIDENCE_THRESHOLD = 0.75
         self.MEDIUM_CONFIDENCE_THRESHOLD = 0.55
+
+        # Incremental updates after single skill edits (see update_matches_for_skill_change)
+        self.INCREMENTAL_MAX_AI_CALLS = 15
+        self.SKILL_INDEX_TTL = float(os.getenv("SKILL_INDEX_TTL", "600"))
+        self._skill_index: Optional[SkillJobIndex] = None
+        self._indexed_jobs: Dict[str, Job] = {}
+        
+        # Streamed matching (see stream_matches_for_user): candidates shown (and analyzed, and saved),
+        # and how many reasoning calls run at a time
+        self.STREAM_MAX_AI_CALLS = int(os.getenv("MATCH_STREAM_MAX_AI_CALLS", "15"))
+        self.STREAM_AI_CONCURRENCY = int(os.getenv("MATCH_STREAM_AI_CONCURRENCY", "5"))
+        
+        # Jobs deactivated after indexing, mirrored into the vector store's active flags
+        self.INACTIVE_JOBS_TTL = float(os.getenv("INACTIVE_JOBS_TTL", "300"))
+        self._inactive_job_ids: Set[str] = set()
+        self._inactive_synced_at = 0.0
         
         # Mark as initialized
         JobMatchingService._initialized = True
         logger.info("✅ JobMatchingService initialized successfully")
 
-    def get_combined_user_skills(self, user_id: str) -> List[UserSkill]:
+    async def get_combined_user_skills(self, user_id: str) -> List[UserSkill]:
         # Get all skills from database (includes both resume-uploaded and manually entered)
-        all_skills = self.user_db.get_user_skills(user_id)
+        all_skills = await self.user_db.get_user_skills(user_id)
 
         # Group by skill name to avoid duplicates, keeping the one with higher confidence
         skill_map = {}
@@ -115,60 +131,95 @@ class JobMatchingService:
 
         return list(skill_map.values())
 
-    async def find_job_matches(self, user_id: str, limit: int = 20) -> List[JobMatchResult]:
+    async def find_job_matches(
+        self,
+        user_id: str,
+        limit: int = 20,
+        exclude_job_ids: Optional[Set[str]] = None
+    ) -> List[JobMatchResult]:
+        """
+        Best new matches for a user. Jobs in exclude_job_ids (e.g. already
+        matched) are left out of the vector search itself, so they are never
+        hydrated or sent to the LLM.
+        """
         try:
             # Get combined user skills (resume + manual entry)
-            user_skills = self.get_combined_user_skills(user_id)
+            user_skills = await self.get_combined_user_skills(user_id)
             if not user_skills:
                 return []
 
             # RAG Semantic Search
             if self.use_rag and self.rag_searcher:
-                return await self._find_matches_with_rag(user_id, user_skills, limit)
+                return await self._find_matches_with_rag(user_id, user_skills, limit, exclude_job_ids)
 
         except Exception as e:
             logger  .error(f"Error in job matching for user {user_id}: {str(e)}")
             return []
     
+    async def _retrieve_rag_candidates(
+        self,
+        user_id: str,
+        user_skills: List[UserSkill],
+        limit: int,
+        exclude_job_ids: Optional[Set[str]] = None
+    ) -> List[Job]:
+        """Active jobs closest to the user's profile vector, in retrieval order (about limit * 3)."""
+        # Build user context for RAG search
+        skill_names = [skill.skill_name for skill in user_skills]
+        user_profile = await self.user_db.get_user_profile(user_id)
+        
+        context = UserContext(
+            skills=skill_names,
+            experience_years=user_profile.experience_years if user_profile else None,
+            preferred_locations=[user_profile.location] if user_profile and user_profile.location else []
+        )
+        
+        # Inactive and excluded jobs are dropped inside the vector search, not after it
+        await self._sync_inactive_jobs()
+        search_filter = VectorSearchFilter(active_only=True, exclude_job_ids=exclude_job_ids)
+        
+        # Search with the stored profile vector when it is current, otherwise embed query text
+        profile_vector = await self.profile_service.get_user_vector(user_id, skill_names, user_profile)
+        if profile_vector:
+            rag_matches = self.rag_searcher.search_jobs_by_vector(
+                profile_vector,
+                top_k=limit * 3,  # Get more candidates for AI analysis
+                score_threshold=0.3,
+                filters=search_filter
+            )
+        else:
+            rag_matches = self.rag_searcher.search_jobs(
+                context=context,
+                top_k=limit * 3,  # Get more candidates for AI analysis
+                use_multi_query=True,  # Use multiple query strategies
+                score_threshold=0.3,
+                filters=search_filter
+            )
+        
+        if exclude_job_ids:
+            # Stores without attribute filtering return excluded jobs; drop them before hydration
+            rag_matches = [match for match in rag_matches if match.get("job_id") not in exclude_job_ids]
+        
+        if not rag_matches:
+            logger.info("No matches from RAG search")
+            return []
+        
+        # Convert RAG matches to Job objects (single batched query, RAG order preserved)
+        return await self.job_db.get_jobs_by_ids([match.get("job_id") for match in rag_matches])
+
     async def _find_matches_with_rag(
         self, 
         user_id: str, 
         user_skills: List[UserSkill], 
-        limit: int
+        limit: int,
+        exclude_job_ids: Optional[Set[str]] = None
     ) -> List[JobMatchResult]:
 
         try:
-            # Build user context for RAG search
-            skill_names = [skill.skill_name for skill in user_skills]
-            user_profile = self.user_db.get_user_profile(user_id)
-            
-            context = UserContext(
-                skills=skill_names,
-                experience_years=user_profile.experience_years if user_profile else None,
-                preferred_locations=[user_profile.location] if user_profile and user_profile.location else []
-            )
-            
-            # Use RAG semantic search
-            rag_matches = self.rag_searcher.search_jobs(
-                context=context,
-                top_k=limit * 3,  # Get more candidates for AI analysis
-                use_multi_query=True,  # Use multiple query strategies
-                score_threshold=0.3
-            )
-            
-            if not rag_matches:
-                logger.info("No matches from RAG search")
+            candidate_jobs = await self._retrieve_rag_candidates(user_id, user_skills, limit, exclude_job_ids)
+            if not candidate_jobs:
                 return []
             
-            # Convert RAG matches to Job objects
-            candidate_jobs = []
-            for match in rag_matches:
-                job_id = match.get("job_id")
-                if job_id:
-                    job = self.job_db.get_job_by_id(job_id)
-                    if job:
-                        candidate_jobs.append(job)
-            
             # Prepare user context for AI analysis
             user_context = self._prepare_user_skill_context(user_skills)
             ai_matches = []
@@ -215,7 +266,7 @@ class JobMatchingService:
         """
         try:
             # Get ALL jobs available for matching
-            jobs = self.job_db.get_jobs_for_matching(limit=1000)
+            jobs = await self.job_db.get_jobs_for_matching(limit=1000)
             if not jobs:
                 return []
 
@@ -507,25 +558,23 @@ class JobMatchingService:
             )
 
     async def save_job_matches(self, user_id: str, matches: List[JobMatchResult]) -> List[UserJobMatch]:
-        saved_matches = []
+        if not matches:
+            return []
 
         try:
-            for match in matches:
-                try:
-                    user_job_match = self.user_db.save_job_match(
-                        user_id=user_id,
-                        job_id=match.job.id,
-                        match_score=match.match_score,
-                        matched_skills=match.matched_skills,
-                        missing_critical_skills=match.missing_critical_skills,
-                        skill_coverage=match.skill_coverage,
-                        confidence=match.confidence,
-                        ai_reasoning=match.ai_reasoning
-                    )
-                    saved_matches.append(user_job_match)
-                except Exception as e:
-                    logger.error(f"Error saving AI match for job {match.job.id}: {str(e)}")
-                    continue
+            rows = [
+                {
+                    "job_id": match.job.id,
+                    "match_score": match.match_score,
+                    "matched_skills": match.matched_skills,
+                    "missing_critical_skills": match.missing_critical_skills,
+                    "skill_coverage": match.skill_coverage,
+                    "confidence": match.confidence,
+                    "ai_reasoning": match.ai_reasoning
+                }
+                for match in matches
+            ]
+            saved_matches = await self.user_db.save_job_matches_bulk(user_id, rows)
 
             logger.info(f"Saved {len(saved_matches)} AI-analyzed job matches for user {user_id}")
             return saved_matches
@@ -536,15 +585,14 @@ class JobMatchingService:
 
     async def update_matches_for_user(self, user_id: str) -> Dict[str, any]:
         try:
-            # Get existing matches to avoid duplicates (keep previous matches!)
-            existing_matches = self.user_db.get_user_job_matches(user_id, limit=1000)  # Get all existing
-            existing_job_ids = {m.job_id for m in existing_matches} if existing_matches else set()
+            # Existing matches are kept and excluded from retrieval, so only new jobs are analyzed
+            existing_job_ids = await self.user_db.get_matched_job_ids(user_id)
             
             logger.info(f"User {user_id} has {len(existing_job_ids)} existing matches")
             
             # Find AI-powered matches
             logger.info(f"📋 Calling find_job_matches for user {user_id}")
-            matches = await self.find_job_matches(user_id, limit=50)  # Find up to 50 potential matches
+            matches = await self.find_job_matches(user_id, limit=50, exclude_job_ids=existing_job_ids)  # Find up to 50 potential matches
             logger.info(f"📦 find_job_matches returned {len(matches)} matches for user {user_id}")
             
             if not matches:
@@ -615,3 +663,301 @@ class JobMatchingService:
                 "total_matches_now": 0,
                 "ai_analysis": "AI matching workflow failed"
             }
+
+    async def stream_matches_for_user(self, user_id: str, limit: int = 50) -> AsyncIterator[Tuple[str, Dict[str, any]]]:
+        """
+        Streaming variant of update_matches_for_user, yielding (event, data) pairs.
+
+        "candidates" comes first, as soon as retrieval is done: the top
+        STREAM_MAX_AI_CALLS new jobs (at most limit) in retrieval order with
+        their deterministic scores (the fields stored in user_job_matches,
+        without reasoning). Each then gets AI reasoning, STREAM_AI_CONCURRENCY
+        calls at a time, and is saved and sent as a "match" event when its
+        call completes, so the candidates are exactly the jobs that will be
+        stored unless their reasoning call fails. Like
+        update_matches_for_skill_change, a new match is only stored once it has
+        reasoning. "summary" closes the stream. If the consumer stops reading,
+        the pending reasoning calls are cancelled; matches already sent as
+        "match" events are saved.
+        """
+        existing_job_ids = await self.user_db.get_matched_job_ids(user_id)
+        user_skills = await self.get_combined_user_skills(user_id)
+        user_skill_names = [skill.skill_name for skill in user_skills]
+
+        if self.use_rag and self.rag_searcher:
+            candidate_jobs = await self._retrieve_rag_candidates(user_id, user_skills, limit, existing_job_ids) if user_skills else []
+        else:
+            jobs = await self.job_db.get_jobs_for_matching(limit=1000) if user_skills else []
+            jobs = [job for job in jobs if job.id not in existing_job_ids]
+            candidate_jobs = (await self._rank_all_jobs_by_relevance(user_skills, jobs))[:limit * 3] if jobs else []
+
+        jobs_by_id = {}
+        rows = []
+        for job in candidate_jobs:
+            if job.id in existing_job_ids or job.id in jobs_by_id:
+                continue
+            row = self._score_job(user_skill_names, job)
+            if row["match_score"] >= self.MINIMUM_MATCH_SCORE:
+                jobs_by_id[job.id] = job
+                rows.append(row)
+        # Only candidates that will be analyzed and saved are shown, so the stream matches /matches afterwards
+        rows = rows[:min(limit, self.STREAM_MAX_AI_CALLS)]
+
+        logger.info(f"📡 Streaming {len(rows)} candidates for user {user_id}")
+        yield "candidates", {
+            "candidates": [
+                self._stream_match_payload(jobs_by_id[row["job_id"]], row, rank=rank)
+                for rank, row in enumerate(rows)
+            ],
+            "existing_matches": len(existing_job_ids)
+        }
+
+        semaphore = asyncio.Semaphore(self.STREAM_AI_CONCURRENCY)
+
+        async def reason(row: Dict[str, any]) -> Tuple[Dict[str, any], Optional[str]]:
+            async with semaphore:
+                return row, await self._generate_match_reasoning(user_skill_names, jobs_by_id[row["job_id"]], row)
+
+        tasks = [asyncio.create_task(reason(row)) for row in rows]
+        saved_rows = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                row, reasoning = await next_done
+                saved = []
+                if reasoning:
+                    row["ai_reasoning"] = reasoning
+                    saved = await self.user_db.save_job_matches_bulk(
+                        user_id, [{key: value for key, value in row.items() if key != "_scores"}]
+                    )
+                if saved:
+                    saved_rows.append(row)
+                yield "match", {
+                    **self._stream_match_payload(jobs_by_id[row["job_id"]], row),
+                    "ai_reasoning": reasoning,
+                    "saved": bool(saved)
+                }
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        logger.info(f"✅ Streamed matching for user {user_id}: {len(saved_rows)} of {len(rows)} candidates saved")
+        yield "summary", {
+            "success": True,
+            "message": f"Added {len(saved_rows)} new job matches",
+            "matches_found": len(rows),
+            "matches_saved": len(saved_rows),
+            "existing_matches": len(existing_job_ids),
+            "total_matches_now": len(existing_job_ids) + len(saved_rows),
+            "average_score": sum(row["match_score"] for row in saved_rows) / len(saved_rows) if saved_rows else 0,
+            "high_confidence_matches": len([row for row in saved_rows if row["confidence"] == "high"]),
+            "top_match_score": max((row["match_score"] for row in saved_rows), default=0)
+        }
+
+    @staticmethod
+    def _stream_match_payload(job: Job, row: Dict[str, any], **extra: any) -> Dict[str, any]:
+        return {
+            "job_id": job.id,
+            "job_title": job.title,
+            "company": job.company,
+            "location": job.location or "Not specified",
+            "job_url": job.url,
+            "match_score": row["match_score"],
+            "matched_skills": row["matched_skills"],
+            "missing_critical_skills": row["missing_critical_skills"],
+            "skill_coverage": row["skill_coverage"],
+            "confidence": row["confidence"],
+            **extra
+        }
+
+    async def _sync_inactive_jobs(self) -> None:
+        """Mirror jobs deactivated after indexing into the vector store, refreshed after INACTIVE_JOBS_TTL."""
+        if time.time() - self._inactive_synced_at < self.INACTIVE_JOBS_TTL:
+            return
+        
+        vector_store = self.rag_searcher.vector_store
+        if not hasattr(vector_store, "set_jobs_active"):
+            return
+        
+        try:
+            inactive_ids = await self.job_db.get_inactive_job_ids()
+        except Exception as e:
+            # Keep the current flags: treating a failed fetch as "no inactive jobs" would reactivate them all
+            logger.warning(f"Skipping inactive job sync: {str(e)}")
+            return
+        
+        deactivated = inactive_ids - self._inactive_job_ids
+        reactivated = self._inactive_job_ids - inactive_ids
+        if deactivated or reactivated:
+            def apply_changes():
+                vector_store.set_jobs_active(deactivated, False)
+                vector_store.set_jobs_active(reactivated, True)
+            
+            # One mask update per direction, over every vector; keep it off the event loop
+            await asyncio.to_thread(apply_changes)
+        
+        self._inactive_job_ids = inactive_ids
+        self._inactive_synced_at = time.time()
+
+    async def get_skill_index(self) -> SkillJobIndex:
+        """Skill -> jobs inverted index over the jobs available for matching, rebuilt after SKILL_INDEX_TTL."""
+        index = self._skill_index
+        if index is not None and time.time() - index.built_at < self.SKILL_INDEX_TTL:
+            return index
+
+        jobs = await self.job_db.get_jobs_for_matching(limit=1000)
+        self._indexed_jobs = {job.id: job for job in jobs}
+        self._skill_index = SkillJobIndex().build({
+            job.id: self._prepare_job_context(job)['required_skills'] for job in jobs
+        })
+        return self._skill_index
+
+    def _score_job(self, user_skill_names: List[str], job: Job) -> Dict[str, any]:
+        """Deterministic match fields for one job, in the shape stored in user_job_matches."""
+        scores = JobMatcher.score_compatibility(user_skill_names, self._prepare_job_context(job)['required_skills'])
+        return {
+            "job_id": job.id,
+            "match_score": scores["compatibility_score"],
+            "matched_skills": scores["matched_skills"] + [f"{skill} (related)" for skill in scores["partial_matches"]],
+            "missing_critical_skills": scores["missing_skills"],
+            "skill_coverage": scores["skill_coverage"],
+            "confidence": scores["confidence"],
+            "_scores": scores
+        }
+
+    @staticmethod
+    def _match_changed(existing: UserJobMatch, row: Dict[str, any]) -> bool:
+        return (abs(existing.match_score - row["match_score"]) > 1e-6 or
+                abs(existing.skill_coverage - row["skill_coverage"]) > 1e-6 or
+                existing.confidence != row["confidence"] or
+                existing.matched_skills != row["matched_skills"] or
+                existing.missing_critical_skills != row["missing_critical_skills"])
+
+    async def _generate_match_reasoning(self, user_skill_names: List[str], job: Job, row: Dict[str, any]) -> Optional[str]:
+        scores = row["_scores"]
+        try:
+            return await asyncio.wait_for(
+                self.matcher.ai_analyzer.generate_comprehensive_analysis(
+                    user_skill_names,
+                    self._prepare_job_context(job)['required_skills'],
+                    job.title,
+                    job.company,
+                    scores["matched_skills"],
+                    scores["partial_matches"],
+                    scores["missing_skills"],
+                    scores["compatibility_score"]
+                ),
+                timeout=70.0
+            )
+        except Exception as e:
+            logger.warning(f"AI reasoning failed for job {job.id}: {str(e)}")
+            return None
+
+    async def update_matches_for_skill_change(
+        self,
+        user_id: str,
+        added_skills: Iterable[str] = (),
+        removed_skills: Iterable[str] = ()
+    ) -> Dict[str, any]:
+        """
+        Update stored matches after a few skills were added or removed.
+
+        Only jobs that list a changed skill are rescored. The user's matched
+        jobs are loaded by id (so matches on jobs outside the skill index are
+        covered too); stored matches whose deterministic fields are unchanged
+        are left alone (including their AI reasoning), changed ones are
+        rewritten, and ones that fall below MINIMUM_MATCH_SCORE are deleted.
+        Added skills also bring in the jobs of the skill -> jobs index the user
+        was not matched with yet. Reasoning is regenerated for at most
+        INCREMENTAL_MAX_AI_CALLS rows, STREAM_AI_CONCURRENCY calls at a time;
+        other changed rows keep their previous reasoning.
+        """
+        try:
+            changed_skills = list(dict.fromkeys(list(added_skills) + list(removed_skills)))
+            index = await self.get_skill_index()
+            affected_ids = index.jobs_for_skills(changed_skills)
+
+            user_skills = await self.get_combined_user_skills(user_id)
+            user_skill_names = [skill.skill_name for skill in user_skills]
+            existing_matches = await self.user_db.get_user_job_matches(user_id, limit=1000)
+            existing_by_job = {
+                match.job_id: match for match in existing_matches
+                # Placeholders for saved recommendations are not skill matches
+                if match.confidence != "recommendation"
+            }
+            existing_ids = {match.job_id for match in existing_matches}
+
+            # Matched jobs may be older than the indexed ones, so they are loaded and checked directly
+            matched_jobs = {job.id: job for job in await self.job_db.get_jobs_by_ids(list(existing_by_job))}
+            matched_affected_ids = SkillJobIndex().build({
+                job.id: self._prepare_job_context(job)['required_skills'] for job in matched_jobs.values()
+            }).jobs_for_skills(changed_skills)
+            jobs_by_id = {**self._indexed_jobs, **matched_jobs}
+
+            logger.info(f"🔁 Skill change for user {user_id} ({len(changed_skills)} skill(s)) "
+                        f"affects {len(matched_affected_ids)} matched and {len(affected_ids)} indexed jobs")
+
+            updated_rows = []
+            dropped_ids = []
+            for job_id in matched_affected_ids:
+                job = matched_jobs[job_id]
+                row = self._score_job(user_skill_names, job)
+                if not user_skill_names or row["match_score"] < self.MINIMUM_MATCH_SCORE:
+                    dropped_ids.append(job_id)
+                elif self._match_changed(existing_by_job[job_id], row):
+                    row["ai_reasoning"] = existing_by_job[job_id].ai_reasoning
+                    updated_rows.append(row)
+
+            # Delta candidates: affected jobs the user has no match for yet
+            new_rows = []
+            if added_skills and user_skill_names:
+                for job_id in affected_ids - existing_ids:
+                    job = self._indexed_jobs.get(job_id)
+                    if job is None:
+                        continue
+                    row = self._score_job(user_skill_names, job)
+                    if row["match_score"] >= self.MINIMUM_MATCH_SCORE:
+                        new_rows.append(row)
+                new_rows.sort(key=lambda r: r["match_score"], reverse=True)
+                new_rows = new_rows[:self.INCREMENTAL_MAX_AI_CALLS]
+
+            # New matches need reasoning first; rescored ones use what is left of the budget
+            reasoning_rows = new_rows + sorted(updated_rows, key=lambda r: r["match_score"], reverse=True)
+            semaphore = asyncio.Semaphore(self.STREAM_AI_CONCURRENCY)
+
+            async def reason(row: Dict[str, any]) -> None:
+                async with semaphore:
+                    reasoning = await self._generate_match_reasoning(user_skill_names, jobs_by_id[row["job_id"]], row)
+                if reasoning:
+                    row["ai_reasoning"] = reasoning
+
+            await asyncio.gather(*(reason(row) for row in reasoning_rows[:self.INCREMENTAL_MAX_AI_CALLS]))
+
+            new_rows = [row for row in new_rows if row.get("ai_reasoning")]
+            rows_to_write = [
+                {key: value for key, value in row.items() if key != "_scores"}
+                for row in updated_rows + new_rows
+            ]
+
+            saved = await self.user_db.save_job_matches_bulk(user_id, rows_to_write) if rows_to_write else []
+            if dropped_ids:
+                await self.user_db.delete_job_matches(user_id, dropped_ids)
+
+            logger.info(f"✅ Incremental match update for user {user_id}: {len(updated_rows)} rescored, "
+                        f"{len(new_rows)} added, {len(dropped_ids)} removed")
+
+            return {
+                "success": True,
+                "message": f"Updated {len(updated_rows)} matches, added {len(new_rows)}, removed {len(dropped_ids)}",
+                "incremental": True,
+                "affected_jobs": len(affected_ids),
+                "matches_saved": len(saved),
+                "updated_matches": len(updated_rows),
+                "new_matches": len(new_rows),
+                "removed_matches": len(dropped_ids),
+                "unchanged_matches": len(existing_by_job) - len(updated_rows) - len(dropped_ids),
+                "total_matches_now": len(existing_by_job) + len(new_rows) - len(dropped_ids)
+            }
+
+        except Exception as e:
+            logger.error(f"Error in incremental match update for user {user_id}: {str(e)}")
+            raise
@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from .task_queue import DEFAULT_QUEUE_PATH
+
+logger = logging.getLogger(__name__)
+
+# How often a process with open streams checks for steps published by other processes
+POLL_INTERVAL = float(os.getenv("PROCESSING_EVENTS_POLL_INTERVAL", "0.25"))
+# Published events are kept this long, then pruned
+RETENTION_SECONDS = 3600
+# Published by the task worker when one of a user's tasks stops running (data: task_id, kind, status)
+TASK_FINISHED = "task_finished"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS processing_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    data TEXT NOT NULL DEFAULT '{}',
+    origin TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_processing_events_created ON processing_events (created_at);
+"""
+
+
+@dataclass
+class ProcessingEvent:
+    user_id: str
+    step: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = 0.0
+
+
+class Subscription:
+    """One listener's queue of a user's processing events; close it (or use `with`) when done."""
+
+    def __init__(self, bus: "ProcessingEventBus", user_id: str):
+        self.bus = bus
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[ProcessingEvent]:
+        """The next event, or None if none arrived within timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.bus._unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ProcessingEventBus:
+    """
+    Publish/subscribe of resume processing steps (queued, parsing, matching, completed, error)
+    and of TASK_FINISHED, when the worker is done with one of a user's tasks.
+
+    Subscribers in the publishing process receive events directly. Every event
+    is also appended to a table in the task queue's SQLite file, which a
+    process polls only while it has subscribers, so steps published by
+    worker.py reach the status streams served by the API process. This is the
+    local stand-in for Redis pub/sub, in the same way TaskQueue stands in for
+    a hosted queue.
+    """
+
+    def __init__(self, path: Optional[str] = None, poll_interval: Optional[float] = None):
+        self.path = str(path or os.getenv("TASK_QUEUE_PATH", DEFAULT_QUEUE_PATH))
+        self.poll_interval = poll_interval or POLL_INTERVAL
+        self._origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._poller: Optional[asyncio.Task] = None
+        self._last_seen_id = 0
+        self._published = 0
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def publish(self, user_id: str, step: str, **data: Any) -> None:
+        """Record a step transition and notify its subscribers (in this and other processes)."""
+        event = ProcessingEvent(user_id=user_id, step=step, data=data, created_at=time.time())
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO processing_events (user_id, step, data, origin, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (user_id, step, json.dumps(data, default=str), self._origin, event.created_at)
+                )
+                self._published += 1
+                if self._published % 100 == 0:
+                    conn.execute("DELETE FROM processing_events WHERE created_at < ?",
+                                 (event.created_at - RETENTION_SECONDS,))
+        except Exception as e:
+            # Local subscribers still get the event; other processes fall back to the polling endpoint
+            logger.warning(f"Failed to record processing event for user {user_id}: {e}")
+        self._deliver(event)
+
+    async def publish_async(self, user_id: str, step: str, **data: Any) -> None:
+        """publish() for coroutines: the SQLite insert runs in a worker thread, off the event loop."""
+        await asyncio.to_thread(self.publish, user_id, step, **data)
+
+    def subscribe(self, user_id: str) -> Subscription:
+        """Listen for a user's events; must be called from the event loop that will read them."""
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            if self._poller is None or self._poller.done():
+                # Only events published from now on are of interest
+                self._last_seen_id = self._max_event_id()
+                self._poller = self._loop.create_task(self._poll())
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.user_id, None)
+            if not self._subscribers and self._poller is not None:
+                self._poller.cancel()
+                self._poller = None
+
+    def _deliver(self, event: ProcessingEvent) -> None:
+        with self._lock:
+            subscriptions = list(self._subscribers.get(event.user_id, ()))
+            loop = self._loop
+        if not subscriptions or loop is None or loop.is_closed():
+            return
+        for subscription in subscriptions:
+            # Publishers may run in a worker thread; queues belong to the subscribers' loop
+            loop.call_soon_threadsafe(subscription.queue.put_nowait, event)
+
+    def _max_event_id(self) -> int:
+        try:
+            with self._connect() as conn:
+                return conn.execute("SELECT COALESCE(MAX(id), 0) FROM processing_events").fetchone()[0]
+        except Exception as e:
+            logger.warning(f"Failed to read processing events: {e}")
+            return 0
+
+    def _read_events_since(self, last_id: int) -> List[sqlite3.Row]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT id, user_id, step, data, origin, created_at FROM processing_events WHERE id > ? ORDER BY id",
+                (last_id,)
+            ).fetchall()
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                rows = await asyncio.to_thread(self._read_events_since, self._last_seen_id)
+            except Exception as e:
+                logger.warning(f"Failed to poll processing events: {e}")
+                continue
+
+            for row in rows:
+                self._last_seen_id = max(self._last_seen_id, row["id"])
+                if row["origin"] == self._origin:
+                    continue  # Already delivered when it was published
+                self._deliver(ProcessingEvent(
+                    user_id=row["user_id"],
+                    step=row["step"],
+                    data=json.loads(row["data"] or "{}"),
+                    created_at=row["created_at"]
+                ))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+                "users": len(self._subscribers),
+                "published": self._published,
+                "polling": self._poller is not None and not self._poller.done()
+            }
+
+
+_event_bus: Optional[ProcessingEventBus] = None
+
+
+def get_processing_event_bus() -> ProcessingEventBus:
+    """Return the process-wide processing event bus (stored next to the task queue)."""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = ProcessingEventBus()
+    return _event_bus
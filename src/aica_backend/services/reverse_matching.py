@@ -0,0 +1,133 @@
+import os
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from database.async_user_db import AsyncUserDatabase
+from core.rag import TextEmbedder, UserProfileStore
+from services.user_profiles import UserProfileService, get_user_profile_store
+from core.matching import JobMatcher
+from prompts.matching_prompts import create_fallback_analysis
+
+logger = logging.getLogger(__name__)
+
+
+class ReverseMatchingService:
+    """
+    Matches newly scraped jobs against existing users.
+
+    Each user has one profile vector in the UserProfileStore maintained by
+    UserProfileService. A new job is embedded once, the store returns the users
+    whose profile is closest to it, and only those users get a deterministic
+    skill score; matches above the minimum score are upserted in one request
+    per user. No LLM calls are made here: the stored reasoning is
+    the deterministic skill analysis, and users get AI reasoning the next time
+    their matches are regenerated.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[TextEmbedder] = None,
+        user_store: Optional[UserProfileStore] = None,
+        user_db: Optional[AsyncUserDatabase] = None
+    ):
+        self.embedder = embedder or TextEmbedder()
+        self.user_store = user_store or get_user_profile_store()
+        self.user_db = user_db or AsyncUserDatabase()
+        self.profiles = UserProfileService(self.embedder, self.user_store, self.user_db)
+
+        self.MINIMUM_MATCH_SCORE = 0.3  # Same threshold as JobMatchingService
+        self.MAX_USERS_PER_JOB = int(os.getenv("REVERSE_MATCH_MAX_USERS", "200"))
+        self.SIMILARITY_THRESHOLD = float(os.getenv("REVERSE_MATCH_SIMILARITY_THRESHOLD", "0.3"))
+
+    @staticmethod
+    def _job_required_skills(job: Dict[str, Any]) -> List[str]:
+        # Same skill list JobMatchingService scores against (skills, then requirements)
+        required_skills = list(job.get("skills") or [])
+        for requirement in job.get("requirements") or []:
+            if requirement not in required_skills:
+                required_skills.append(requirement)
+        return required_skills
+
+    @staticmethod
+    def _job_query(job: Dict[str, Any]) -> str:
+        # Phrased like the user profile text so both sides embed comparably
+        return UserProfileService.build_profile_text(
+            list(job.get("skills") or []) or [job.get("title", "")],
+            location=job.get("location")
+        )
+
+    async def rebuild_user_index(self) -> int:
+        """Embed every user's profile into the user store and persist it."""
+        return await self.profiles.rebuild_all()
+
+    async def match_new_jobs(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create matches between new jobs and the users they fit.
+
+        jobs are dicts in the shape given to JobIndexer.index_scraped_jobs
+        ("job_id" or "id", "title", "skills", "requirements", ...).
+        """
+        stats = {"jobs": len(jobs), "candidate_pairs": 0, "matches_saved": 0, "users_matched": 0}
+        jobs = [job for job in jobs if (job.get("job_id") or job.get("id"))]
+        if not jobs:
+            return stats
+
+        await asyncio.to_thread(self.user_store.reload_if_changed)
+        if self.user_store.get_user_count() == 0:
+            await self.rebuild_user_index()
+
+        # One embedding per job, one batched search for all of them
+        vectors = self.embedder.create_embeddings([self._job_query(job) for job in jobs])
+        if len(vectors) != len(jobs):
+            logger.error(f"Expected {len(jobs)} job embeddings, got {len(vectors)}; skipping reverse matching")
+            return stats
+
+        candidates = self.user_store.search_users_batch(
+            vectors, k=self.MAX_USERS_PER_JOB, score_threshold=self.SIMILARITY_THRESHOLD
+        )
+
+        rows_by_user: Dict[str, List[Dict[str, Any]]] = {}
+        for job, users in zip(jobs, candidates):
+            job_id = job.get("job_id") or job.get("id")
+            job_skills = self._job_required_skills(job)
+            stats["candidate_pairs"] += len(users)
+
+            for candidate in users:
+                user_skills = candidate["metadata"].get("skills") or []
+                if not user_skills:
+                    continue
+
+                scores = JobMatcher.score_compatibility(user_skills, job_skills)
+                if scores["compatibility_score"] < self.MINIMUM_MATCH_SCORE:
+                    continue
+
+                rows_by_user.setdefault(candidate["user_id"], []).append({
+                    "job_id": job_id,
+                    "match_score": scores["compatibility_score"],
+                    "matched_skills": scores["matched_skills"] + [f"{skill} (related)" for skill in scores["partial_matches"]],
+                    "missing_critical_skills": scores["missing_skills"],
+                    "skill_coverage": scores["skill_coverage"],
+                    "confidence": scores["confidence"],
+                    "ai_reasoning": create_fallback_analysis(
+                        scores["matched_skills"],
+                        scores["partial_matches"],
+                        scores["missing_skills"],
+                        scores["compatibility_score"],
+                        job.get("title", "")
+                    )
+                })
+
+        for user_id, rows in rows_by_user.items():
+            try:
+                saved = await self.user_db.save_job_matches_bulk(user_id, rows)
+                stats["matches_saved"] += len(saved)
+                stats["users_matched"] += 1
+            except Exception as e:
+                logger.error(f"Failed to save reverse matches for user {user_id}: {e}")
+
+        logger.info(
+            f"🔁 Reverse matching: {len(jobs)} new jobs, {stats['candidate_pairs']} candidate pairs, "
+            f"{stats['matches_saved']} matches saved for {stats['users_matched']} users"
+        )
+        return stats
@@ -0,0 +1,383 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# The app directory is read-only on App Engine; /tmp (or the platform's temp dir) is writable.
+# The queue is a local file, so it is single-host: only processes on the same machine
+# (the API with its embedded worker, or worker.py next to it) share it.
+DEFAULT_QUEUE_PATH = Path(tempfile.gettempdir()) / "aica_task_queue.db"
+
+# Task states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    user_id TEXT,
+    payload TEXT NOT NULL DEFAULT '{}',
+    blob BLOB,
+    status TEXT NOT NULL,
+    depends_on TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after REAL NOT NULL,
+    lease_expires_at REAL,
+    worker_id TEXT,
+    last_error TEXT,
+    result TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status_run_after ON tasks (status, run_after);
+CREATE INDEX IF NOT EXISTS idx_tasks_user_kind ON tasks (user_id, kind, status);
+"""
+
+
+@dataclass
+class Task:
+    id: str
+    kind: str
+    user_id: Optional[str]
+    payload: Dict[str, Any]
+    blob: Optional[bytes]
+    status: str
+    depends_on: Optional[str]
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Task":
+        return cls(
+            id=row["id"],
+            kind=row["kind"],
+            user_id=row["user_id"],
+            payload=json.loads(row["payload"] or "{}"),
+            blob=row["blob"],
+            status=row["status"],
+            depends_on=row["depends_on"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            last_error=row["last_error"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"]
+        )
+
+    def to_status(self) -> Dict[str, Any]:
+        """Public view of the task (no payload or file bytes)."""
+        return {
+            "task_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "depends_on": self.depends_on,
+            "error": self.last_error,
+            "result": self.result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class TaskQueue:
+    """
+    Durable task queue stored in a local SQLite database.
+
+    Stand-in for a Redis/cloud queue: tasks survive restarts and are executed by
+    the API's embedded worker or by worker.py. Being a local file, the queue is
+    single-host; on App Engine each instance has its own queue and worker, and
+    a queue in /tmp does not survive the instance. Semantics:
+
+    - dedup: enqueueing a task while the same (kind, user) task is still queued
+      coalesces into the queued one (latest payload wins)
+    - dependencies: a task with depends_on only runs after that task succeeded,
+      and is cancelled if it failed or was cancelled
+    - per-user serialization: at most one running task per user, so parse and
+      match for the same user never race
+    - retries: failures are retried with exponential backoff up to max_attempts
+    - leases: a crashed worker's tasks are requeued once their lease expires
+    - debounce: enqueue(delay=..., supersede_running=True) pushes a coalesced
+      task's start back on every call and asks a running task of the same kind
+      for that user to stop, so only the latest request does the work
+    - merge_payload: combines the payload of the task being coalesced into or
+      superseded with the new one, instead of the latest payload winning
+    """
+
+    def __init__(self, path: Optional[str] = None, retry_backoff: float = 5.0):
+        self.path = str(path or os.getenv("TASK_QUEUE_PATH", DEFAULT_QUEUE_PATH))
+        self.retry_backoff = retry_backoff
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+            if "cancel_requested" not in columns:
+                # Queue files created before cancellation support
+                conn.execute("ALTER TABLE tasks ADD COLUMN cancel_requested INTEGER NOT NULL DEFAULT 0")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        with self._connect() as conn:
+            # IMMEDIATE takes the write lock up front so concurrent workers cannot claim the same task
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(
+        self,
+        kind: str,
+        user_id: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        blob: Optional[bytes] = None,
+        depends_on: Optional[str] = None,
+        dedup: bool = True,
+        max_attempts: int = 3,
+        delay: float = 0.0,
+        supersede_running: bool = False,
+        merge_payload: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]] = None
+    ) -> str:
+        """Add a task and return its id (or the id of the queued task it was coalesced into).
+
+        delay postpones the start; on coalescing it is applied again from now.
+        supersede_running requests cancellation of a running task of the same
+        kind for the same user. merge_payload(older, newer) returns the payload
+        to store when a queued task is coalesced or a running one superseded.
+        """
+        now = time.time()
+        payload = payload or {}
+
+        with self._transaction() as conn:
+            if supersede_running and user_id:
+                if merge_payload:
+                    # The superseded run's work is handed over to the new task
+                    for row in conn.execute(
+                        "SELECT payload FROM tasks WHERE kind = ? AND user_id = ? AND status = ? "
+                        "AND cancel_requested = 0",
+                        (kind, user_id, RUNNING)
+                    ).fetchall():
+                        payload = merge_payload(json.loads(row["payload"] or "{}"), payload)
+                cursor = conn.execute(
+                    "UPDATE tasks SET cancel_requested = 1, updated_at = ? "
+                    "WHERE kind = ? AND user_id = ? AND status = ?",
+                    (now, kind, user_id, RUNNING)
+                )
+                if cursor.rowcount:
+                    logger.info(f"Requested cancellation of running {kind} task for user {user_id}")
+
+            if dedup and user_id:
+                existing = conn.execute(
+                    "SELECT id, payload FROM tasks WHERE kind = ? AND user_id = ? AND status = ? "
+                    "ORDER BY created_at DESC LIMIT 1",
+                    (kind, user_id, QUEUED)
+                ).fetchone()
+                if existing:
+                    if merge_payload:
+                        payload = merge_payload(json.loads(existing["payload"] or "{}"), payload)
+                    conn.execute(
+                        "UPDATE tasks SET payload = ?, blob = ?, depends_on = ?, max_attempts = ?, "
+                        "run_after = ?, updated_at = ? WHERE id = ?",
+                        (json.dumps(payload), blob, depends_on, max_attempts, now + delay, now, existing["id"])
+                    )
+                    logger.info(f"Coalesced {kind} task for user {user_id} into {existing['id']}")
+                    return existing["id"]
+
+            task_id = str(uuid.uuid4())
+            conn.execute(
+                "INSERT INTO tasks (id, kind, user_id, payload, blob, status, depends_on, max_attempts, "
+                "run_after, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (task_id, kind, user_id, json.dumps(payload), blob, QUEUED, depends_on, max_attempts,
+                 now + delay, now, now)
+            )
+            logger.info(f"Enqueued {kind} task {task_id} for user {user_id}")
+            return task_id
+
+    def claim(self, worker_id: str, lease_seconds: float = 300.0) -> Optional[Task]:
+        """Lease the next runnable task to a worker, or return None."""
+        now = time.time()
+        with self._transaction() as conn:
+            # Requeue tasks whose worker died without finishing them
+            conn.execute(
+                "UPDATE tasks SET status = ?, worker_id = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at < ?",
+                (QUEUED, now, RUNNING, now)
+            )
+            # Tasks whose dependency can no longer succeed will never run
+            conn.execute(
+                "UPDATE tasks SET status = ?, last_error = 'dependency did not succeed', "
+                "finished_at = ?, updated_at = ? "
+                "WHERE status = ? AND depends_on IN (SELECT id FROM tasks WHERE status IN (?, ?))",
+                (CANCELLED, now, now, QUEUED, FAILED, CANCELLED)
+            )
+
+            row = conn.execute(
+                """
+                SELECT t.* FROM tasks t
+                WHERE t.status = ? AND t.run_after <= ?
+                  AND (t.depends_on IS NULL OR t.depends_on NOT IN (SELECT id FROM tasks)
+                       OR EXISTS (SELECT 1 FROM tasks d WHERE d.id = t.depends_on AND d.status = ?))
+                  AND (t.user_id IS NULL OR NOT EXISTS (
+                       SELECT 1 FROM tasks r WHERE r.user_id = t.user_id AND r.status = ?))
+                ORDER BY t.run_after, t.created_at
+                LIMIT 1
+                """,
+                (QUEUED, now, SUCCEEDED, RUNNING)
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE tasks SET status = ?, worker_id = ?, attempts = attempts + 1, cancel_requested = 0, "
+                "lease_expires_at = ?, started_at = ?, updated_at = ? WHERE id = ?",
+                (RUNNING, worker_id, now + lease_seconds, now, now, row["id"])
+            )
+            task = Task.from_row(row)
+            task.status = RUNNING
+            task.attempts += 1
+            task.started_at = now
+            return task
+
+    def heartbeat(self, task_id: str, worker_id: str, lease_seconds: float = 300.0) -> bool:
+        """Extend the lease of a running task. Returns True if the task should stop."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE tasks SET lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (now + lease_seconds, now, task_id, worker_id, RUNNING)
+            )
+            row = conn.execute("SELECT cancel_requested FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            return bool(row and row["cancel_requested"])
+
+    def mark_cancelled(self, task_id: str, reason: str = "superseded by a newer request") -> None:
+        """Record that a running task stopped because cancellation was requested."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, last_error = ?, blob = NULL, lease_expires_at = NULL, "
+                "finished_at = ?, updated_at = ? WHERE id = ?",
+                (CANCELLED, reason, now, now, task_id)
+            )
+
+    def complete(self, task_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = ?, result = ?, blob = NULL, lease_expires_at = NULL, "
+                "last_error = NULL, finished_at = ?, updated_at = ? WHERE id = ?",
+                (SUCCEEDED, json.dumps(result) if result is not None else None, now, now, task_id)
+            )
+
+    def fail(self, task_id: str, error: str) -> str:
+        """Record a failure; requeue with backoff while attempts remain. Returns the new status."""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts, max_attempts FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return FAILED
+
+            if row["attempts"] < row["max_attempts"]:
+                delay = self.retry_backoff * (2 ** (row["attempts"] - 1))
+                conn.execute(
+                    "UPDATE tasks SET status = ?, last_error = ?, worker_id = NULL, lease_expires_at = NULL, "
+                    "run_after = ?, updated_at = ? WHERE id = ?",
+                    (QUEUED, error, now + delay, now, task_id)
+                )
+                logger.warning(f"Task {task_id} failed (attempt {row['attempts']}), retrying in {delay:.0f}s: {error}")
+                return QUEUED
+
+            conn.execute(
+                "UPDATE tasks SET status = ?, last_error = ?, blob = NULL, lease_expires_at = NULL, "
+                "finished_at = ?, updated_at = ? WHERE id = ?",
+                (FAILED, error, now, now, task_id)
+            )
+            logger.error(f"Task {task_id} failed permanently after {row['attempts']} attempts: {error}")
+            return FAILED
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancel a task that has not started yet."""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = ?, blob = NULL, finished_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = ?",
+                (CANCELLED, now, now, task_id, QUEUED)
+            )
+            return cursor.rowcount > 0
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            return Task.from_row(row) if row else None
+
+    def get_user_tasks(self, user_id: str, active_only: bool = False, limit: int = 20) -> List[Task]:
+        """Most recent tasks for a user, newest first."""
+        query = "SELECT * FROM tasks WHERE user_id = ?"
+        params: List[Any] = [user_id]
+        if active_only:
+            query += " AND status IN (?, ?)"
+            params.extend(ACTIVE_STATES)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._connect() as conn:
+            return [Task.from_row(row) for row in conn.execute(query, params).fetchall()]
+
+    def purge_finished(self, older_than_seconds: float = 7 * 24 * 3600) -> int:
+        """Delete finished tasks older than the given age. Returns the number removed."""
+        cutoff = time.time() - older_than_seconds
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM tasks WHERE status IN (?, ?, ?) AND finished_at < ?",
+                (SUCCEEDED, FAILED, CANCELLED, cutoff)
+            )
+            return cursor.rowcount
+
+
+_task_queue: Optional[TaskQueue] = None
+
+
+def get_task_queue() -> TaskQueue:
+    """Return the process-wide task queue (path from TASK_QUEUE_PATH)."""
+    global _task_queue
+    if _task_queue is None:
+        _task_queue = TaskQueue()
+    return _task_queue
@@ -0,0 +1,130 @@
+import os
+import socket
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .task_queue import CANCELLED, SUCCEEDED, Task, TaskQueue, get_task_queue
+from .processing_events import TASK_FINISHED, get_processing_event_bus
+
+logger = logging.getLogger(__name__)
+
+TaskHandler = Callable[[Task], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class TaskWorker:
+    """
+    Executes tasks from a TaskQueue with a bounded number of concurrent slots.
+
+    Each claimed task holds a lease that is renewed while its handler runs, so a
+    task whose worker crashes is picked up again by another worker. The same
+    heartbeat notices cancellation requests and stops the handler. Handlers
+    raise to signal failure; the queue decides whether to retry. Each finished
+    run is published as a TASK_FINISHED event, so status streams need not poll
+    the queue.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, TaskHandler],
+        queue: Optional[TaskQueue] = None,
+        concurrency: Optional[int] = None,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 300.0,
+        heartbeat_interval: float = 2.0
+    ):
+        self.handlers = handlers
+        self.queue = queue or get_task_queue()
+        self.concurrency = concurrency or int(os.getenv("TASK_WORKER_CONCURRENCY", "2"))
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = min(heartbeat_interval, lease_seconds / 3)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def run(self) -> None:
+        """Claim and execute tasks until stop() is called, then wait for running tasks."""
+        slots = asyncio.Semaphore(self.concurrency)
+        running = set()
+        logger.info(f"👷 Task worker {self.worker_id} started (concurrency={self.concurrency})")
+
+        while not self._stop.is_set():
+            await slots.acquire()
+            try:
+                task = await asyncio.to_thread(self.queue.claim, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.error(f"Failed to claim task: {e}")
+                task = None
+
+            if task is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            runner = asyncio.create_task(self._execute(task, slots))
+            running.add(runner)
+            runner.add_done_callback(running.discard)
+
+        if running:
+            logger.info(f"Waiting for {len(running)} running task(s) to finish")
+            await asyncio.gather(*running, return_exceptions=True)
+        logger.info(f"Task worker {self.worker_id} stopped")
+
+    async def _heartbeat(self, task: Task, handler_run: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                cancel = await asyncio.to_thread(self.queue.heartbeat, task.id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Heartbeat failed for task {task.id}: {e}")
+                continue
+            if cancel:
+                logger.info(f"⏹️ Cancelling {task.kind} task {task.id} for user {task.user_id}")
+                handler_run.cancel()
+                return
+
+    @staticmethod
+    async def _publish_finished(task: Task, status: str) -> None:
+        try:
+            await get_processing_event_bus().publish_async(
+                task.user_id, TASK_FINISHED, task_id=task.id, kind=task.kind, status=status
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish completion of task {task.id}: {e}")
+
+    async def _execute(self, task: Task, slots: asyncio.Semaphore) -> None:
+        heartbeat = None
+        try:
+            handler = self.handlers.get(task.kind)
+            if handler is None:
+                raise ValueError(f"No handler registered for task kind '{task.kind}'")
+
+            logger.info(f"▶️ Running {task.kind} task {task.id} for user {task.user_id} (attempt {task.attempts})")
+            handler_run = asyncio.create_task(handler(task))
+            heartbeat = asyncio.create_task(self._heartbeat(task, handler_run))
+            try:
+                result = await handler_run
+            except asyncio.CancelledError:
+                if not handler_run.cancelled():
+                    raise
+                # Cancelled by request (not by worker shutdown)
+                await asyncio.to_thread(self.queue.mark_cancelled, task.id)
+                await self._publish_finished(task, CANCELLED)
+                return
+
+            await asyncio.to_thread(self.queue.complete, task.id, result)
+            logger.info(f"✅ Finished {task.kind} task {task.id}")
+            await self._publish_finished(task, SUCCEEDED)
+        except Exception as e:
+            status = await asyncio.to_thread(self.queue.fail, task.id, str(e))
+            await self._publish_finished(task, status)
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            slots.release()
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from database.async_user_db import AsyncUserDatabase
+from database.models.user_models import UserProfile
+from core.rag import TextEmbedder, UserProfileStore, QueryBuilder, UserContext
+
+logger = logging.getLogger(__name__)
+
+_user_profile_store: Optional[UserProfileStore] = None
+
+
+def get_user_profile_store() -> UserProfileStore:
+    """Process-wide user profile index (loaded once, reloaded when another process saves it)."""
+    global _user_profile_store
+    if _user_profile_store is None:
+        _user_profile_store = UserProfileStore()
+    return _user_profile_store
+
+
+class UserProfileService:
+    """
+    Maintains the stored profile vector of each user.
+
+    The vector is built from the same comprehensive query the job search uses
+    (skills, experience level, location) and refreshed whenever those change,
+    so matching can search with the stored vector instead of embedding query
+    text on every request. The same vectors answer "similar candidates"
+    lookups between users.
+
+    Index file I/O (reloads and saves) runs in a worker thread, and writes go
+    through UserProfileStore.update() so the worker and the scraper can both
+    save the index.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[TextEmbedder] = None,
+        user_store: Optional[UserProfileStore] = None,
+        user_db: Optional[AsyncUserDatabase] = None
+    ):
+        self._embedder = embedder
+        self.user_store = user_store or get_user_profile_store()
+        self.user_db = user_db or AsyncUserDatabase()
+
+    @property
+    def embedder(self) -> TextEmbedder:
+        # Loading the model is expensive; only do it when a vector has to be computed
+        if self._embedder is None:
+            self._embedder = TextEmbedder()
+        return self._embedder
+
+    @staticmethod
+    def _unique_skill_names(skill_names: List[str]) -> List[str]:
+        unique = {}
+        for name in skill_names:
+            if name and name.strip():
+                unique.setdefault(name.lower().strip(), name.strip())
+        return list(unique.values())
+
+    @staticmethod
+    def build_profile_text(
+        skill_names: List[str],
+        experience_years: Optional[int] = None,
+        location: Optional[str] = None
+    ) -> str:
+        context = UserContext(
+            skills=skill_names,
+            experience_years=experience_years,
+            preferred_locations=[location] if location else []
+        )
+        return QueryBuilder.build_comprehensive_query(context)
+
+    async def refresh_user(self, user_id: str) -> bool:
+        """Recompute and store a user's profile vector. Users without skills are removed."""
+        skills = await self.user_db.get_user_skills(user_id)
+        skill_names = self._unique_skill_names([skill.skill_name for skill in skills])
+
+        if not skill_names:
+            if await asyncio.to_thread(self._remove_user, user_id):
+                logger.info(f"Removed profile vector of user {user_id} (no skills)")
+            return False
+
+        profile: Optional[UserProfile] = await self.user_db.get_user_profile(user_id)
+        experience_years = profile.experience_years if profile else None
+        location = profile.location if profile else None
+
+        text = self.build_profile_text(skill_names, experience_years, location)
+        vector = await asyncio.to_thread(self.embedder.embed_single_text, text)
+        if not vector:
+            raise ValueError(f"Could not embed profile of user {user_id}")
+
+        await asyncio.to_thread(self._upsert_users, [(user_id, vector, {
+            "skills": skill_names,
+            "experience_years": experience_years,
+            "location": location
+        })])
+        logger.info(f"🧭 Updated profile vector of user {user_id} ({len(skill_names)} skills)")
+        return True
+
+    async def rebuild_all(self) -> int:
+        """Recompute the profile vector of every user with skills, replacing the stored index."""
+        skills_by_user = await self.user_db.get_all_user_skill_names()
+        profiles = await self.user_db.get_all_user_profiles()
+
+        entries = []
+        texts = []
+        for user_id, names in skills_by_user.items():
+            skill_names = self._unique_skill_names(names)
+            if not skill_names:
+                continue
+            profile = profiles.get(user_id, {})
+            metadata = {
+                "skills": skill_names,
+                "experience_years": profile.get("experience_years"),
+                "location": profile.get("location")
+            }
+            entries.append((user_id, metadata))
+            texts.append(self.build_profile_text(skill_names, metadata["experience_years"], metadata["location"]))
+
+        if not entries:
+            logger.info("No users with skills to index")
+            return 0
+
+        vectors = await asyncio.to_thread(self.embedder.create_embeddings, texts)
+        if len(vectors) != len(entries):
+            raise ValueError(f"Expected {len(entries)} profile embeddings, got {len(vectors)}")
+
+        stored = await asyncio.to_thread(self._upsert_users, [
+            (user_id, vector, metadata) for (user_id, metadata), vector in zip(entries, vectors)
+        ], True)
+        logger.info(f"✅ Indexed profile vectors for {stored} users")
+        return stored
+
+    def _remove_user(self, user_id: str) -> bool:
+        with self.user_store.update() as store:
+            return store.remove_user(user_id)
+
+    def _upsert_users(self, entries: List[Tuple[str, List[float], Dict[str, Any]]], replace_all: bool = False) -> int:
+        with self.user_store.update() as store:
+            if replace_all:
+                store.clear()
+            return store.upsert_users(entries)
+
+    async def get_user_vector(
+        self,
+        user_id: str,
+        skill_names: Optional[List[str]] = None,
+        profile: Optional[UserProfile] = None
+    ) -> Optional[List[float]]:
+        """
+        The stored profile vector of a user, or None if there is none.
+
+        When skill_names (and profile) are given, a vector built from different
+        skills, experience or location is treated as stale and None is returned,
+        so callers fall back to text search until the refresh task has run.
+        """
+        await asyncio.to_thread(self.user_store.reload_if_changed)
+        metadata = self.user_store.get_user_metadata(user_id)
+        if metadata is None:
+            return None
+
+        if skill_names is not None:
+            stored = {name.lower() for name in metadata.get("skills", [])}
+            current = {name.lower() for name in self._unique_skill_names(skill_names)}
+            if stored != current:
+                return None
+
+        if profile is not None and (metadata.get("experience_years") != profile.experience_years or
+                                    metadata.get("location") != profile.location):
+            return None
+
+        return self.user_store.get_vector(user_id)
+
+    async def find_similar_users_batch(
+        self,
+        user_ids: List[str],
+        k: int = 10,
+        score_threshold: float = 0.0
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Nearest users of each given user by profile vector, in one index search."""
+        await asyncio.to_thread(self.user_store.reload_if_changed)
+        known = [(user_id, self.user_store.get_vector(user_id)) for user_id in user_ids]
+        known = [(user_id, vector) for user_id, vector in known if vector]
+        if not known:
+            return {user_id: [] for user_id in user_ids}
+
+        # One extra neighbour because every user is its own nearest match
+        results = self.user_store.search_users_batch(
+            [vector for _, vector in known], k=k + 1, score_threshold=score_threshold
+        )
+
+        similar = {user_id: [] for user_id in user_ids}
+        for (user_id, _), matches in zip(known, results):
+            similar[user_id] = [match for match in matches if match["user_id"] != user_id][:k]
+        return similar
+
+    async def find_similar_users(self, user_id: str, k: int = 10, score_threshold: float = 0.0) -> List[Dict[str, Any]]:
+        return (await self.find_similar_users_batch([user_id], k, score_threshold))[user_id]
@@ -2,10 +2,18 @@ from .file_utils import (
     SUPPORTED_FILE_TYPES,
     extract_text_from_file,
     extract_from_pdf,
+    extract_pdf_pages,
+    iter_pdf_pages,
+    MAX_PDF_PAGES,
+    PdfBackend,
+    register_pdf_backend,
+    pdf_backend_order,
     extract_from_docx,
     extract_from_doc
 )
 
+from .extraction_pool import ExtractionPool, get_extraction_pool
+
 from .pattern_utils import (
     EMAIL_PATTERN,
     PHONE_PATTERN,
@@ -15,10 +23,13 @@ from .pattern_utils import (
     extract_linkedin,
     estimate_experience_years,
     build_skill_patterns,
-    match_skill_pattern
+    match_skill_pattern,
+    technical_skill_surface_forms,
+    soft_skill_surface_forms,
+    SkillPatternMatcher
 )
 
-from .cache import SimpleCache
+from .cache import LRUCache, SimpleCache
 from .db_helpers import handle_db_response, deserialize_json_field
 
 from .text_utils import (
@@ -51,6 +62,14 @@ __all__ = [
     'SUPPORTED_FILE_TYPES',
     'extract_text_from_file',
     'extract_from_pdf',
+    'extract_pdf_pages',
+    'iter_pdf_pages',
+    'MAX_PDF_PAGES',
+    'PdfBackend',
+    'register_pdf_backend',
+    'pdf_backend_order',
+    'ExtractionPool',
+    'get_extraction_pool',
     'extract_from_docx',
     'extract_from_doc',
     'EMAIL_PATTERN',
@@ -63,6 +82,10 @@ __all__ = [
     'estimate_experience_years',
     'build_skill_patterns',
     'match_skill_pattern',
+    'technical_skill_surface_forms',
+    'soft_skill_surface_forms',
+    'SkillPatternMatcher',
+    'LRUCache',
     'SimpleCache',
     'handle_db_response',
     'deserialize_json_field',
@@ -1,58 +1,193 @@
 """
-Simple in-memory cache with TTL (Time To Live) support.
+In-memory LRU cache with TTL (Time To Live) support.
 Used for caching database queries to reduce load.
 """
 import time
-from typing import Any, Dict
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 
-class SimpleCache:
-    """Simple in-memory cache with TTL support."""
-    
-    def __init__(self, max_size: int = 100, ttl: int = 300):
+class LRUCache:
+    """
+    LRU cache with per-entry TTL and O(1) get/set.
+
+    Entries live in an OrderedDict kept in recency order, so eviction pops the
+    least recently used item instead of scanning for the oldest one. Expired
+    entries are dropped lazily when read and by a periodic sweep on writes.
+    Async callers can use get_or_load so concurrent misses for the same key
+    share a single fetch.
+    """
+
+    def __init__(self, max_size: int = 100, ttl: int = 300, sweep_interval: int = 60):
         """
         Initialize cache.
-        
+
         Args:
             max_size: Maximum number of items to cache
             ttl: Time to live in seconds (default: 5 minutes)
+            sweep_interval: Minimum seconds between full expiry sweeps
         """
-        self.cache: Dict[str, Dict[str, Any]] = {}
         self.max_size = max_size
         self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._last_sweep = time.monotonic()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "loads": 0,
+            "coalesced": 0
+        }
 
     def get(self, key: str) -> Any:
         """
         Get value from cache if exists and not expired.
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             Cached value or None if not found/expired
         """
-        if key in self.cache:
-            item = self.cache[key]
-            if time.time() - item['timestamp'] < self.ttl:
-                return item['value']
-            else:
-                del self.cache[key]
-        return None
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+
+            expires_at, value = item
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
 
-    def set(self, key: str, value: Any) -> None:
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """
-        Set value in cache, removing oldest item if at capacity.
-        
+        Set value in cache, evicting the least recently used item if at capacity.
+
         Args:
             key: Cache key
             value: Value to cache
+            ttl: Optional TTL override in seconds for this entry
         """
-        if len(self.cache) >= self.max_size:
-            # Remove oldest item
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k]['timestamp'])
-            del self.cache[oldest_key]
-        self.cache[key] = {'value': value, 'timestamp': time.time()}
+        now = time.monotonic()
+        with self._lock:
+            self._data[key] = (now + (ttl if ttl is not None else self.ttl), value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+
+    def delete(self, key: str) -> None:
+        """
+        Remove a single item from cache if present.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._data.pop(key, None)
 
     def clear(self) -> None:
         """Clear all cached items."""
-        self.cache.clear()
+        with self._lock:
+            self._data.clear()
+
+    def sweep(self) -> int:
+        """Remove all expired entries now. Returns the number removed."""
+        with self._lock:
+            return self._sweep(time.monotonic())
+
+    def _sweep(self, now: float) -> int:
+        expired = [key for key, (expires_at, _) in self._data.items() if now >= expires_at]
+        for key in expired:
+            del self._data[key]
+        self._stats["expirations"] += len(expired)
+        self._last_sweep = now
+        return len(expired)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]],
+                          ttl: Optional[int] = None) -> Any:
+        """
+        Return the cached value for key, or await loader() to fetch it.
+
+        Concurrent callers missing the same key on the same event loop wait for
+        the first caller's fetch instead of starting their own. None results are
+        returned but not cached. If the loading caller is cancelled, the callers
+        waiting on it retry the load rather than being cancelled too.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        while inflight is not None and inflight[0] is loop:
+            self._stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(inflight[1])
+            except asyncio.CancelledError:
+                if not inflight[1].cancelled():
+                    raise  # This caller was cancelled, not the loader
+            value = self.get(key)
+            if value is not None:
+                return value
+            inflight = self._inflight.get(key)
+
+        future = loop.create_future()
+        self._inflight[key] = (loop, future)
+        try:
+            self._stats["loads"] += 1
+            value = await loader()
+            if value is not None:
+                self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        except BaseException:
+            # Cancelled: waiters retry the load instead of receiving this cancellation
+            future.cancel()
+            raise
+        finally:
+            if self._inflight.get(key, (None, None))[1] is future:
+                del self._inflight[key]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and time.monotonic() < item[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0
+        }
+
+
+# Backward compatibility alias
+SimpleCache = LRUCache
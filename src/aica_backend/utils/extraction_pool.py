@@ -0,0 +1,154 @@
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, Optional
+
+from .file_utils import SUPPORTED_FILE_TYPES, extract_text_from_file, extract_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_WORKERS = int(os.getenv("RESUME_EXTRACTION_WORKERS", "2"))
+EXTRACTION_TIMEOUT = float(os.getenv("RESUME_EXTRACTION_TIMEOUT", "30"))
+
+PDF_FILE_TYPE = "application/pdf"
+
+
+class ExtractionPool:
+    """
+    Bounded process pool for resume text extraction.
+
+    PDF/DOCX parsing is pure-Python and CPU bound, so running it on the event
+    loop (or a thread) stalls every other request for the duration of the
+    file. Workers are separate processes, so at most `max_workers` files are
+    parsed at once and a pathological file cannot hold the GIL. A running
+    worker cannot be cancelled, so a file that exceeds its timeout recycles
+    the whole pool (its worker is terminated and a fresh pool is started on
+    the next call). Other files that were in flight in the recycled pool are
+    resubmitted to the new one within their own timeout.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_workers = max_workers or EXTRACTION_WORKERS
+        self.timeout = timeout or EXTRACTION_TIMEOUT
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {"extractions": 0, "timeouts": 0, "recycles": 0, "retries": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._closed = False
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _recycle(self, executor: Optional[ProcessPoolExecutor] = None) -> None:
+        """Terminate the workers of executor (default: the current pool) if it is still the current pool."""
+        with self._lock:
+            if executor is not None and executor is not self._executor:
+                return  # Already recycled by another timeout
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+
+        # Grab the worker processes before shutdown drops its references to them
+        processes = list(getattr(executor, "_processes", {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            try:
+                process.terminate()
+            except Exception as e:
+                logger.warning(f"Could not terminate extraction worker: {e}")
+        self._stats["recycles"] += 1
+
+    async def _run(self, timeout: Optional[float], function, *args):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.timeout)
+        while True:
+            executor = self._get_executor()
+            future = loop.run_in_executor(executor, function, *args)
+            try:
+                return await asyncio.wait_for(future, timeout=max(deadline - loop.time(), 0.001))
+            except asyncio.TimeoutError:
+                self._stats["timeouts"] += 1
+                logger.error(f"Resume text extraction timed out after {timeout or self.timeout}s, recycling workers")
+                self._recycle(executor)
+                raise RuntimeError("Text extraction timed out")
+            except (BrokenProcessPool, asyncio.CancelledError) as e:
+                # A recycle for another file's timeout kills this file's worker (BrokenProcessPool)
+                # or drops it from the queue (cancelled); run it again in the new pool
+                task = asyncio.current_task()
+                if self._closed or executor is self._executor or (task is not None and task.cancelling()):
+                    if isinstance(e, BrokenProcessPool):
+                        self._recycle(executor)  # A crashed worker; start a fresh pool for the next call
+                    raise
+                self._stats["retries"] += 1
+                logger.warning("Resume text extraction interrupted by a worker recycle, retrying")
+
+    async def extract_text(self, file_content: bytes, file_type: str, timeout: Optional[float] = None) -> str:
+        """Whole-file text, extracted in a worker process."""
+        if file_type not in SUPPORTED_FILE_TYPES:
+            raise ValueError(f"Unsupported file type: {file_type}")
+        self._stats["extractions"] += 1
+        return await self._run(timeout, extract_text_from_file, file_content, file_type)
+
+    async def stream_pdf_pages(
+        self,
+        file_content: bytes,
+        max_pages: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield the text of each PDF page in order, the first page as soon as it is ready.
+
+        Page one and the remaining pages are extracted by two workers in
+        parallel, so callers can start on the header (name, contact details)
+        while the body is still being parsed. The timeout covers the whole file.
+        Each worker opens the document, so its structure is parsed twice: an
+        extra worker and one more parse of the xref/page tree per file, in
+        exchange for the first page arriving early.
+        """
+        self._stats["extractions"] += 1
+        deadline = asyncio.get_running_loop().time() + (timeout or self.timeout)
+        first_page = asyncio.ensure_future(self._run(timeout, extract_pdf_pages, file_content, 0, 1))
+        other_pages = asyncio.ensure_future(self._run(timeout, extract_pdf_pages, file_content, 1, max_pages))
+        try:
+            for page_text in await first_page:
+                yield page_text
+            remaining = max(deadline - asyncio.get_running_loop().time(), 0.001)
+            for page_text in await asyncio.wait_for(asyncio.shield(other_pages), timeout=remaining):
+                yield page_text
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            self._recycle()
+            raise RuntimeError("Text extraction timed out")
+        finally:
+            for task in (first_page, other_pages):
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # Mark as retrieved; the error was already raised or is moot
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        return {**self._stats, "max_workers": self.max_workers, "timeout": self.timeout}
+
+
+_extraction_pool: Optional[ExtractionPool] = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Return the process-wide extraction pool (size from RESUME_EXTRACTION_WORKERS)."""
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ExtractionPool()
+    return _extraction_pool
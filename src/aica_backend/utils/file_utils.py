@@ -1,10 +1,14 @@
+import os
 import PyPDF2
 import mammoth
 import docx
 import logging
+import importlib.util
 
 from io import BytesIO
-from typing import Dict
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +19,9 @@ SUPPORTED_FILE_TYPES: Dict[str, str] = {
     "application/msword": "DOC"
 }
 
+# Pages beyond this are ignored; a resume longer than this is almost certainly not a resume
+MAX_PDF_PAGES = int(os.getenv("RESUME_MAX_PDF_PAGES", "20"))
+
 
 def extract_text_from_file(file_content: bytes, file_type: str) -> str:
     if file_type not in SUPPORTED_FILE_TYPES:
@@ -38,23 +45,118 @@ def extract_text_from_file(file_content: bytes, file_type: str) -> str:
         raise RuntimeError(f"Failed to extract text from {file_type_name}: {str(e)}")
 
 
-def extract_from_pdf(file_content: bytes) -> str:
-    try:
-        pdf_file = BytesIO(file_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        
-        if len(pdf_reader.pages) == 0:
-            raise ValueError("PDF file has no pages")
-        
-        text_parts = []
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text and page_text.strip():
-                text_parts.append(page_text)
-        
-        return "\n".join(text_parts).strip()
-    except Exception as e:
-        raise RuntimeError(f"PDF extraction failed: {str(e)}")
+# (page count, page text by 0-based index) for a PDF's bytes
+PdfPageReader = Tuple[int, Callable[[int], str]]
+
+
+@dataclass(frozen=True)
+class PdfBackend:
+    name: str
+    open: Callable[[bytes], PdfPageReader]
+    module: str  # Import name; a backend whose module is not installed is skipped
+
+
+_PDF_BACKENDS: Dict[str, PdfBackend] = {}
+
+
+def register_pdf_backend(name: str, open_document: Callable[[bytes], PdfPageReader], module: str) -> None:
+    _PDF_BACKENDS[name] = PdfBackend(name=name, open=open_document, module=module)
+
+
+def _open_with_pypdf2(file_content: bytes) -> PdfPageReader:
+    pdf_reader = PyPDF2.PdfReader(BytesIO(file_content))
+    return len(pdf_reader.pages), lambda page_number: pdf_reader.pages[page_number].extract_text() or ""
+
+
+def _open_with_pypdfium2(file_content: bytes) -> PdfPageReader:
+    import pypdfium2
+    
+    pdf = pypdfium2.PdfDocument(file_content)
+    
+    def page_text(page_number: int) -> str:
+        page = pdf[page_number]
+        text_page = page.get_textpage()
+        try:
+            return text_page.get_text_range().replace("\r\n", "\n").replace("\r", "\n")
+        finally:
+            text_page.close()
+            page.close()
+    
+    return len(pdf), page_text
+
+
+register_pdf_backend("pypdfium2", _open_with_pypdfium2, "pypdfium2")
+register_pdf_backend("pypdf2", _open_with_pypdf2, "PyPDF2")
+
+# Tried first; the other installed backends are the fallback, in registration order
+PDF_BACKEND = os.getenv("RESUME_PDF_BACKEND", "pypdfium2").lower()
+
+
+@lru_cache(maxsize=None)
+def _is_backend_installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def pdf_backend_order(preferred: Optional[str] = None, fallback: bool = True) -> List[str]:
+    """Installed PDF backends, the preferred one (default RESUME_PDF_BACKEND) first."""
+    preferred = (preferred or PDF_BACKEND).lower()
+    if preferred not in _PDF_BACKENDS:
+        logger.warning(f"Unknown PDF backend '{preferred}', available: {', '.join(_PDF_BACKENDS)}")
+    names = [preferred] + ([name for name in _PDF_BACKENDS if name != preferred] if fallback else [])
+    return [name for name in names if name in _PDF_BACKENDS and _is_backend_installed(_PDF_BACKENDS[name].module)]
+
+
+def iter_pdf_pages(
+    file_content: bytes,
+    max_pages: Optional[int] = None,
+    start: int = 0,
+    backend: Optional[str] = None,
+    fallback: bool = True
+) -> Iterator[str]:
+    """
+    Yield the text of each page in order from start, up to max_pages (default MAX_PDF_PAGES).
+    
+    If a backend fails to open the file or a page, the next installed backend
+    continues from the page that failed.
+    """
+    next_page = start
+    errors = []
+    for name in pdf_backend_order(backend, fallback):
+        try:
+            page_count, page_text = _PDF_BACKENDS[name].open(file_content)
+            if page_count == 0:
+                raise ValueError("PDF file has no pages")
+            
+            page_limit = max_pages or MAX_PDF_PAGES
+            if max_pages is None and page_count > page_limit and not errors:
+                logger.warning(f"PDF has {page_count} pages, extracting the first {page_limit}")
+            
+            while next_page < min(page_count, page_limit):
+                text = page_text(next_page)
+                next_page += 1
+                yield text.strip()
+            return
+        except Exception as e:
+            errors.append(f"{name}: {str(e)}")
+            logger.warning(f"PDF backend {name} failed at page {next_page + 1}: {e}")
+    
+    raise RuntimeError(f"PDF extraction failed: {'; '.join(errors) or 'no PDF backend installed'}")
+
+
+def extract_pdf_pages(
+    file_content: bytes,
+    start: int = 0,
+    max_pages: Optional[int] = None,
+    backend: Optional[str] = None,
+    fallback: bool = True
+) -> List[str]:
+    """Texts of pages start..max_pages; a plain function so it can run in a worker process."""
+    return list(iter_pdf_pages(file_content, max_pages, start, backend, fallback))
+
+
+def extract_from_pdf(file_content: bytes, max_pages: Optional[int] = None, backend: Optional[str] = None) -> str:
+    text_parts = [page_text for page_text in iter_pdf_pages(file_content, max_pages, backend=backend) if page_text]
+    return "\n".join(text_parts).strip()
 
 
 def extract_from_docx(file_content: bytes) -> str:
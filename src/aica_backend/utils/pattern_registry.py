@@ -0,0 +1,133 @@
+import re
+import json
+import logging
+from pathlib import Path
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+_REGEX_FLAGS = {
+    'IGNORECASE': re.IGNORECASE,
+    'MULTILINE': re.MULTILINE,
+    'DOTALL': re.DOTALL,
+    'VERBOSE': re.VERBOSE
+}
+
+DEFAULT_EXPERIENCE_VALIDATION: Dict[str, int] = {
+    "min_year": 1980,
+    "max_year": 2029,
+    "max_experience_years": 50,
+    "min_experience_years": 0
+}
+
+# Invalid patterns found while compiling, as "file: pattern (error)"
+_pattern_errors: List[str] = []
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    regex: Pattern
+    name: str = ""
+    level: Optional[str] = None
+    priority: int = 999
+    captures_field: bool = False
+
+
+@dataclass(frozen=True)
+class ExperiencePatterns:
+    explicit: List[CompiledPattern]
+    date_ranges: List[CompiledPattern]
+    validation: Dict[str, int]
+
+
+@dataclass(frozen=True)
+class EducationPatterns:
+    patterns: List[CompiledPattern]  # Sorted by priority
+    skip_header_chars: int = 500
+
+
+def _load_pattern_file(filename: str) -> Dict[str, Any]:
+    try:
+        with open(DATA_DIR / filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Failed to load {filename}: {e}")
+        return {}
+
+
+def compile_pattern(config: Dict[str, Any], default_flags: int = 0, source: str = "") -> Optional[CompiledPattern]:
+    """Compile one pattern entry ("pattern" plus optional "flags" names); None if it is invalid."""
+    pattern = config.get('pattern', '')
+    if not pattern:
+        return None
+
+    flags = default_flags
+    try:
+        for flag_name in config.get('flags', []):
+            flags |= _REGEX_FLAGS[flag_name.upper()]
+        regex = re.compile(pattern, flags)
+    except (KeyError, re.error) as e:
+        _pattern_errors.append(f"{source}: {pattern!r} ({e})")
+        logger.warning(f"Invalid pattern in {source} {pattern!r}: {e}")
+        return None
+
+    return CompiledPattern(
+        regex=regex,
+        name=config.get('name', ''),
+        level=config.get('level'),
+        priority=config.get('priority', 999),
+        captures_field=config.get('captures_field', False)
+    )
+
+
+def _compile_all(configs: List[Dict[str, Any]], default_flags: int, source: str) -> List[CompiledPattern]:
+    compiled = (compile_pattern(config, default_flags, source) for config in configs)
+    return [pattern for pattern in compiled if pattern is not None]
+
+
+@lru_cache(maxsize=1)
+def get_experience_patterns() -> ExperiencePatterns:
+    data = _load_pattern_file('experience_patterns.json')
+    source = 'experience_patterns.json'
+    return ExperiencePatterns(
+        explicit=_compile_all(data.get('explicit_patterns', []), re.IGNORECASE, source),
+        date_ranges=_compile_all(data.get('date_range_patterns', []), re.IGNORECASE, source),
+        validation={**DEFAULT_EXPERIENCE_VALIDATION, **data.get('validation', {})}
+    )
+
+
+@lru_cache(maxsize=1)
+def get_education_patterns() -> EducationPatterns:
+    data = _load_pattern_file('education_patterns.json')
+    # Education patterns run on lowercased text, so they compile without IGNORECASE
+    patterns = _compile_all(data.get('patterns', []), 0, 'education_patterns.json')
+    for pattern in patterns:
+        if not pattern.level:
+            _pattern_errors.append(f"education_patterns.json: {pattern.regex.pattern!r} (missing level)")
+    return EducationPatterns(
+        patterns=sorted((pattern for pattern in patterns if pattern.level), key=lambda pattern: pattern.priority),
+        skip_header_chars=data.get('skip_header_chars', 500)
+    )
+
+
+def validate_patterns() -> Dict[str, Any]:
+    """Load and compile every pattern config now (at startup) and report what was found."""
+    experience = get_experience_patterns()
+    education = get_education_patterns()
+    summary = {
+        "experience_explicit": len(experience.explicit),
+        "experience_date_ranges": len(experience.date_ranges),
+        "education": len(education.patterns),
+        "errors": list(_pattern_errors)
+    }
+    if _pattern_errors:
+        logger.warning(f"{len(_pattern_errors)} invalid resume patterns skipped: {_pattern_errors}")
+    logger.info(
+        f"Resume patterns ready: {summary['experience_explicit']} experience, "
+        f"{summary['experience_date_ranges']} date range, {summary['education']} education"
+    )
+    return summary
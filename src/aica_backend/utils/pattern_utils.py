@@ -1,49 +1,24 @@
 import re
-import json
 import logging
-from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Callable, Iterable, Optional, List, Dict, Set, Tuple
 import datetime
 
+from .pattern_registry import get_experience_patterns
+
 logger = logging.getLogger(__name__)
 
 EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
 PHONE_PATTERN = r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b'
 LINKEDIN_PATTERN = r'(?:linkedin\.com/in/|linkedin\.com/pub/)[\w-]+'
 
-_experience_config: Optional[Dict[str, Any]] = None
-
-
-def _load_experience_config() -> Dict[str, Any]:
-    global _experience_config
-    
-    if _experience_config is None:
-        current_file = Path(__file__)
-        data_dir = current_file.parent.parent / "data"
-        pattern_file = data_dir / "experience_patterns.json"
-        
-        try:
-            with open(pattern_file, 'r', encoding='utf-8') as f:
-                _experience_config = json.load(f)
-                logger.info(f"Loaded experience patterns from {pattern_file}")
-        except Exception as e:
-            logger.error(f"Failed to load experience patterns: {e}")
-            _experience_config = {
-                "explicit_patterns": [],
-                "date_range_patterns": [],
-                "validation": {
-                    "min_year": 1980,
-                    "max_year": 2029,
-                    "max_experience_years": 50,
-                    "min_experience_years": 0
-                }
-            }
-    
-    return _experience_config
+_EMAIL_REGEX = re.compile(EMAIL_PATTERN, re.IGNORECASE)
+_PHONE_REGEX = re.compile(PHONE_PATTERN, re.IGNORECASE)
+_LINKEDIN_REGEX = re.compile(LINKEDIN_PATTERN, re.IGNORECASE)
+YEAR_PATTERN = re.compile(r'(\d{4})')
 
 
 def extract_email(text: str) -> Optional[str]:
-    match = re.search(EMAIL_PATTERN, text, re.IGNORECASE)
+    match = _EMAIL_REGEX.search(text)
     if match:
         email = match.group()
         # Remove any trailing characters that might have been captured
@@ -53,38 +28,32 @@ def extract_email(text: str) -> Optional[str]:
 
 
 def extract_phone(text: str) -> Optional[str]:
-    match = re.search(PHONE_PATTERN, text, re.IGNORECASE)
+    match = _PHONE_REGEX.search(text)
     return match.group() if match else None
 
 
 def extract_linkedin(text: str) -> Optional[str]:
-    match = re.search(LINKEDIN_PATTERN, text, re.IGNORECASE)
+    match = _LINKEDIN_REGEX.search(text)
     return match.group() if match else None
 
 
 def estimate_experience_years(text: str) -> Optional[int]:
-    """Estimate years of experience from resume text using JSON patterns"""
+    """Estimate years of experience from resume text using the precompiled JSON patterns"""
     current_year = datetime.datetime.now().year
     
-    # Load patterns and validation config from JSON
-    config = _load_experience_config()
-    explicit_patterns = config.get('explicit_patterns', [])
-    date_range_patterns = config.get('date_range_patterns', [])
-    validation = config.get('validation', {})
+    # Compiled once per process by the pattern registry
+    patterns = get_experience_patterns()
+    validation = patterns.validation
     
-    min_year = validation.get('min_year', 1980)
-    max_year = validation.get('max_year', 2029)
-    max_experience = validation.get('max_experience_years', 50)
-    min_experience = validation.get('min_experience_years', 0)
+    min_year = validation['min_year']
+    max_year = validation['max_year']
+    max_experience = validation['max_experience_years']
+    min_experience = validation['min_experience_years']
     
     # Try explicit experience statements first - these are most reliable
-    for pattern_config in explicit_patterns:
-        pattern = pattern_config.get('pattern', '')
-        if not pattern:
-            continue
-            
+    for pattern in patterns.explicit:
         try:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+            matches = pattern.regex.findall(text)
             if matches:
                 for match in matches:
                     # Handle different match formats
@@ -104,8 +73,8 @@ def estimate_experience_years(text: str) -> Optional[int]:
                         continue
                         
                     return years
-        except (ValueError, re.error) as e:
-            logger.warning(f"Error processing pattern '{pattern}': {e}")
+        except ValueError as e:
+            logger.warning(f"Error processing pattern '{pattern.regex.pattern}': {e}")
             continue
     
     # If no explicit statement, try to calculate from work history dates
@@ -134,38 +103,29 @@ def estimate_experience_years(text: str) -> Optional[int]:
         
         # Use date range patterns from JSON
         earliest_year = None
-        for pattern_config in date_range_patterns:
-            pattern = pattern_config.get('pattern', '')
-            if not pattern:
-                continue
-            
-            try:
-                matches = re.findall(pattern, experience_section, re.IGNORECASE)
-                for match in matches:
-                    # Extract year from match (could be tuple with multiple groups)
-                    year_str = match if isinstance(match, str) else match[0] if match else None
-                    if not year_str:
+        for pattern in patterns.date_ranges:
+            for match in pattern.regex.findall(experience_section):
+                # Extract year from match (could be tuple with multiple groups)
+                year_str = match if isinstance(match, str) else match[0] if match else None
+                if not year_str:
+                    continue
+                
+                # Handle month names - extract just the year
+                if not year_str.isdigit():
+                    year_match = YEAR_PATTERN.search(str(match))
+                    if year_match:
+                        year_str = year_match.group(1)
+                    else:
                         continue
-                    
-                    # Handle month names - extract just the year
-                    if not year_str.isdigit():
-                        year_match = re.search(r'(\d{4})', str(match))
-                        if year_match:
-                            year_str = year_match.group(1)
-                        else:
-                            continue
-                    
-                    try:
-                        year = int(year_str)
-                        # Validate year is reasonable
-                        if min_year <= year <= max(current_year, max_year):
-                            if earliest_year is None or year < earliest_year:
-                                earliest_year = year
-                    except ValueError:
-                        continue
-            except re.error as e:
-                logger.warning(f"Error processing date pattern '{pattern}': {e}")
-                continue
+                
+                try:
+                    year = int(year_str)
+                    # Validate year is reasonable
+                    if min_year <= year <= max(current_year, max_year):
+                        if earliest_year is None or year < earliest_year:
+                            earliest_year = year
+                except ValueError:
+                    continue
         
         if earliest_year:
             calculated_years = current_year - earliest_year
@@ -185,3 +145,106 @@ def build_skill_patterns(skill: str) -> List[str]:
 def match_skill_pattern(skill: str, text_lower: str) -> bool:
     patterns = build_skill_patterns(skill)
     return any(re.search(pattern, text_lower, re.IGNORECASE) for pattern in patterns)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def technical_skill_surface_forms(skill: str) -> List[str]:
+    """Spellings build_skill_patterns accepts: as written, without dots, and plural."""
+    skill = skill.lower().strip()
+    forms = [skill, skill.replace('.', '')]
+    if skill and _is_word_char(skill[-1]):
+        forms.append(skill + 's')
+    return forms
+
+
+def soft_skill_surface_forms(skill: str) -> List[str]:
+    """As written, hyphens as spaces, and spaces as hyphens."""
+    skill = skill.lower().strip()
+    return [skill, skill.replace('-', ' '), skill.replace(' ', '-')]
+
+
+class SkillPatternMatcher:
+    """
+    Finds every skill of a fixed list in a text in one linear pass.
+
+    All surface forms of all skills are compiled once into an Aho-Corasick
+    automaton, so a resume is scanned once instead of once per skill pattern.
+    A hit counts only at word boundaries: a form that starts or ends with a
+    word character must not be preceded or followed by one ("java" does not
+    hit inside "javascript"), while forms like "c++" or ".net" need no
+    boundary on their symbol side.
+    """
+
+    def __init__(
+        self,
+        skills: List[str],
+        surface_forms: Callable[[str], Iterable[str]] = technical_skill_surface_forms
+    ):
+        self.skills = list(skills)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (form length, skill index, needs left boundary, needs right boundary)
+        self._outputs: List[List[Tuple[int, int, bool, bool]]] = [[]]
+
+        for index, skill in enumerate(self.skills):
+            for form in dict.fromkeys(surface_forms(skill)):
+                if form:
+                    self._add_form(form, index)
+        self._build_failure_links()
+
+    def _add_form(self, form: str, index: int) -> None:
+        state = 0
+        for char in form:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((len(form), index, _is_word_char(form[0]), _is_word_char(form[-1])))
+
+    def _build_failure_links(self) -> None:
+        # Breadth-first, so a state's failure target is always final before its children are linked
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find_indices(self, text_lower: str) -> Set[int]:
+        """Indices (into skills) of every skill with at least one hit in the lowercased text."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found: Set[int] = set()
+        last = len(text_lower) - 1
+        state = 0
+
+        for position, char in enumerate(text_lower):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for length, index, left_boundary, right_boundary in outputs[state]:
+                if index in found:
+                    continue
+                start = position - length + 1
+                if left_boundary and start > 0 and _is_word_char(text_lower[start - 1]):
+                    continue
+                if right_boundary and position < last and _is_word_char(text_lower[position + 1]):
+                    continue
+                found.add(index)
+
+        return found
+
+    def find_skills(self, text_lower: str) -> List[str]:
+        """Skills with a hit in the lowercased text, in the order of the skill list."""
+        found = self.find_indices(text_lower)
+        return [skill for index, skill in enumerate(self.skills) if index in found]
@@ -0,0 +1,65 @@
+"""
+Background task worker.
+
+Runs resume parsing and job matching tasks queued by the API:
+
+    python worker.py
+
+The web server runs an embedded worker by default. To run tasks here instead,
+start the API with TASK_WORKER_EMBEDDED=false and one or more of these on the
+same host: they share the local SQLite queue file given by TASK_QUEUE_PATH
+(default: aica_task_queue.db in the temp directory), so the queue cannot be
+shared between hosts or App Engine instances. TASK_WORKER_CONCURRENCY sets the
+number of tasks each worker runs at once.
+"""
+import sys
+import signal
+import asyncio
+import logging
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(levelname)s: %(name)s - %(message)s',
+    force=True
+)
+logger = logging.getLogger(__name__)
+
+env_path = Path(__file__).parent.parent.parent / ".env"
+if env_path.exists():
+    load_dotenv(dotenv_path=env_path)
+
+parent_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(parent_dir))
+
+from api.utils.background_tasks import TASK_HANDLERS
+from services.task_worker import TaskWorker
+from database.client_registry import aclose_shared_clients
+from utils.pattern_registry import validate_patterns
+from utils.extraction_pool import get_extraction_pool
+
+
+async def main():
+    # Compile the resume fallback patterns up front so a bad pattern shows at startup
+    validate_patterns()
+    worker = TaskWorker(TASK_HANDLERS)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            # Signal handlers are not available on Windows event loops
+            pass
+
+    try:
+        await worker.run()
+    finally:
+        await aclose_shared_clients()
+        get_extraction_pool().shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
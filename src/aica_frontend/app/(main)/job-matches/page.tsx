@@ -8,6 +8,7 @@ import { Card, CardContent } from '@/components/ui/card';
 import { Search, RefreshCw, Zap, Trash2 } from 'lucide-react';
 import { apiClient } from '@/lib/api-client';
 import { JobMatch } from '@/types/jobMatch';
+import { ProcessingStatusResponse } from '@/types/api';
 import { useSavedJobs } from '@/hooks/useSavedJobs';
 import { useJobMatchesWithCache, cacheManager } from '@/hooks/useCacheManager';
 import { JobCard } from '@/components/JobCard';
@@ -54,17 +55,10 @@ export default function JobMatchesPage() {
         matches_found?: number;
       }>('/auth/processing-status');
 
+      // While processing, further steps arrive over the status stream (see the effect below)
       setProcessingStatus(status.status);
 
-      if (
-        status.status === 'processing' ||
-        status.status === 'parsing' ||
-        status.status === 'matching' ||
-        status.status === 'finalizing'
-      ) {
-        // Keep polling while processing
-        setTimeout(checkProcessingStatus, 3000);
-      } else if (status.status === 'completed') {
+      if (status.status === 'completed') {
         // Only set as completed if we actually have matches or explicitly 0 matches
         setProcessingStatus('completed');
       }
@@ -134,61 +128,51 @@ export default function JobMatchesPage() {
     }
   }, [processingStatus, isCheckingStatus, loadJobMatches, loadStats]);
 
-  // Polling effect for when coming from upload and still processing
-  useEffect(() => {
-    if (
-      isFromUpload &&
-      (processingStatus === 'processing' ||
-        processingStatus === 'parsing' ||
-        processingStatus === 'matching' ||
-        processingStatus === 'finalizing') &&
-      !isCheckingStatus
-    ) {
-      setPollingForMatches(true);
-
-      const pollInterval = setInterval(async () => {
-        try {
-          const status = await apiClient.get<{
-            status: string;
-            message?: string;
-            matches_found?: number;
-          }>('/auth/processing-status');
-
-          if (status.status === 'completed') {
-            setProcessingStatus('completed');
-            setPollingForMatches(false);
-            clearInterval(pollInterval);
-
-            // Clear cache and load fresh data
-            cacheManager.clear(
-              'aica_job_matches',
-              'aica_matching_stats',
-              'aica_recommendations',
-            );
-
-            // Add a small delay to ensure database is fully synced (reduced from 1s to 0.5s)
-            await new Promise(resolve => setTimeout(resolve, 500));
-
-            // Force reload with cache bypass
-            await loadJobMatches(true);
-            await loadStats(true);
-          }
-        } catch {
-          // Polling error, will retry on next interval
-        }
-      }, 3000); // Poll every 3 seconds
+  const isProcessing =
+    processingStatus === 'processing' ||
+    processingStatus === 'parsing' ||
+    processingStatus === 'matching' ||
+    processingStatus === 'finalizing';
 
-      return () => clearInterval(pollInterval);
-    } else {
+  // Follow processing steps over the status stream instead of polling. The
+  // effect depends on isProcessing rather than processingStatus, so one stream
+  // stays open for the whole processing phase instead of reopening per step.
+  useEffect(() => {
+    if (!isProcessing || isCheckingStatus) {
       setPollingForMatches(false);
+      return;
     }
-  }, [
-    isFromUpload,
-    processingStatus,
-    isCheckingStatus,
-    loadJobMatches,
-    loadStats,
-  ]);
+
+    setPollingForMatches(isFromUpload);
+    const controller = new AbortController();
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+
+    // Stream closed or unavailable before processing finished: check again shortly
+    const retry = () => {
+      if (controller.signal.aborted) return;
+      retryTimer = setTimeout(checkProcessingStatus, 3000);
+    };
+
+    apiClient
+      .streamProcessingStatus((event, data) => {
+        if (event !== 'status') return;
+        const status = data as ProcessingStatusResponse;
+
+        if (status.status === 'completed') {
+          // The completion effect above clears the cache and reloads matches
+          controller.abort();
+          setPollingForMatches(false);
+        }
+        setProcessingStatus(status.status);
+      }, controller.signal)
+      .then(retry)
+      .catch(retry);
+
+    return () => {
+      controller.abort();
+      clearTimeout(retryTimer);
+    };
+  }, [isFromUpload, isProcessing, isCheckingStatus, checkProcessingStatus]);
 
   // Update showingRecommendations whenever jobMatches changes
   // This ensures we show real matches as soon as they're loaded
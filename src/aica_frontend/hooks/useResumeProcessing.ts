@@ -2,6 +2,7 @@ import { useState, useRef, useEffect, useCallback } from 'react';
 import { toast } from 'sonner';
 import { useAuth } from './useAuth';
 import { MAX_POLLS, POLL_INTERVAL_MS } from '@/lib/constants/upload';
+import { readEventStream } from '@/lib/utils/sse';
 
 const API_BASE_URL =
   process.env.NEXT_PUBLIC_API_BASE_URL || 'http://localhost:8000';
@@ -28,6 +29,7 @@ export const useResumeProcessing = () => {
     useState<ProcessingStatus>('not_uploaded');
   const [pollCount, setPollCount] = useState(0);
   const pollIntervalRef = useRef<NodeJS.Timeout | null>(null);
+  const streamAbortRef = useRef<AbortController | null>(null);
   const isComponentMountedRef = useRef(true);
   const hasShownCompletionToastRef = useRef(false); // Prevent duplicate toasts
 
@@ -40,6 +42,7 @@ export const useResumeProcessing = () => {
       if (pollIntervalRef.current) {
         clearInterval(pollIntervalRef.current);
       }
+      streamAbortRef.current?.abort();
     };
   }, []);
 
@@ -48,26 +51,12 @@ export const useResumeProcessing = () => {
       clearInterval(pollIntervalRef.current);
       pollIntervalRef.current = null;
     }
+    streamAbortRef.current?.abort();
+    streamAbortRef.current = null;
   }, []);
 
-  const checkProcessingStatus = useCallback(async (): Promise<void> => {
-    const token = getAuthToken();
-    if (!token || !isComponentMountedRef.current) return;
-
-    try {
-      const response = await fetch(`${API_BASE_URL}/auth/processing-status`, {
-        headers: {
-          Authorization: `Bearer ${token}`,
-          'Content-Type': 'application/json',
-        },
-      });
-
-      if (!response.ok) {
-        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-      }
-
-      const data: StatusResponse = await response.json();
-
+  const handleStatus = useCallback(
+    (data: StatusResponse): void => {
       if (!isComponentMountedRef.current) return;
 
       const newStatus = data.step || data.status;
@@ -110,15 +99,38 @@ export const useResumeProcessing = () => {
           data.message || 'Resume processing failed. Please try again.',
         );
       }
+    },
+    [stopPolling],
+  );
+
+  const checkProcessingStatus = useCallback(async (): Promise<void> => {
+    const token = getAuthToken();
+    if (!token || !isComponentMountedRef.current) return;
+
+    try {
+      const response = await fetch(`${API_BASE_URL}/auth/processing-status`, {
+        headers: {
+          Authorization: `Bearer ${token}`,
+          'Content-Type': 'application/json',
+        },
+      });
+
+      if (!response.ok) {
+        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+      }
+
+      const data: StatusResponse = await response.json();
+      handleStatus(data);
     } catch {
       if (isComponentMountedRef.current) {
         setProcessingStatus('error');
         toast.error('Failed to check processing status.');
       }
     }
-  }, [getAuthToken, stopPolling]);
+  }, [getAuthToken, handleStatus]);
 
-  const startPolling = useCallback(() => {
+  // Fallback when the status stream is unavailable (e.g. a buffering proxy)
+  const pollStatus = useCallback(() => {
     let currentPollCount = 0;
 
     const pollInterval = setInterval(async () => {
@@ -135,6 +147,39 @@ export const useResumeProcessing = () => {
     pollIntervalRef.current = pollInterval;
   }, [checkProcessingStatus]);
 
+  const startPolling = useCallback(() => {
+    const token = getAuthToken();
+    if (!token) return;
+
+    stopPolling();
+    const controller = new AbortController();
+    streamAbortRef.current = controller;
+
+    // Status updates arrive over the stream; the ticks only drive the progress text and timeout
+    let ticks = 0;
+    pollIntervalRef.current = setInterval(() => {
+      ticks++;
+      setPollCount(ticks);
+    }, POLL_INTERVAL_MS);
+
+    const fallBackToPolling = () => {
+      if (controller.signal.aborted || !isComponentMountedRef.current) return;
+      stopPolling();
+      pollStatus();
+    };
+
+    readEventStream(`${API_BASE_URL}/auth/processing-status/stream`, {
+      headers: { Authorization: `Bearer ${token}` },
+      signal: controller.signal,
+      onEvent: (event, data) => {
+        if (event === 'status') handleStatus(data as StatusResponse);
+      },
+    })
+      // The stream closes after a final status, which stops it first; otherwise keep checking by polling
+      .then(fallBackToPolling)
+      .catch(fallBackToPolling);
+  }, [getAuthToken, stopPolling, pollStatus, handleStatus]);
+
   const resetProcessing = useCallback(() => {
     setProcessingStatus('not_uploaded');
     setPollCount(0);
@@ -15,6 +15,8 @@ import {
 } from '@/types/user';
 import { SavedJob } from '@/types/jobMatch';
 import { API_BASE_URL, API_ENDPOINTS } from '@/lib/constants/api';
+import { AppError } from '@/lib/utils/errorHandler';
+import { readEventStream, ServerSentEventHandler } from '@/lib/utils/sse';
 import { toast } from 'sonner';
 
 export class ApiClient {
@@ -109,6 +111,28 @@ export class ApiClient {
     return this.handleResponse<ProcessingStatusResponse>(response);
   }
 
+  /**
+   * Follow the processing status stream: onEvent receives a 'status' event with
+   * the same payload as getProcessingStatus whenever a processing step changes.
+   * Resolves once processing has finished and the server closes the stream.
+   */
+  async streamProcessingStatus(
+    onEvent: ServerSentEventHandler,
+    signal?: AbortSignal,
+  ): Promise<void> {
+    try {
+      await readEventStream(
+        `${API_BASE_URL}${API_ENDPOINTS.AUTH.PROCESSING_STATUS_STREAM}`,
+        { headers: this.getHeaders(), signal, onEvent },
+      );
+    } catch (error) {
+      if (error instanceof AppError && error.status === 401) {
+        this.handleAuthError();
+      }
+      throw error;
+    }
+  }
+
   async getUserProfile(): Promise<UserProfile> {
     const response = await fetch(
       `${API_BASE_URL}${API_ENDPOINTS.AUTH.PROFILE}`,
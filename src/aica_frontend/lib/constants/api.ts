@@ -8,6 +8,7 @@ export const API_ENDPOINTS = {
     SIGNUP: '/auth/signup',
     UPLOAD_RESUME: '/auth/upload-resume',
     PROCESSING_STATUS: '/auth/processing-status',
+    PROCESSING_STATUS_STREAM: '/auth/processing-status/stream',
     PROFILE: '/auth/profile',
   },
   JOBS: {
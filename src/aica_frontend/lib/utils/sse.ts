@@ -0,0 +1,80 @@
+import { AppError } from './errorHandler';
+
+export type ServerSentEventHandler = (event: string, data: unknown) => void;
+
+interface ReadEventStreamOptions {
+  method?: string;
+  headers?: HeadersInit;
+  signal?: AbortSignal;
+  onEvent: ServerSentEventHandler;
+}
+
+const dispatchEvent = (block: string, onEvent: ServerSentEventHandler) => {
+  let event = 'message';
+  const dataLines: string[] = [];
+
+  for (const line of block.split('\n')) {
+    // Lines starting with ':' are keep-alive comments
+    if (line.startsWith('event:')) {
+      event = line.slice(6).trim();
+    } else if (line.startsWith('data:')) {
+      dataLines.push(line.slice(5).trimStart());
+    }
+  }
+
+  if (dataLines.length === 0) return;
+
+  const text = dataLines.join('\n');
+  let data: unknown = text;
+  try {
+    data = JSON.parse(text);
+  } catch {
+    // Not JSON; pass the raw text
+  }
+  onEvent(event, data);
+};
+
+/**
+ * Reads a Server-Sent Events response with fetch, so the request can carry an
+ * Authorization header (the browser's EventSource cannot). Resolves when the
+ * server closes the stream; rejects on HTTP errors (as AppError), network
+ * errors and abort.
+ */
+export const readEventStream = async (
+  url: string,
+  { method = 'GET', headers, signal, onEvent }: ReadEventStreamOptions,
+): Promise<void> => {
+  const requestHeaders = new Headers(headers);
+  requestHeaders.set('Accept', 'text/event-stream');
+
+  const response = await fetch(url, {
+    method,
+    headers: requestHeaders,
+    signal,
+  });
+
+  if (!response.ok || !response.body) {
+    throw new AppError(
+      `HTTP ${response.status}: ${response.statusText}`,
+      response.status,
+      'STREAM_ERROR',
+    );
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true }).replace(/\r\n/g, '\n');
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      dispatchEvent(buffer.slice(0, boundary), onEvent);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+    }
+  }
+};